@@ -1,6 +1,6 @@
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
+from sqlalchemy import create_engine, engine_from_config
 from sqlalchemy import pool
 
 from alembic import context
@@ -25,10 +25,24 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db.base import Base
 # Import models so Alembic sees them
 from models.project import Project
-from models.task import Task
+from models.task import Task, ArchivedTask
+from models.outbox import OutboxEvent, WebhookSubscription
+from models.idempotency import IdempotencyKey
+from models.job import BackgroundJob
 
 target_metadata = Base.metadata
 
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# DATABASE_URL (as used by the application) takes precedence over alembic.ini
+if os.getenv("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"].replace("%", "%%"))
+
+# With sharding enabled, every shard gets the same schema
+SHARD_DATABASE_URLS = [u.strip() for u in os.getenv("SHARD_DATABASE_URLS", "").split(",") if u.strip()]
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -54,6 +68,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
     )
 
     with context.begin_transaction():
@@ -67,19 +82,24 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    connectable = engine_from_config(
+    connectables = [engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
-    )
-
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+    )]
+    connectables += [create_engine(url, poolclass=pool.NullPool) for url in SHARD_DATABASE_URLS]
+
+    for connectable in connectables:
+        with connectable.connect() as connection:
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                # SQLite cannot ALTER most constraints: recreate tables instead
+                render_as_batch=connection.dialect.name == "sqlite",
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,35 @@
+"""add recurrence and series columns to tasks
+
+Revision ID: 0c1d2e3f4a5b
+Revises: 9b0c1d2e3f4a
+Create Date: 2026-10-19 18:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c1d2e3f4a5b'
+down_revision: Union[str, Sequence[str], None] = '9b0c1d2e3f4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('tasks', 'tasks_archive'):
+        op.add_column(table, sa.Column('recurrence', sa.String(length=200), nullable=True))
+        op.add_column(table, sa.Column('series_id', sa.String(length=36), nullable=True))
+    op.create_index('ix_tasks_series_id_deadline', 'tasks', ['series_id', 'deadline'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_series_id_deadline', table_name='tasks')
+    for table in ('tasks_archive', 'tasks'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('series_id')
+            batch_op.drop_column('recurrence')
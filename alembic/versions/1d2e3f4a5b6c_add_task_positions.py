@@ -0,0 +1,52 @@
+"""add position keys for manual task ordering
+
+Revision ID: 1d2e3f4a5b6c
+Revises: 0c1d2e3f4a5b
+Create Date: 2026-10-19 19:05:00.000000
+
+"""
+from itertools import groupby
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from db.positions import sequential_keys
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d2e3f4a5b6c'
+down_revision: Union[str, Sequence[str], None] = '0c1d2e3f4a5b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('position', sa.String(length=100), nullable=True))
+    op.add_column('tasks_archive', sa.Column('position', sa.String(length=100), nullable=True))
+
+    # Existing tasks keep their (ID) order within each project
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, project_id FROM tasks ORDER BY project_id, id")).all()
+    positions = []
+    for _, group in groupby(rows, key=lambda row: row.project_id):
+        ids = [row.id for row in group]
+        positions.extend({"id": task_id, "position": key} for task_id, key in zip(ids, sequential_keys(len(ids))))
+    if positions:
+        conn.execute(sa.text("UPDATE tasks SET position = :position WHERE id = :id"), positions)
+
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.alter_column('position', existing_type=sa.String(length=100), nullable=False)
+    # The (project_id, position) index serves every lookup by project
+    op.drop_index(op.f('ix_tasks_project_id'), table_name='tasks')
+    op.create_index('ix_tasks_project_id_position', 'tasks', ['project_id', 'position'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_project_id_position', table_name='tasks')
+    op.create_index(op.f('ix_tasks_project_id'), 'tasks', ['project_id'], unique=False)
+    for table in ('tasks_archive', 'tasks'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('position')
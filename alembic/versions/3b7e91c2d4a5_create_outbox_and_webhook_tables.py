@@ -0,0 +1,49 @@
+"""create outbox and webhook subscription tables
+
+Revision ID: 3b7e91c2d4a5
+Revises: cecc05ff9f99
+Create Date: 2026-10-19 08:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e91c2d4a5'
+down_revision: Union[str, Sequence[str], None] = 'cecc05ff9f99'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_events',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('event_id', sa.String(length=40), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('project_id', sa.String(length=36), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('webhook_subscriptions',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('project_id', sa.String(length=36), nullable=True),
+    sa.Column('event_types', sa.String(length=200), nullable=True),
+    sa.Column('secret', sa.String(length=100), nullable=True),
+    sa.Column('last_event_id', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('failure_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+    sa.Column('active', sa.Boolean(), nullable=False, server_default=sa.true()),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('webhook_subscriptions')
+    op.drop_table('outbox_events')
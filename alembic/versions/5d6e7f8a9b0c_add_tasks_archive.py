@@ -0,0 +1,49 @@
+"""add tasks.completed_at and the tasks_archive table
+
+Revision ID: 5d6e7f8a9b0c
+Revises: 8c1d2e3f4a5b
+Create Date: 2026-10-19 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d6e7f8a9b0c'
+down_revision: Union[str, Sequence[str], None] = '8c1d2e3f4a5b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('completed_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_tasks_completed_at'), 'tasks', ['completed_at'], unique=False)
+    # Tasks already done start their retention period now
+    op.execute("UPDATE tasks SET completed_at = CURRENT_TIMESTAMP WHERE status = 'done'")
+
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('deadline', sa.Date(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.Column('project_id', sa.String(length=36), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tasks_archive_project_id'), 'tasks_archive', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tasks_archive_project_id'), table_name='tasks_archive')
+    op.drop_table('tasks_archive')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tasks_completed_at'))
+        batch_op.drop_column('completed_at')
@@ -0,0 +1,31 @@
+"""add version columns for optimistic locking
+
+Revision ID: 7f8a9b0c1d2e
+Revises: 6e7f8a9b0c1d
+Create Date: 2026-10-19 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f8a9b0c1d2e'
+down_revision: Union[str, Sequence[str], None] = '6e7f8a9b0c1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('projects', 'tasks', 'tasks_archive'):
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('tasks_archive', 'tasks', 'projects'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
@@ -0,0 +1,27 @@
+"""add an index on tasks.project_id
+
+Revision ID: 8a9b0c1d2e3f
+Revises: 7f8a9b0c1d2e
+Create Date: 2026-10-19 15:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a9b0c1d2e3f'
+down_revision: Union[str, Sequence[str], None] = '7f8a9b0c1d2e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_tasks_project_id'), 'tasks', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tasks_project_id'), table_name='tasks')
@@ -0,0 +1,28 @@
+"""add index on tasks.deadline
+
+Revision ID: 8c1d2e3f4a5b
+Revises: 3b7e91c2d4a5
+Create Date: 2026-10-19 08:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1d2e3f4a5b'
+down_revision: Union[str, Sequence[str], None] = '3b7e91c2d4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_tasks_deadline'), 'tasks', ['deadline'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tasks_deadline'), table_name='tasks')
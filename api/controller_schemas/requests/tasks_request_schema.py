@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class TaskCreateRequest(BaseModel):
@@ -10,10 +10,13 @@ class TaskCreateRequest(BaseModel):
         title: Title of the task (required).
         description: Optional description of the task.
         deadline: Optional deadline for the task in YYYY-MM-DD format.
+        recurrence: Optional repeat rule: daily, weekly, monthly or an RRULE
+            subset such as ``FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH``.
     """
     title: str
     description: Optional[str] = None
     deadline: Optional[str] = None
+    recurrence: Optional[str] = None
 
 
 class TaskUpdateRequest(BaseModel):
@@ -25,11 +28,13 @@ class TaskUpdateRequest(BaseModel):
         description: New description of the task (optional).
         status: New status of the task (optional). Allowed values: todo, doing, done.
         deadline: New deadline of the task in YYYY-MM-DD format (optional).
+        recurrence: New repeat rule (optional). An empty string stops the series.
     """
     title: Optional[str] = None
     description: Optional[str] = None
     status: Optional[str] = None
     deadline: Optional[str] = None
+    recurrence: Optional[str] = None
 
 
 class TaskStatusUpdateRequest(BaseModel):
@@ -40,3 +45,23 @@ class TaskStatusUpdateRequest(BaseModel):
         status: New status of the task. Allowed values: todo, doing, done.
     """
     status: str
+
+
+class TaskMoveRequest(BaseModel):
+    """
+    Request schema for moving a task within its project.
+
+    Attributes:
+        after_id: ID of the task to place it after (null: first in the project).
+    """
+    after_id: Optional[str] = None
+
+
+class TaskBatchGetRequest(BaseModel):
+    """
+    Request schema for fetching many tasks by ID.
+
+    Attributes:
+        ids: IDs of the tasks to fetch.
+    """
+    ids: List[str]
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, HttpUrl
+from typing import List, Optional
+
+
+class WebhookCreateRequest(BaseModel):
+    """
+    Request schema for registering a webhook.
+
+    Attributes:
+        url: http(s) endpoint that receives event batches (required).
+        project_id: Only deliver events of this project (optional).
+        event_types: Only deliver these event types, e.g. task.created (optional).
+        secret: Key used to sign deliveries with HMAC-SHA256 (optional).
+    """
+    url: HttpUrl
+    project_id: Optional[str] = None
+    event_types: Optional[List[str]] = None
+    secret: Optional[str] = None
@@ -0,0 +1,61 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+
+class SlowQueryResponse(BaseModel):
+    """
+    Response schema for a recorded slow query.
+
+    Attributes:
+        recorded_at: When the statement finished.
+        duration_ms: Execution time in milliseconds.
+        statement: SQL statement as sent to the database driver.
+        parameters: Bound parameters (redacted unless disabled).
+        caller: Repository method that issued the statement, if known.
+        plan: Captured query plan (may still be pending).
+        plan_error: Error raised while capturing the plan, if any.
+    """
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: Any = None
+    caller: Optional[str] = None
+    plan: Optional[str] = None
+    plan_error: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+        """
+        Enable ORM mode for automatic conversion from ORM models to Pydantic models.
+        """
+
+
+class RequestProfileResponse(BaseModel):
+    """
+    Response schema for a profiled request.
+
+    Attributes:
+        id: Profile identifier (returned in the X-Profile-Id header).
+        method: HTTP method of the profiled request.
+        path: Path of the profiled request.
+        started_at: When profiling started.
+        duration_ms: Total wall-clock time of the request.
+        layers: Self time in seconds per layer (controller, service, repository, sqlalchemy, serialization, other).
+        functions: Hottest functions by cumulative time.
+        report: Text call tree of the hottest functions.
+    """
+    id: str
+    method: str
+    path: str
+    started_at: datetime
+    duration_ms: float
+    layers: Dict[str, float] = {}
+    functions: List[Dict[str, Any]] = []
+    report: str = ""
+
+    class Config:
+        orm_mode = True
+        """
+        Enable ORM mode for automatic conversion from ORM models to Pydantic models.
+        """
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Json
+from typing import Any, Optional
+from datetime import datetime
+
+
+class JobResponse(BaseModel):
+    """
+    Response schema for a background job.
+
+    Attributes:
+        id: Unique identifier of the job.
+        kind: What the job does, e.g. 'project.delete' or 'tasks.import'.
+        status: One of: queued, running, succeeded, failed.
+        progress: Units of work done so far.
+        total: Units of work in total, when known.
+        result: Result of a succeeded job.
+        error: Error message of a failed job.
+        attempts: How many times a worker picked the job up.
+        created_at: When the job was queued.
+        started_at: When the current attempt started.
+        finished_at: When the job succeeded or failed.
+    """
+    id: str
+    kind: str
+    status: str
+    progress: int
+    total: Optional[int] = None
+    result: Optional[Json[Any]] = None
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+        """
+        Enable ORM mode for automatic conversion from ORM models to Pydantic models.
+        """
@@ -10,10 +10,12 @@ class ProjectResponse(BaseModel):
         id: Unique identifier of the project.
         name: Name of the project.
         description: Optional description of the project.
+        version: Row version, to send back in If-Match on updates.
     """
     id: str
     name: str
     description: Optional[str] = None
+    version: int = 1
 
     class Config:
         orm_mode = True
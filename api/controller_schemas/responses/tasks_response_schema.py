@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 
 
@@ -14,6 +14,11 @@ class TaskResponse(BaseModel):
         status: Current status of the task (todo, doing, done).
         deadline: Optional deadline for the task.
         project_id: ID of the project this task belongs to.
+        archived: Whether the task lives in the archive.
+        version: Row version, to send back in If-Match on updates.
+        recurrence: Repeat rule of a recurring task, in RRULE form.
+        series_id: ID shared by all occurrences of a recurring task.
+        position: Sort key within the project; lists are ordered by it.
     """
     id: str
     title: str
@@ -21,6 +26,29 @@ class TaskResponse(BaseModel):
     status: str
     deadline: Optional[date] = None
     project_id: str
+    archived: bool = False
+    version: int = 1
+    recurrence: Optional[str] = None
+    series_id: Optional[str] = None
+    position: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+        """
+        Enable ORM mode for automatic conversion from ORM models to Pydantic models.
+        """
+
+
+class TaskBatchResponse(BaseModel):
+    """
+    Response schema for a multi-get of tasks.
+
+    Attributes:
+        tasks: The tasks found, in request order.
+        missing: Requested IDs that do not exist.
+    """
+    tasks: List[TaskResponse]
+    missing: List[str]
 
     class Config:
         orm_mode = True
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class WebhookResponse(BaseModel):
+    """
+    Response schema for a webhook subscription.
+
+    Attributes:
+        id: Unique identifier of the subscription.
+        url: Endpoint that receives event batches.
+        project_id: Project filter, if any.
+        event_types: Comma-separated event type filter, if any.
+        last_event_id: Last outbox event handled for this subscriber.
+        failure_count: Consecutive failed deliveries.
+        next_attempt_at: Next retry time while backing off.
+        active: Whether the subscription receives events.
+    """
+    id: str
+    url: str
+    project_id: Optional[str] = None
+    event_types: Optional[str] = None
+    last_event_id: int
+    failure_count: int
+    next_attempt_at: Optional[datetime] = None
+    active: bool
+
+    class Config:
+        orm_mode = True
+        """
+        Enable ORM mode for automatic conversion from ORM models to Pydantic models.
+        """
@@ -0,0 +1,185 @@
+import hmac
+import os
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request
+from typing import Any, Dict, List, Optional
+from ..controller_schemas.responses.admin_response_schema import SlowQueryResponse, RequestProfileResponse
+from ..routing import InstrumentedRoute
+from ..middlewares.profiling import profile_store
+from ..middlewares.admission import admission_metrics
+from ..threadpool import thread_wait, threadpool_stats
+from services.single_flight import task_list_flight, project_list_flight
+from db import session as db_session
+from db.pool import connection_wait, pool_status
+
+ADMIN_TOKEN: str | None = os.getenv("ADMIN_TOKEN")
+
+router: APIRouter = APIRouter(route_class=InstrumentedRoute)
+"""
+Router for operational/admin endpoints.
+"""
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Guard admin endpoints with the shared ADMIN_TOKEN.
+
+    Args:
+        x_admin_token: Value of the X-Admin-Token request header.
+
+    Raises:
+        HTTPException: If no ADMIN_TOKEN is configured or the header does not match.
+    """
+    if not ADMIN_TOKEN or not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin access denied.")
+
+
+# ===========================
+# Routes
+# ===========================
+
+@router.get("/slow-queries", response_model=List[SlowQueryResponse], summary="List recorded slow queries")
+def list_slow_queries(
+    limit: int = Query(50, ge=0, description="Maximum number of entries to return"),
+    _: None = Depends(require_admin)
+) -> List[SlowQueryResponse]:
+    """
+    Retrieve the most recent slow queries, newest first.
+
+    Args:
+        limit: Maximum number of entries to return.
+
+    Returns:
+        List of recorded slow queries.
+
+    Raises:
+        HTTPException: If the slow-query log is not enabled.
+    """
+    if db_session.slow_query_recorder is None:
+        raise HTTPException(status_code=404, detail="Slow-query log is not enabled.")
+    return db_session.slow_query_recorder.entries(limit)
+
+
+@router.delete("/slow-queries", summary="Clear recorded slow queries")
+def clear_slow_queries(_: None = Depends(require_admin)) -> dict:
+    """
+    Drop all recorded slow queries.
+
+    Returns:
+        A success message.
+    """
+    if db_session.slow_query_recorder is not None:
+        db_session.slow_query_recorder.clear()
+    return {"detail": "Slow-query log cleared."}
+
+
+@router.get(
+    "/profiles",
+    response_model=List[RequestProfileResponse],
+    response_model_exclude={"__all__": {"functions", "report"}},
+    summary="List captured request profiles"
+)
+def list_profiles(_: None = Depends(require_admin)) -> List[RequestProfileResponse]:
+    """
+    Retrieve summaries of the most recently profiled requests, newest first.
+
+    Returns:
+        List of request profiles without their call trees.
+    """
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}", response_model=RequestProfileResponse, summary="Get a request profile")
+def get_profile(profile_id: str, _: None = Depends(require_admin)) -> RequestProfileResponse:
+    """
+    Retrieve a captured request profile including its call tree.
+
+    Args:
+        profile_id: ID returned in the X-Profile-Id response header.
+
+    Returns:
+        The request profile.
+
+    Raises:
+        HTTPException: If the profile is unknown or has been evicted.
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' not found.")
+    return profile
+
+
+@router.get("/admission", summary="Get admission control metrics")
+def get_admission_metrics(_: None = Depends(require_admin)) -> Dict[str, int]:
+    """
+    Retrieve counters of admitted, rate-limited and shed requests.
+
+    Returns:
+        Admission control metrics.
+    """
+    return vars(admission_metrics)
+
+
+@router.get("/concurrency", summary="Get threadpool and connection pool saturation metrics")
+async def get_concurrency_metrics(_: None = Depends(require_admin)) -> Dict[str, Any]:
+    """
+    Compare time spent waiting for a worker thread with time spent waiting for a connection.
+
+    A growing thread queue with idle connections means the threadpool is
+    too small; threads waiting on a full pool mean it is too large (or the
+    pool too small). Runs on the event loop, where the thread limiter lives.
+
+    Returns:
+        Threadpool occupancy and wait statistics, per-engine pool
+        occupancy, and connection checkout wait statistics.
+    """
+    engines = [db_session.engine]
+    if db_session.shard_router is not None:
+        engines.extend(db_session.shard_router.engines.values())
+    return {
+        "threadpool": threadpool_stats(),
+        "connection_pools": [pool_status(engine) for engine in engines],
+        "connection_wait": connection_wait.snapshot(),
+    }
+
+
+@router.delete("/concurrency", summary="Reset threadpool and connection wait statistics")
+def reset_concurrency_metrics(_: None = Depends(require_admin)) -> dict:
+    """
+    Zero the thread and connection wait counters.
+
+    Returns:
+        A success message.
+    """
+    thread_wait.reset()
+    connection_wait.reset()
+    return {"detail": "Concurrency metrics reset."}
+
+
+@router.get("/single-flight", summary="Get read coalescing statistics")
+def get_single_flight_stats(_: None = Depends(require_admin)) -> Dict[str, Dict[str, int]]:
+    """
+    Retrieve how many list reads were executed, coalesced or served from the micro-cache.
+
+    Returns:
+        Statistics per coalesced read path.
+    """
+    return {"tasks": vars(task_list_flight.stats), "projects": vars(project_list_flight.stats)}
+
+
+@router.get("/jobs", summary="List scheduled jobs and their run statistics")
+def list_jobs(request: Request, _: None = Depends(require_admin)) -> List[Dict[str, Any]]:
+    """
+    Retrieve run statistics of the in-process job runner.
+
+    Args:
+        request: The incoming request (gives access to the application state).
+
+    Returns:
+        Per-job statistics (next run, runs, failures, durations).
+
+    Raises:
+        HTTPException: If the scheduler is not running in this process.
+    """
+    runner = getattr(request.app.state, "job_runner", None)
+    if runner is None:
+        raise HTTPException(status_code=404, detail="Scheduler is not running in this process.")
+    return runner.stats()
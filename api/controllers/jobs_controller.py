@@ -0,0 +1,69 @@
+from fastapi import APIRouter, HTTPException, Depends, Response
+from sqlalchemy.orm import Session
+from services.job_service import JobService
+from models.job import BackgroundJob
+from ..controller_schemas.responses.jobs_response_schema import JobResponse
+from ..routing import InstrumentedRoute
+from ..responses import render_json_object
+from exceptions.service_exceptions import JobNotFoundError
+from db.session import get_session
+
+router: APIRouter = APIRouter(route_class=InstrumentedRoute)
+"""
+Router for following background jobs.
+"""
+
+def get_job_service(db: Session = Depends(get_session)) -> JobService:
+    """
+    Dependency injection for JobService.
+
+    Args:
+        db: Session of the request.
+
+    Returns:
+        An instance of JobService.
+    """
+    return JobService(db)
+
+
+def accepted(job: BackgroundJob) -> Response:
+    """
+    Build the 202 response of an endpoint that queued a job.
+
+    Args:
+        job: The queued job.
+
+    Returns:
+        The job as JSON, with its status URL in the Location header.
+    """
+    return Response(
+        content=render_json_object(job, JobResponse),
+        status_code=202,
+        media_type="application/json",
+        headers={"Location": f"/api/v1/jobs/{job.id}"}
+    )
+
+
+# ===========================
+# Routes
+# ===========================
+
+@router.get("/{job_id}", response_model=JobResponse, summary="Get the status of a background job")
+def get_job(job_id: str, job_service: JobService = Depends(get_job_service)) -> JobResponse:
+    """
+    Retrieve the status, progress and outcome of a background job.
+
+    Args:
+        job_id: ID of the job (from the 202 response that queued it).
+        job_service: JobService instance (injected dependency).
+
+    Returns:
+        The job.
+
+    Raises:
+        HTTPException: If the job is not found.
+    """
+    try:
+        return job_service.get_job(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -1,23 +1,71 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Generator
+import asyncio
+import os
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
 from services.project_service import ProjectService
+from services.idempotency_service import IdempotencyService
+from services.job_service import JobService
+from services.task_service import TaskService
 from ..controller_schemas.requests.projects_request_schema import ProjectCreateRequest, ProjectUpdateRequest
 from ..controller_schemas.responses.projects_response_schema import ProjectResponse
+from ..routing import InstrumentedRoute
+from ..responses import json_loads, render_json, render_json_object
+from ..idempotency import idempotent_response
+from ..fieldsets import default_fields, fieldset_schema, parse_fields
+from ..preconditions import etag, parse_if_match
+from ..controller_schemas.responses.jobs_response_schema import JobResponse
+from .jobs_controller import accepted, get_job_service
+from .tasks_controller import get_task_service
 from models.project import ProjectError
+from exceptions.service_exceptions import (
+    InvalidIdempotencyKeyError,
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyReusedError,
+    VersionConflictError
+)
+from events.broker import event_broker
+from db.session import get_session
 
-router: APIRouter = APIRouter()
+SSE_HEARTBEAT_SECONDS: float = float(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+PROJECT_DELETE_JOB_THRESHOLD: int = int(os.getenv("PROJECT_DELETE_JOB_THRESHOLD", 1000))
+
+PROJECT_LIST_FIELDS: Tuple[str, ...] = default_fields(ProjectResponse, deferred=("description",))
+"""
+Fields of the project list when the client sends no ``fields=`` (descriptions are not loaded).
+"""
+
+router: APIRouter = APIRouter(route_class=InstrumentedRoute)
 """
 Router for handling project-related API endpoints.
 """
 
-def get_project_service() -> Generator[ProjectService, None, None]:
+def get_project_service(db: Session = Depends(get_session)) -> ProjectService:
     """
     Dependency injection for ProjectService.
 
-    Yields:
+    Args:
+        db: Session of the request (shared by every service of the request).
+
+    Returns:
         An instance of ProjectService.
     """
-    yield ProjectService()
+    return ProjectService(db)
+
+
+def get_idempotency_service(db: Session = Depends(get_session)) -> IdempotencyService:
+    """
+    Dependency injection for IdempotencyService.
+
+    Args:
+        db: Session of the request.
+
+    Returns:
+        An instance of IdempotencyService.
+    """
+    return IdempotencyService(db)
 
 
 # ===========================
@@ -25,93 +73,234 @@ def get_project_service() -> Generator[ProjectService, None, None]:
 # ===========================
 
 @router.get("/", response_model=List[ProjectResponse], summary="List all projects")
-def list_projects(project_service: ProjectService = Depends(get_project_service)) -> List[ProjectResponse]:
+def list_projects(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all but description; * for all)"
+    ),
+    project_service: ProjectService = Depends(get_project_service)
+) -> List[ProjectResponse]:
     """
     Retrieve all projects.
 
+    Only the selected fields are loaded from the database and serialized;
+    descriptions are left out unless requested. Identical concurrent
+    requests share one query and one serialized body.
+
     Args:
+        fields: Comma-separated fields to return (optional).
         project_service: ProjectService instance (injected dependency).
 
     Returns:
-        List of projects.
+        List of projects, restricted to the selected fields.
+
+    Raises:
+        HTTPException: If a field is unknown.
     """
-    return project_service.list_projects()
+    selected = parse_fields(fields, ProjectResponse, PROJECT_LIST_FIELDS)
+    schema = fieldset_schema(ProjectResponse, selected)
+    body = project_service.list_projects_shared(lambda projects: render_json(projects, schema), selected)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/", response_model=ProjectResponse, summary="Create a new project")
 def create_project(
     payload: ProjectCreateRequest,
-    project_service: ProjectService = Depends(get_project_service)
+    request: Request,
+    idempotency_key: Optional[str] = Header(None),
+    project_service: ProjectService = Depends(get_project_service),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service)
 ) -> ProjectResponse:
     """
     Create a new project.
 
+    With an Idempotency-Key header, retries of the request return the
+    original response instead of creating the project again.
+
     Args:
         payload: ProjectCreateRequest containing name and optional description.
+        request: The incoming request.
+        idempotency_key: Client key identifying retries of this request (optional).
         project_service: ProjectService instance (injected dependency).
+        idempotency_service: IdempotencyService instance (injected dependency).
 
     Returns:
-        The created project.
+        The created project, with its ETag.
 
     Raises:
-        HTTPException: If a project with the same name exists or max limit is reached.
+        HTTPException: If a project with the same name exists, max limit is reached,
+            or the Idempotency-Key conflicts.
     """
+    def create() -> bytes:
+        project = project_service.create_project(name=payload.name, description=payload.description)
+        return render_json_object(project, ProjectResponse)
+
     try:
-        return project_service.create_project(name=payload.name, description=payload.description)
-    except ProjectError as e:
+        response = idempotent_response(idempotency_service, idempotency_key, request, payload, create)
+        response.headers["ETag"] = etag(json_loads(response.body)["version"])
+        return response
+    except (ProjectError, InvalidIdempotencyKeyError) as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except IdempotencyKeyInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 
 @router.put("/{project_id}", response_model=ProjectResponse, summary="Update a project")
 def update_project(
     project_id: str,
     payload: ProjectUpdateRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     project_service: ProjectService = Depends(get_project_service)
 ) -> ProjectResponse:
     """
     Update a project's name and/or description.
 
+    With an If-Match header (the project's version, as returned in
+    ``version`` and ETag), the update only applies if nobody changed the
+    project since.
+
     Args:
         project_id: ID of the project to update.
         payload: ProjectUpdateRequest containing new name and/or description.
+        response: The outgoing response (for the ETag header).
+        if_match: Version the client expects the project to be at (optional).
         project_service: ProjectService instance (injected dependency).
 
     Returns:
         The updated project.
 
     Raises:
-        HTTPException: If the project is not found.
+        HTTPException: 412 if the project is not at the If-Match version, 404 if it is not found.
     """
+    expected_version = parse_if_match(if_match)
     try:
-        return project_service.edit_project(
+        project = project_service.edit_project(
             project_id=project_id,
             new_name=payload.name,
-            new_description=payload.description
+            new_description=payload.description,
+            expected_version=expected_version
         )
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except ProjectError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    response.headers["ETag"] = etag(project.version)
+    return project
 
 
-@router.delete("/{project_id}", summary="Delete a project")
+@router.delete(
+    "/{project_id}",
+    summary="Delete a project",
+    responses={202: {"model": JobResponse, "description": "Deletion queued as a background job"}}
+)
 def delete_project(
     project_id: str,
-    project_service: ProjectService = Depends(get_project_service)
+    prefer: Optional[str] = Header(None),
+    project_service: ProjectService = Depends(get_project_service),
+    task_service: TaskService = Depends(get_task_service),
+    job_service: JobService = Depends(get_job_service)
 ) -> dict:
     """
     Delete a project by ID.
 
+    Projects with more than PROJECT_DELETE_JOB_THRESHOLD tasks (or any
+    project, with a ``Prefer: respond-async`` header) are deleted by a
+    background job: the response is 202 with the job, to follow at
+    ``GET /api/v1/jobs/{id}``.
+
     Args:
         project_id: The ID of the project to delete.
+        prefer: ``respond-async`` to always delete in the background (optional).
         project_service: ProjectService instance (injected dependency).
+        task_service: TaskService instance (injected dependency).
+        job_service: JobService instance (injected dependency).
 
     Returns:
-        A success message.
+        A success message, or the queued job.
 
     Raises:
         HTTPException: If the project is not found.
     """
     try:
+        project_service.get_project_by_id(project_id)
+        respond_async = prefer is not None and "respond-async" in prefer
+        if respond_async or task_service.count_tasks(project_id, completed_occurrences=True) > PROJECT_DELETE_JOB_THRESHOLD:
+            return accepted(job_service.enqueue("project.delete", {"project_id": project_id}))
         project_service.delete_project(project_id)
         return {"detail": "Project deleted successfully."}
     except ProjectError as e:
         raise HTTPException(status_code=404, detail=str(e))
+
+
+def _check_project_exists(project_id: str) -> None:
+    """
+    Look a project up in a session of its own, closed before returning.
+
+    A stream lasts as long as the client stays connected; a session from
+    ``get_project_service`` would hold a pooled connection all that time.
+
+    Raises:
+        ProjectError: If the project is not found.
+    """
+    project_service = ProjectService()
+    try:
+        project_service.get_project_by_id(project_id)
+    finally:
+        project_service.db_session.close()
+
+
+@router.get("/{project_id}/events", summary="Stream change events of a project")
+async def stream_project_events(
+    project_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(None)
+) -> StreamingResponse:
+    """
+    Stream task and project changes as server-sent events.
+
+    Events are ``task.created``, ``task.updated``, ``task.status_changed``,
+    ``task.moved``, ``task.deleted``, ``project.updated`` and ``project.deleted``. Clients
+    reconnecting with a Last-Event-ID header first receive the events they
+    missed, as far as the broker's history reaches.
+
+    Args:
+        project_id: ID of the project to watch.
+        request: The incoming request (used to detect disconnects).
+        last_event_id: ID of the last event the client received (optional).
+
+    Returns:
+        A text/event-stream response.
+
+    Raises:
+        HTTPException: If the project is not found.
+    """
+    try:
+        await run_in_threadpool(_check_project_exists, project_id)
+    except ProjectError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    subscription, missed = event_broker.subscribe(project_id, last_event_id)
+
+    async def stream() -> AsyncIterator[str]:
+        try:
+            for event in missed:
+                yield event.to_sse()
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield event.to_sse()
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,59 +1,184 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Generator
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from datetime import date
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
 from services.task_service import TaskService
+from services.project_service import ProjectService
+from services.idempotency_service import IdempotencyService
+from services.job_service import JobService
 from ..controller_schemas.requests.tasks_request_schema import (
     TaskCreateRequest,
     TaskUpdateRequest,
-    TaskStatusUpdateRequest
+    TaskStatusUpdateRequest,
+    TaskMoveRequest,
+    TaskBatchGetRequest
 )
-from ..controller_schemas.responses.tasks_response_schema import TaskResponse
-from exceptions.service_exceptions import TaskLimitReachedError
-from repositories.project_repository import ProjectRepository
-from repositories.task_repository import TaskRepository
-from db.session import SessionLocal
+from ..controller_schemas.responses.tasks_response_schema import TaskResponse, TaskBatchResponse
+from ..controller_schemas.responses.jobs_response_schema import JobResponse
+from .jobs_controller import accepted, get_job_service
+from ..routing import InstrumentedRoute
+from ..responses import json_loads, render_json, render_json_object
+from ..idempotency import idempotent_response
+from ..fieldsets import default_fields, fieldset_schema, parse_fields
+from ..preconditions import etag, parse_if_match
+from models.project import ProjectError
+from exceptions.service_exceptions import (
+    TaskLimitReachedError,
+    ArchivedTaskNotFoundError,
+    InvalidIdempotencyKeyError,
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyReusedError,
+    VersionConflictError,
+    BatchTooLargeError,
+    InvalidRecurrenceError,
+    InvalidTaskMoveError
+)
+from repositories.factory import create_project_repository, create_task_repository
+from db.session import get_session
+
+TASK_LIST_FIELDS: Tuple[str, ...] = default_fields(TaskResponse, deferred=("description",))
+"""
+Fields of the task list when the client sends no ``fields=`` (descriptions are not loaded).
+"""
 
-router: APIRouter = APIRouter()
+router: APIRouter = APIRouter(route_class=InstrumentedRoute)
 """
 Router for handling task-related API endpoints.
 """
 
-def get_task_service() -> Generator[TaskService, None, None]:
+def get_task_service(db: Session = Depends(get_session)) -> TaskService:
     """
     Dependency injection for TaskService.
 
-    Yields:
+    Args:
+        db: Session of the request (shared by every service of the request).
+
+    Returns:
         An instance of TaskService with repositories initialized.
     """
-    db = SessionLocal()
-    project_repo = ProjectRepository(db)
-    task_repo = TaskRepository(db)
-    yield TaskService(task_repo=task_repo, project_repo=project_repo)
+    return TaskService(
+        task_repo=create_task_repository(db),
+        project_repo=create_project_repository(db),
+        job_service=JobService(db)
+    )
+
+
+def get_idempotency_service(db: Session = Depends(get_session)) -> IdempotencyService:
+    """
+    Dependency injection for IdempotencyService.
+
+    Args:
+        db: Session of the request.
+
+    Returns:
+        An instance of IdempotencyService.
+    """
+    return IdempotencyService(db)
 
 
 # ===========================
 # Routes
 # ===========================
 
+def _tasks_by_ids(task_service: TaskService, task_ids: List[str]) -> Response:
+    try:
+        tasks, missing = task_service.get_tasks(task_ids)
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    body = render_json_object({"tasks": tasks, "missing": missing}, TaskBatchResponse)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("", response_model=TaskBatchResponse, summary="Get many tasks by ID")
+def get_tasks(
+    ids: str = Query(..., description="Comma-separated task IDs"),
+    task_service: TaskService = Depends(get_task_service)
+) -> TaskBatchResponse:
+    """
+    Retrieve many tasks in one request, e.g. ``GET /api/v1/tasks?ids=a,b,c``.
+
+    Args:
+        ids: Comma-separated task IDs.
+        task_service: TaskService instance (injected dependency).
+
+    Returns:
+        The tasks found, in request order, and the IDs that were not found.
+
+    Raises:
+        HTTPException: If more than MAX_TASK_IDS_PER_REQUEST IDs are requested.
+    """
+    return _tasks_by_ids(task_service, [task_id.strip() for task_id in ids.split(",") if task_id.strip()])
+
+
+@router.post("/batch-get", response_model=TaskBatchResponse, summary="Get many tasks by ID (long ID lists)")
+def batch_get_tasks(
+    payload: TaskBatchGetRequest,
+    task_service: TaskService = Depends(get_task_service)
+) -> TaskBatchResponse:
+    """
+    Retrieve many tasks in one request, with the IDs in the body.
+
+    Same as ``GET /api/v1/tasks?ids=...`` for ID lists too long for a URL.
+
+    Args:
+        payload: TaskBatchGetRequest containing the task IDs.
+        task_service: TaskService instance (injected dependency).
+
+    Returns:
+        The tasks found, in request order, and the IDs that were not found.
+
+    Raises:
+        HTTPException: If more than MAX_TASK_IDS_PER_REQUEST IDs are requested.
+    """
+    return _tasks_by_ids(task_service, payload.ids)
+
+
 @router.get("/project/{project_id}", response_model=List[TaskResponse], summary="List all tasks for a project")
 def list_tasks(
     project_id: str,
+    include_archived: bool = Query(False, description="Also return archived tasks"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all but description; * for all)"
+    ),
+    until: Optional[date] = Query(
+        None, description="Also create the recurring task occurrences due up to this day (YYYY-MM-DD)"
+    ),
     task_service: TaskService = Depends(get_task_service)
 ) -> List[TaskResponse]:
     """
-    Retrieve all tasks for a specific project.
+    Retrieve all tasks for a specific project, in ``position`` order.
+
+    Only the selected fields are loaded from the database and serialized;
+    descriptions are left out unless requested. Identical concurrent
+    requests share one query and one serialized body.
+
+    Recurring tasks only have their next occurrence stored; ``until``
+    creates the further occurrences that fall into the window first.
 
     Args:
         project_id: ID of the project.
+        include_archived: Also return tasks moved to the archive.
+        fields: Comma-separated fields to return (optional).
+        until: Last day of the window to create recurring occurrences for (optional).
         task_service: TaskService instance (injected dependency).
 
     Returns:
-        List of TaskResponse objects.
+        List of TaskResponse objects, restricted to the selected fields.
 
     Raises:
-        HTTPException: If tasks cannot be retrieved.
+        HTTPException: If a field is unknown or tasks cannot be retrieved.
     """
+    selected = parse_fields(fields, TaskResponse, TASK_LIST_FIELDS)
+    schema = fieldset_schema(TaskResponse, selected)
     try:
-        return task_service.list_tasks(project_id)
+        if until is not None:
+            task_service.materialize_occurrences(project_id, until)
+        if include_archived:
+            tasks = task_service.list_tasks(project_id, include_archived=True, fields=selected)
+            body = render_json(tasks, schema)
+        else:
+            body = task_service.list_tasks_shared(project_id, lambda tasks: render_json(tasks, schema), selected)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -62,71 +187,157 @@ def list_tasks(
 def create_task(
     project_id: str,
     payload: TaskCreateRequest,
-    task_service: TaskService = Depends(get_task_service)
+    request: Request,
+    idempotency_key: Optional[str] = Header(None),
+    task_service: TaskService = Depends(get_task_service),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service)
 ) -> TaskResponse:
     """
     Create a new task for a specific project.
 
+    With an Idempotency-Key header, retries of the request return the
+    original response instead of creating the task again.
+
     Args:
         project_id: ID of the project.
         payload: TaskCreateRequest containing title, optional description, and optional deadline.
+        request: The incoming request.
+        idempotency_key: Client key identifying retries of this request (optional).
         task_service: TaskService instance (injected dependency).
+        idempotency_service: IdempotencyService instance (injected dependency).
 
     Returns:
-        The created task as TaskResponse.
+        The created task as TaskResponse, with its ETag.
 
     Raises:
-        HTTPException: If task limit is exceeded or creation fails.
+        HTTPException: If task limit is exceeded, the recurrence rule is invalid,
+            the Idempotency-Key conflicts, or creation fails.
     """
-    try:
-        return task_service.create_task(
+    def create() -> bytes:
+        task = task_service.create_task(
             project_id=project_id,
             title=payload.title,
             description=payload.description,
-            deadline=payload.deadline
+            deadline=payload.deadline,
+            recurrence=payload.recurrence
         )
-    except TaskLimitReachedError as e:
+        return render_json_object(task, TaskResponse)
+
+    try:
+        response = idempotent_response(idempotency_service, idempotency_key, request, payload, create)
+        response.headers["ETag"] = etag(json_loads(response.body)["version"])
+        return response
+    except (TaskLimitReachedError, InvalidIdempotencyKeyError, InvalidRecurrenceError) as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except IdempotencyKeyInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.post(
+    "/project/{project_id}/import",
+    response_model=JobResponse,
+    status_code=202,
+    summary="Import tasks into a project in the background"
+)
+def import_tasks(
+    project_id: str,
+    payload: List[TaskCreateRequest],
+    task_service: TaskService = Depends(get_task_service),
+    job_service: JobService = Depends(get_job_service)
+) -> JobResponse:
+    """
+    Queue the creation of many tasks as a background job.
+
+    The response is 202 with the job; follow it at ``GET /api/v1/jobs/{id}``.
+
+    Args:
+        project_id: ID of the project.
+        payload: The tasks to create.
+        task_service: TaskService instance (injected dependency).
+        job_service: JobService instance (injected dependency).
+
+    Returns:
+        The queued job.
+
+    Raises:
+        HTTPException: If the project does not exist, or the tasks would
+            exceed its task limit.
+    """
+    try:
+        ProjectService(project_repo=task_service.project_repo).get_project_by_id(project_id)
+    except ProjectError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    try:
+        task_service.ensure_capacity(project_id, len(payload))
+    except TaskLimitReachedError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job = job_service.enqueue(
+        "tasks.import",
+        {"project_id": project_id, "tasks": [item.model_dump() for item in payload]},
+        total=len(payload)
+    )
+    return accepted(job)
+
+
 @router.put("/{task_id}", response_model=TaskResponse, summary="Update a task")
 def update_task(
     task_id: str,
     payload: TaskUpdateRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     task_service: TaskService = Depends(get_task_service)
 ) -> TaskResponse:
     """
     Update a task's details.
 
+    With an If-Match header (the task's version, as returned in ``version``
+    and ETag), the update only applies if nobody changed the task since.
+
     Args:
         task_id: ID of the task to update.
         payload: TaskUpdateRequest containing new title, description, status, and/or deadline.
+        response: The outgoing response (for the ETag header).
+        if_match: Version the client expects the task to be at (optional).
         task_service: TaskService instance (injected dependency).
 
     Returns:
         The updated task as TaskResponse.
 
     Raises:
-        HTTPException: If the task cannot be updated.
+        HTTPException: 412 if the task is not at the If-Match version, 400 if the
+            recurrence rule is invalid, 404 if it cannot be updated.
     """
+    expected_version = parse_if_match(if_match)
     try:
-        return task_service.update_task(
+        task = task_service.update_task(
             task_id=task_id,
             title=payload.title,
             description=payload.description,
             status=payload.status,
-            deadline=payload.deadline
+            deadline=payload.deadline,
+            expected_version=expected_version,
+            recurrence=payload.recurrence
         )
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    except InvalidRecurrenceError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
+    response.headers["ETag"] = etag(task.version)
+    return task
 
 
 @router.patch("/{task_id}/status", response_model=TaskResponse, summary="Update task status")
 def update_task_status(
     task_id: str,
     payload: TaskStatusUpdateRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     task_service: TaskService = Depends(get_task_service)
 ) -> TaskResponse:
     """
@@ -135,18 +346,95 @@ def update_task_status(
     Args:
         task_id: ID of the task.
         payload: TaskStatusUpdateRequest containing the new status.
+        response: The outgoing response (for the ETag header).
+        if_match: Version the client expects the task to be at (optional).
         task_service: TaskService instance (injected dependency).
 
     Returns:
         The updated task as TaskResponse.
 
     Raises:
-        HTTPException: If the task status cannot be updated.
+        HTTPException: 412 if the task is not at the If-Match version, 404 if the status cannot be updated.
+    """
+    expected_version = parse_if_match(if_match)
+    try:
+        task = task_service.update_status(
+            task_id=task_id,
+            new_status=payload.status,
+            expected_version=expected_version
+        )
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    response.headers["ETag"] = etag(task.version)
+    return task
+
+
+@router.post("/{task_id}/move", response_model=TaskResponse, summary="Move a task within its project")
+def move_task(
+    task_id: str,
+    payload: TaskMoveRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    task_service: TaskService = Depends(get_task_service)
+) -> TaskResponse:
+    """
+    Place a task right after another task (or first), e.g. after a drag and drop.
+
+    Only the moved task is updated (see TaskService.move_task).
+
+    Args:
+        task_id: ID of the task to move.
+        payload: TaskMoveRequest containing the task to place it after.
+        response: The outgoing response (for the ETag header).
+        if_match: Version the client expects the task to be at (optional).
+        task_service: TaskService instance (injected dependency).
+
+    Returns:
+        The moved task as TaskResponse.
+
+    Raises:
+        HTTPException: 412 if the task is not at the If-Match version, 400 if
+            ``after_id`` is not in the same project, 404 if the task is not found.
     """
+    expected_version = parse_if_match(if_match)
     try:
-        return task_service.update_status(task_id=task_id, new_status=payload.status)
+        task = task_service.move_task(task_id, payload.after_id, expected_version=expected_version)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    except InvalidTaskMoveError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
+    response.headers["ETag"] = etag(task.version)
+    return task
+
+
+@router.post("/{task_id}/restore", response_model=TaskResponse, summary="Restore an archived task")
+def restore_task(
+    task_id: str,
+    task_service: TaskService = Depends(get_task_service)
+) -> TaskResponse:
+    """
+    Move an archived task back to its project's task list.
+
+    Args:
+        task_id: ID of the archived task.
+        task_service: TaskService instance (injected dependency).
+
+    Returns:
+        The restored task as TaskResponse.
+
+    Raises:
+        HTTPException: If the task is not archived or the project is full.
+    """
+    try:
+        return task_service.restore_task(task_id)
+    except ArchivedTaskNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except TaskLimitReachedError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/{task_id}", summary="Delete a task")
@@ -0,0 +1,93 @@
+from fastapi import APIRouter, HTTPException, Depends
+from typing import List
+from sqlalchemy.orm import Session
+from services.webhook_service import WebhookService
+from ..controller_schemas.requests.webhooks_request_schema import WebhookCreateRequest
+from ..controller_schemas.responses.webhooks_response_schema import WebhookResponse
+from ..routing import InstrumentedRoute
+from .admin_controller import require_admin
+from exceptions.service_exceptions import WebhookNotFoundError
+from db.session import get_session
+
+router: APIRouter = APIRouter(route_class=InstrumentedRoute, dependencies=[Depends(require_admin)])
+"""
+Router for managing webhook subscriptions (admin only).
+"""
+
+def get_webhook_service(db: Session = Depends(get_session)) -> WebhookService:
+    """
+    Dependency injection for WebhookService.
+
+    Args:
+        db: Session of the request.
+
+    Returns:
+        An instance of WebhookService.
+    """
+    return WebhookService(db)
+
+
+# ===========================
+# Routes
+# ===========================
+
+@router.get("/", response_model=List[WebhookResponse], summary="List webhook subscriptions")
+def list_webhooks(webhook_service: WebhookService = Depends(get_webhook_service)) -> List[WebhookResponse]:
+    """
+    Retrieve all webhook subscriptions.
+
+    Args:
+        webhook_service: WebhookService instance (injected dependency).
+
+    Returns:
+        List of webhook subscriptions.
+    """
+    return webhook_service.list_subscriptions()
+
+
+@router.post("/", response_model=WebhookResponse, summary="Register a webhook")
+def create_webhook(
+    payload: WebhookCreateRequest,
+    webhook_service: WebhookService = Depends(get_webhook_service)
+) -> WebhookResponse:
+    """
+    Register a webhook for task and project change events.
+
+    Args:
+        payload: WebhookCreateRequest with the URL and optional filters.
+        webhook_service: WebhookService instance (injected dependency).
+
+    Returns:
+        The created webhook subscription.
+    """
+    return webhook_service.create_subscription(
+        url=str(payload.url),
+        project_id=payload.project_id,
+        event_types=payload.event_types,
+        secret=payload.secret
+    )
+
+
+@router.delete("/{webhook_id}", summary="Delete a webhook")
+def delete_webhook(
+    webhook_id: str,
+    webhook_service: WebhookService = Depends(get_webhook_service)
+) -> dict:
+    """
+    Delete a webhook subscription.
+
+    Args:
+        webhook_id: ID of the subscription.
+        webhook_service: WebhookService instance (injected dependency).
+
+    Returns:
+        A success message.
+
+    Raises:
+        HTTPException: If the subscription is not found.
+    """
+    try:
+        webhook_service.delete_subscription(webhook_id)
+        return {"detail": "Webhook deleted successfully."}
+    except WebhookNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,64 @@
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict, create_model
+
+ALL_FIELDS: str = "*"
+
+
+def default_fields(schema: Type[BaseModel], deferred: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Fields of a schema returned when the client sends no ``fields=``.
+    """
+    deferred = set(deferred)
+    return tuple(name for name in schema.model_fields if name not in deferred)
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel], default: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Resolve a ``fields=`` query parameter against a response schema.
+
+    The result is in schema order and always contains ``id``; ``*`` selects
+    every field.
+
+    Args:
+        fields: Comma-separated field names, or None.
+        schema: The full response schema.
+        default: Fields to use when the parameter is missing.
+
+    Returns:
+        The selected field names.
+
+    Raises:
+        HTTPException: 400 if a name is not a field of the schema.
+    """
+    if fields is None:
+        return default
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    if ALL_FIELDS in names:
+        return tuple(schema.model_fields)
+    unknown = sorted(names - set(schema.model_fields))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)} (available: {', '.join(schema.model_fields)})."
+        )
+    return tuple(name for name in schema.model_fields if name == "id" or name in names)
+
+
+@lru_cache(maxsize=256)
+def fieldset_schema(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    The response schema restricted to ``fields`` (the schema itself if all are selected).
+
+    The restricted schema only reads the selected attributes, so columns
+    left unloaded by the query are never fetched during serialization.
+    """
+    if fields == tuple(schema.model_fields):
+        return schema
+    return create_model(
+        f"{schema.__name__}Fieldset",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (info.annotation, info) for name, info in schema.model_fields.items() if name in fields}
+    )
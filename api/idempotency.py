@@ -0,0 +1,55 @@
+import hashlib
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from services.idempotency_service import IdempotencyService
+
+REPLAYED_HEADER: str = "Idempotent-Replayed"
+
+
+def request_fingerprint(request: Request, payload: BaseModel) -> str:
+    """
+    Hash the method, path and validated body of a request.
+    """
+    digest = hashlib.sha256(f"{request.method} {request.url.path}\n".encode())
+    digest.update(payload.model_dump_json().encode())
+    return digest.hexdigest()
+
+
+def idempotent_response(
+    service: IdempotencyService,
+    key: Optional[str],
+    request: Request,
+    payload: BaseModel,
+    create: Callable[[], bytes]
+) -> Response:
+    """
+    Run a create endpoint at most once per Idempotency-Key.
+
+    Without a key the request simply runs. With a key, a retry gets the
+    stored response back, marked with an ``Idempotent-Replayed: true`` header.
+
+    Args:
+        service: IdempotencyService of the request.
+        key: The Idempotency-Key header, if sent.
+        request: The incoming request.
+        payload: The validated request body.
+        create: Performs the write and returns the JSON response body.
+
+    Returns:
+        The JSON response.
+    """
+    if key is None:
+        return Response(content=create(), media_type="application/json")
+
+    stored, replayed = service.run(
+        key,
+        request_fingerprint(request, payload),
+        lambda: (200, create().decode())
+    )
+    response = Response(content=stored.body, status_code=stored.status_code, media_type="application/json")
+    if replayed:
+        response.headers[REPLAYED_HEADER] = "true"
+    return response
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+
+
+class RateLimitStore(ABC):
+    """
+    Storage backend for per-client token buckets.
+
+    Subclass it to share rate-limit state between processes (e.g. Redis);
+    ``take`` must be atomic per key.
+    """
+
+    @abstractmethod
+    def take(self, key: str, rate: float, burst: int) -> Tuple[bool, float]:
+        """
+        Take one token from the bucket of ``key``.
+
+        Args:
+            key: Client key (API key or IP address).
+            rate: Tokens added per second.
+            burst: Bucket capacity.
+
+        Returns:
+            Whether a token was available, and seconds until the next one is.
+        """
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """
+    Process-local token buckets, evicting the least recently seen clients
+    beyond ``max_keys``.
+    """
+
+    def __init__(self, max_keys: int = 10000) -> None:
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: int) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (float(burst), now))
+            tokens = min(float(burst), tokens + (now - updated) * rate)
+            allowed = tokens >= 1.0
+            if allowed:
+                tokens -= 1.0
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1.0 - tokens) / rate
+
+
+@dataclass
+class AdmissionMetrics:
+    """
+    Counters of the admission control middleware.
+
+    Attributes:
+        admitted: Requests let through.
+        rate_limited: Requests rejected with 429 (per-client limit).
+        shed: Requests rejected with 503 (global concurrency limit).
+        in_flight: Requests currently being processed.
+        waiting: Requests currently queued for a concurrency slot.
+        max_in_flight: Highest observed in_flight.
+        concurrency_limit: Configured concurrency limit.
+    """
+    admitted: int = 0
+    rate_limited: int = 0
+    shed: int = 0
+    in_flight: int = 0
+    waiting: int = 0
+    max_in_flight: int = 0
+    concurrency_limit: int = 0
+
+
+admission_metrics: AdmissionMetrics = AdmissionMetrics()
+"""
+Metrics of the AdmissionControlMiddleware, viewable through the admin API.
+"""
+
+
+def _default_exempt(path: str) -> bool:
+    # Long-lived SSE streams must not hold a concurrency slot
+    return path.endswith("/events")
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware shedding load before it queues on the DB pool.
+
+    Each client (its X-API-Key when that is one of ``api_keys``, else its
+    IP address) gets a token bucket of ``rate`` requests per second with ``burst`` capacity; requests beyond it
+    get 429. At most ``max_concurrency`` requests (sized to the DB pool) are
+    processed at once; a request may wait up to ``max_wait`` seconds for a
+    slot, and at most ``max_queue`` requests wait at a time, otherwise it
+    gets 503. Both responses carry Retry-After.
+
+    Unknown API keys fall back to the IP address: the header is not
+    authenticated, so keying on any value would let a client get a fresh
+    bucket per request.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_concurrency: int,
+        rate: float = 0.0,
+        burst: int = 0,
+        max_wait: float = 0.5,
+        max_queue: int = 100,
+        store: Optional[RateLimitStore] = None,
+        api_keys: Collection[str] = (),
+        exempt: Callable[[str], bool] = _default_exempt,
+        metrics: AdmissionMetrics = admission_metrics
+    ) -> None:
+        """
+        Args:
+            app: The wrapped ASGI application.
+            max_concurrency: Requests processed at the same time.
+            rate: Per-client requests per second (0 disables rate limiting).
+            burst: Per-client bucket capacity (defaults to ``rate``).
+            max_wait: Seconds a request may wait for a concurrency slot.
+            max_queue: Requests allowed to wait for a slot at the same time.
+            store: Token bucket storage (in-memory by default).
+            api_keys: API keys that get a bucket of their own.
+            exempt: Predicate on the path for requests bypassing both limits.
+            metrics: Counters to update.
+        """
+        self.app = app
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst or max(1, math.ceil(rate))
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.store = store or InMemoryRateLimitStore()
+        self.api_keys = frozenset(api_keys)
+        self.exempt = exempt
+        self.metrics = metrics
+        self.metrics.concurrency_limit = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or self.exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate > 0:
+            allowed, retry_after = self.store.take(self._client_key(scope), self.rate, self.burst)
+            if not allowed:
+                self.metrics.rate_limited += 1
+                await self._reject(send, 429, "Rate limit exceeded.", retry_after)
+                return
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        if not await self._acquire():
+            self.metrics.shed += 1
+            await self._reject(send, 503, "Server is busy, try again later.", 1.0)
+            return
+
+        self.metrics.admitted += 1
+        self.metrics.in_flight += 1
+        self.metrics.max_in_flight = max(self.metrics.max_in_flight, self.metrics.in_flight)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.metrics.in_flight -= 1
+            self._semaphore.release()
+
+    async def _acquire(self) -> bool:
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return True
+        if self.metrics.waiting >= self.max_queue or self.max_wait <= 0:
+            return False
+        self.metrics.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.metrics.waiting -= 1
+
+    def _client_key(self, scope) -> str:
+        api_key = dict(scope["headers"]).get(b"x-api-key", b"").decode("latin-1")
+        if api_key in self.api_keys:
+            return "key:" + api_key
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    @staticmethod
+    async def _reject(send, status: int, detail: str, retry_after: float) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        headers: List[Tuple[bytes, bytes]] = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,164 @@
+import gzip
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from api.responses import MSGPACK_MEDIA_TYPES, json_to_msgpack, msgpack
+
+try:
+    import brotli
+except ImportError:  # optional: pip install "todolist[fast]"
+    brotli = None
+
+
+def _parse_accept(value: str) -> Dict[str, float]:
+    """
+    Parse an Accept / Accept-Encoding header into ``{token: q}``.
+    """
+    accepted: Dict[str, float] = {}
+    for part in value.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, val = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(val)
+                except ValueError:
+                    q = 0.0
+        if token:
+            accepted[token.strip().lower()] = q
+    return accepted
+
+
+class ResponseEncodingMiddleware:
+    """
+    ASGI middleware negotiating the representation of buffered responses.
+
+    JSON responses are re-encoded as MessagePack when the client prefers
+    ``application/msgpack`` (and msgpack is installed). Bodies of at least
+    ``minimum_size`` bytes are then compressed with brotli (when installed)
+    or gzip, following Accept-Encoding. Streaming responses (event streams
+    such as the SSE change feed, and any response without a Content-Length)
+    are passed through untouched, headers included, so nothing is held back.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        compression: bool = True,
+        allow_msgpack: bool = True
+    ) -> None:
+        """
+        Args:
+            app: The wrapped ASGI application.
+            minimum_size: Smallest body (in bytes) worth compressing.
+            gzip_level: gzip compression level (1-9).
+            brotli_quality: brotli quality (0-11).
+            compression: Compress responses at all.
+            allow_msgpack: Serve MessagePack to clients asking for it.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.compression = compression
+        self.allow_msgpack = allow_msgpack and msgpack is not None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = self._choose_encoding(headers.get("accept-encoding", "")) if self.compression else None
+        wants_msgpack = self.allow_msgpack and self._wants_msgpack(headers.get("accept", ""))
+        if encoding is None and not wants_msgpack:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _EncodingResponder(send, self, encoding, wants_msgpack)
+        await self.app(scope, receive, responder)
+
+    @staticmethod
+    def _choose_encoding(accept_encoding: str) -> Optional[str]:
+        accepted = _parse_accept(accept_encoding)
+        candidates: List[str] = (["br"] if brotli is not None else []) + ["gzip"]
+        for name in candidates:
+            if accepted.get(name, accepted.get("*", 0.0)) > 0:
+                return name
+        return None
+
+    @staticmethod
+    def _wants_msgpack(accept: str) -> bool:
+        accepted = _parse_accept(accept)
+        msgpack_q = max(accepted.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+        return msgpack_q > 0 and msgpack_q >= accepted.get("application/json", 0.0)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+
+class _EncodingResponder:
+    """
+    ``send`` wrapper holding back the response start of buffered responses
+    until the body is known.
+    """
+
+    def __init__(self, send, middleware: ResponseEncodingMiddleware, encoding: Optional[str], wants_msgpack: bool):
+        self.send = send
+        self.middleware = middleware
+        self.encoding = encoding
+        self.wants_msgpack = wants_msgpack
+        self.start_message: Optional[dict] = None
+        self.passthrough = False
+
+    async def __call__(self, message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if "content-length" not in headers or headers.get("content-type", "").startswith("text/event-stream"):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough or self.start_message is None:
+            await self.send(message)
+            return
+
+        start, self.start_message = self.start_message, None
+        if message.get("more_body", False):
+            # Body sent in several chunks despite a Content-Length: forward as is
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers = MutableHeaders(raw=list(start["headers"]))
+        body = self._encode(headers, message.get("body", b""))
+        headers["content-length"] = str(len(body))
+        start["headers"] = headers.raw
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": body})
+
+    def _encode(self, headers: MutableHeaders, body: bytes) -> bytes:
+        if self.wants_msgpack and body and headers.get("content-type", "").startswith("application/json"):
+            body = json_to_msgpack(body)
+            headers["content-type"] = MSGPACK_MEDIA_TYPES[0]
+            headers.add_vary_header("Accept")
+
+        if (
+            self.encoding is not None
+            and len(body) >= self.middleware.minimum_size
+            and "content-encoding" not in headers
+        ):
+            body = self.middleware.compress(body, self.encoding)
+            headers["content-encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+        return body
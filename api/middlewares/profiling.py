@@ -0,0 +1,223 @@
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+PROFILE_HEADER: bytes = b"x-profile"
+PROFILE_ID_HEADER: bytes = b"x-profile-id"
+
+# Path fragments used to attribute self time to an application layer.
+# Order matters: the first match wins.
+LAYERS: List[tuple] = [
+    ("controller", os.sep + os.path.join("api", "controllers") + os.sep),
+    ("service", os.sep + "services" + os.sep),
+    ("repository", os.sep + "repositories" + os.sep),
+    ("sqlalchemy", os.sep + "sqlalchemy" + os.sep),
+    ("serialization", os.sep + "pydantic"),
+    ("serialization", os.sep + os.path.join("fastapi", "encoders")),
+]
+
+PROFILER_SEES_ALL_THREADS: bool = sys.version_info >= (3, 12)
+"""
+From Python 3.12 cProfile is built on sys.monitoring: a single profiler
+records every thread, and enabling a second one while it runs raises
+ValueError ("Another profiling tool is already active").
+"""
+
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+"""
+Profile of the request being handled, or None when the request is not profiled.
+"""
+
+
+def _layer_of(filename: str) -> str:
+    for layer, fragment in LAYERS:
+        if fragment in filename:
+            return layer
+    return "other"
+
+
+@dataclass
+class RequestProfile:
+    """
+    Deterministic profile of a single HTTP request.
+
+    Attributes:
+        id: Identifier returned to the client in the X-Profile-Id header.
+        method: HTTP method of the profiled request.
+        path: Path of the profiled request.
+        started_at: When profiling started.
+        duration_ms: Total wall-clock time of the request.
+        layers: Self time in seconds per layer (controller, service, ...).
+        functions: Hottest functions by cumulative time.
+        report: Text report of the call tree (pstats, cumulative order).
+    """
+    id: str
+    method: str
+    path: str
+    started_at: datetime = field(default_factory=datetime.now)
+    duration_ms: float = 0.0
+    layers: Dict[str, float] = field(default_factory=dict)
+    functions: List[Dict[str, Any]] = field(default_factory=list)
+    report: str = ""
+    _profilers: List[cProfile.Profile] = field(default_factory=list, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @contextmanager
+    def profile_thread(self) -> Iterator[None]:
+        """
+        Profile the calling thread for the duration of the block.
+
+        Where one profiler covers every thread (PROFILER_SEES_ALL_THREADS),
+        a block nested in one that is already profiling this request (e.g.
+        the worker thread of a sync endpoint) adds nothing, so the request
+        keeps a single profiler.
+        """
+        with self._lock:
+            if PROFILER_SEES_ALL_THREADS and self._profilers:
+                profiler = None
+            else:
+                profiler = cProfile.Profile()
+                self._profilers.append(profiler)
+        if profiler is None:
+            yield
+            return
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+
+    def summarize(self, top: int = 40) -> None:
+        """
+        Merge per-thread profilers into the layer breakdown and reports.
+
+        Args:
+            top: Number of functions to keep in ``functions`` and ``report``.
+        """
+        if not self._profilers:
+            return
+        out = io.StringIO()
+        stats = pstats.Stats(self._profilers[0], stream=out)
+        for profiler in self._profilers[1:]:
+            stats.add(profiler)
+
+        layers: Dict[str, float] = {}
+        functions: List[Dict[str, Any]] = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            layer = _layer_of(filename)
+            layers[layer] = layers.get(layer, 0.0) + tottime
+            functions.append({
+                "function": f"{filename}:{line}({name})",
+                "layer": layer,
+                "calls": calls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+            })
+        functions.sort(key=lambda f: f["cumtime"], reverse=True)
+
+        stats.sort_stats("cumulative").print_callees(top)
+
+        self.layers = {layer: round(seconds, 6) for layer, seconds in layers.items()}
+        self.functions = functions[:top]
+        self.report = out.getvalue()
+        self._profilers.clear()
+
+
+class ProfileStore:
+    """
+    Bounded in-memory store of the most recent request profiles.
+    """
+
+    def __init__(self, max_entries: int = 20) -> None:
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+
+profile_store: ProfileStore = ProfileStore(int(os.getenv("PROFILE_STORE_SIZE", 20)))
+"""
+Profiles captured by ProfilingMiddleware, viewable through the admin API.
+"""
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests that carry a valid X-Profile header.
+
+    Requests without the header are passed straight through. A profiled
+    request runs under cProfile on the event loop thread (routing,
+    serialization) and on the worker thread that executes the sync endpoint
+    (controller, services, repositories, SQLAlchemy): from Python 3.12 the
+    loop thread's profiler sees the worker too; before, InstrumentedRoute
+    profiles the worker separately. Only one request is profiled at a time;
+    coroutines of other requests interleaving on the loop (and, from 3.12,
+    threads running other requests) during that window are included.
+    The profile is kept in ``profile_store`` and its ID is returned in the
+    X-Profile-Id response header.
+    """
+
+    def __init__(self, app, token: str, store: ProfileStore = profile_store) -> None:
+        self.app = app
+        self.token = token.encode()
+        self.store = store
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = dict(scope["headers"]).get(PROFILE_HEADER)
+        if header is None or not hmac.compare_digest(header, self.token):
+            await self.app(scope, receive, send)
+            return
+
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(id=uuid.uuid4().hex[:12], method=scope["method"], path=scope["path"])
+
+        async def send_with_profile_id(message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(PROFILE_ID_HEADER, profile.id.encode())]
+            await send(message)
+
+        token = current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            with profile.profile_thread():
+                await self.app(scope, receive, send_with_profile_id)
+        finally:
+            current_profile.reset(token)
+            profile.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            self._busy.release()
+            profile.summarize()
+            self.store.add(profile)
@@ -0,0 +1,35 @@
+from typing import Optional
+
+from fastapi import HTTPException
+
+
+def etag(version: int) -> str:
+    """
+    Return the ETag of a task or project version, e.g. ``"3"``.
+    """
+    return f'"{version}"'
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """
+    Read the version a client expects from an If-Match header.
+
+    Accepts ``"3"`` and a bare ``3``; ``*`` and a missing header match any
+    version. If-Match compares strongly, so a weak ETag (``W/"3"``) never
+    matches.
+
+    Args:
+        if_match: The If-Match header value.
+
+    Returns:
+        The expected version, or None to skip the check.
+
+    Raises:
+        HTTPException: 412 if the header is weak or not a version ETag.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    try:
+        return int(if_match.strip().strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=412, detail=f"If-Match {if_match!r} does not match any version.")
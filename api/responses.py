@@ -0,0 +1,87 @@
+import json
+from functools import lru_cache
+from typing import Any, Iterable, List, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # optional: pip install "todolist[fast]"
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: pip install "todolist[fast]"
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES: tuple[str, ...] = ("application/msgpack", "application/x-msgpack")
+
+DefaultJSONResponse: Type[JSONResponse] = ORJSONResponse if orjson is not None else JSONResponse
+"""
+Default response class of the API: orjson when installed, the standard encoder otherwise.
+"""
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def render_json(items: Iterable[Any], schema: Type[BaseModel]) -> bytes:
+    """
+    Serialize ORM objects through a response schema into a JSON body.
+
+    The schema's compiled serializer writes JSON directly, without building
+    intermediate dicts or going through ``jsonable_encoder``.
+
+    Args:
+        items: ORM instances (e.g. Task or Project).
+        schema: Response schema the items are validated against.
+
+    Returns:
+        The encoded JSON array.
+    """
+    adapter = _list_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(list(items), from_attributes=True))
+
+
+def render_json_object(item: Any, schema: Type[BaseModel]) -> bytes:
+    """
+    Serialize one ORM object through a response schema into a JSON body.
+
+    Args:
+        item: ORM instance.
+        schema: Response schema the item is validated against.
+
+    Returns:
+        The encoded JSON object.
+    """
+    return schema.model_validate(item, from_attributes=True).model_dump_json().encode()
+
+
+def json_loads(body: bytes) -> Any:
+    """
+    Decode a JSON body with orjson when available.
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def json_to_msgpack(body: bytes) -> bytes:
+    """
+    Re-encode a JSON body as MessagePack.
+
+    Args:
+        body: Encoded JSON document.
+
+    Returns:
+        The same document encoded with MessagePack.
+
+    Raises:
+        RuntimeError: If msgpack is not installed.
+    """
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(json_loads(body), use_bin_type=True)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .controllers import projects_controller, tasks_controller
+from .controllers import projects_controller, tasks_controller, admin_controller, webhooks_controller, jobs_controller
 
 api_router: APIRouter = APIRouter(prefix="/api/v1")
 """
@@ -19,3 +19,24 @@ api_router.include_router(
     prefix="/tasks",
     tags=["Tasks"]
 )
+
+# Register Job Router
+api_router.include_router(
+    jobs_controller.router,
+    prefix="/jobs",
+    tags=["Jobs"]
+)
+
+# Register Webhook Router
+api_router.include_router(
+    webhooks_controller.router,
+    prefix="/webhooks",
+    tags=["Webhooks"]
+)
+
+# Register Admin Router
+api_router.include_router(
+    admin_controller.router,
+    prefix="/admin",
+    tags=["Admin"]
+)
@@ -0,0 +1,67 @@
+import asyncio
+import functools
+import time
+from typing import Any, Callable
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+
+from api.middlewares.profiling import current_profile
+from api.threadpool import thread_wait
+
+
+def _instrument_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Run a sync endpoint on a worker thread ourselves, measuring the queueing
+    and profiling it under the request's profiler, if any.
+
+    FastAPI would run a sync endpoint on the threadpool anyway; dispatching
+    it from an async wrapper lets us time how long it waits for a free
+    thread (``thread_wait``). Before Python 3.12 sync endpoints also run out
+    of reach of the profiler enabled by ProfilingMiddleware on the event loop
+    thread: the wrapper picks the active profile from the (copied) request
+    context and profiles the worker thread for the duration of the call (a
+    no-op from 3.12, where the request's profiler already covers it).
+
+    Args:
+        endpoint: The route endpoint function.
+
+    Returns:
+        The wrapped endpoint (async endpoints are returned unchanged).
+    """
+    if asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        submitted = time.perf_counter()
+        started = False
+        thread_wait.started()
+
+        def call() -> Any:
+            nonlocal started
+            started = True
+            thread_wait.finished(time.perf_counter() - submitted)
+            profile = current_profile.get()
+            if profile is None:
+                return endpoint(*args, **kwargs)
+            with profile.profile_thread():
+                return endpoint(*args, **kwargs)
+
+        try:
+            return await run_in_threadpool(call)
+        finally:
+            if not started:
+                # Cancelled while queued (e.g. the client went away)
+                thread_wait.finished(time.perf_counter() - submitted, timed_out=True)
+
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    APIRoute that instruments endpoint execution (thread queueing, per-request profiling).
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, _instrument_endpoint(endpoint), **kwargs)
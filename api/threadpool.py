@@ -0,0 +1,41 @@
+from typing import Any, Dict
+
+from anyio import to_thread
+
+from db.pool import WaitStats
+
+thread_wait: WaitStats = WaitStats()
+"""
+Time sync endpoints spent queued for a worker thread.
+"""
+
+
+def configure_threadpool(size: int) -> None:
+    """
+    Set how many worker threads run sync endpoints and dependencies.
+
+    Must be called on the event loop (e.g. from the lifespan handler).
+
+    Args:
+        size: Capacity of AnyIO's default thread limiter (40 by default).
+    """
+    to_thread.current_default_thread_limiter().total_tokens = size
+
+
+def threadpool_stats() -> Dict[str, Any]:
+    """
+    Occupancy of the worker threads and endpoint queueing times.
+
+    Must be called on the event loop (i.e. from an ``async def`` endpoint).
+
+    Returns:
+        The capacity, threads in use, tasks queued for a thread, and the
+        wait statistics of sync endpoints.
+    """
+    statistics = to_thread.current_default_thread_limiter().statistics()
+    return {
+        "capacity": statistics.total_tokens,
+        "active": statistics.borrowed_tokens,
+        "queued": statistics.tasks_waiting,
+        "wait": thread_wait.snapshot(),
+    }
@@ -0,0 +1,127 @@
+import argparse
+import random
+import statistics
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List
+
+from sqlalchemy.exc import OperationalError
+
+from db.base import Base
+from db.session import SessionLocal, engine, sqlite_write_lock
+from models.outbox import OutboxEvent  # noqa: F401  (creates every table)
+from models.project import Project
+from models.task import Task
+from repositories.task_repository import TaskRepository
+
+
+def seed(projects: int, tasks_per_project: int) -> List[str]:
+    """
+    Create the schema (if missing) and a set of projects with tasks.
+
+    Returns:
+        The IDs of the created projects.
+    """
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        project_rows = [Project(name=f"bench-{i}", description="benchmark") for i in range(projects)]
+        session.add_all(project_rows)
+        session.flush()
+        for project in project_rows:
+            session.add_all(
+                # Full UUIDs: 6-character IDs collide at benchmark volumes
+                Task(
+                    id=uuid.uuid4().hex,
+                    title=f"task {j}",
+                    project_id=project.id,
+                    deadline=date.today() + timedelta(days=j % 30)
+                )
+                for j in range(tasks_per_project)
+            )
+        session.commit()
+        return [project.id for project in project_rows]
+    finally:
+        session.close()
+
+
+def run_operation(kind: str, project_ids: List[str]) -> None:
+    """
+    Run one request-sized unit of work with its own session.
+    """
+    session = SessionLocal()
+    try:
+        repo = TaskRepository(session)
+        project_id = random.choice(project_ids)
+        if kind == "list":
+            repo.get_tasks_by_project_id(project_id)
+        elif kind == "count":
+            repo.count_tasks_for_project(project_id)
+        elif kind == "create":
+            repo.create_task(Task(id=uuid.uuid4().hex, title="bench", project_id=project_id))
+        elif kind == "update":
+            tasks = repo.get_tasks_by_project_id(project_id)
+            if tasks:
+                repo.update_task_status(random.choice(tasks), random.choice(["todo", "doing", "done"]))
+    finally:
+        session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mixed API-like workload against DATABASE_URL.")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--tasks-per-project", type=int, default=200)
+    parser.add_argument("--write-ratio", type=float, default=0.3, help="Share of create/update operations.")
+    args = parser.parse_args()
+
+    project_ids = seed(args.projects, args.tasks_per_project)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def worker() -> None:
+        while time.perf_counter() < deadline:
+            if random.random() < args.write_ratio:
+                kind = random.choice(["create", "update"])
+            else:
+                kind = random.choice(["list", "list", "count"])
+            started = time.perf_counter()
+            try:
+                run_operation(kind, project_ids)
+            except OperationalError as e:
+                with lock:
+                    errors[str(e.orig).split("\n")[0]] += 1
+                continue
+            with lock:
+                latencies[kind].append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"🗄 {engine.dialect.name} ({engine.url.render_as_string(hide_password=True)}), "
+          f"{args.threads} threads, {args.seconds:.0f}s, write ratio {args.write_ratio}")
+    if sqlite_write_lock is not None:
+        print(f"   single-writer lock: {sqlite_write_lock.acquisitions} acquisitions, "
+              f"{sqlite_write_lock.timeouts} timeouts")
+    print(f"\n{'operation':<10}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for kind, values in sorted(latencies.items()):
+        values.sort()
+        p95 = values[int(len(values) * 0.95) - 1] if len(values) > 1 else values[0]
+        print(f"{kind:<10}{len(values):>8}{statistics.median(values):>10.2f}{p95:>10.2f}{values[-1]:>10.2f}")
+    print(f"\n✅ {total / args.seconds:.0f} ops/s, {sum(errors.values())} errors")
+    for message, count in errors.items():
+        print(f"   {count} × {message}")
+
+
+if __name__ == "__main__":
+    main()
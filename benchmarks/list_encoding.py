@@ -0,0 +1,103 @@
+import argparse
+import gzip
+import json
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from api.controller_schemas.responses.tasks_response_schema import TaskResponse
+from api.middlewares.compression import brotli
+from api.responses import _list_adapter, json_to_msgpack, msgpack, orjson, render_json
+from models.project import Project  # noqa: F401  (registers the Task.project relationship)
+from models.task import Task
+
+
+def build_tasks(count: int) -> List[Task]:
+    """
+    Build transient Task instances resembling a real project's tasks.
+    """
+    statuses = ["todo", "doing", "done"]
+    return [
+        Task(
+            id=f"{i:06x}",
+            title=f"Task number {i}",
+            description=f"Description of task {i}: " + "lorem ipsum dolor sit amet " * (i % 4),
+            status=statuses[i % 3],
+            deadline=date(2025, 1, 1) + timedelta(days=i % 365) if i % 5 else None,
+            project_id="abc123"
+        )
+        for i in range(count)
+    ]
+
+
+def timed(func: Callable[[], bytes], repeat: int) -> Tuple[bytes, float]:
+    """
+    Run ``func`` ``repeat`` times and return its output and best time in ms.
+    """
+    best = float("inf")
+    result = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return result, best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Encode time and size of a large task list response.")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tasks = build_tasks(args.tasks)
+    adapter = _list_adapter(TaskResponse)
+
+    def standard() -> bytes:
+        # What FastAPI's JSONResponse did: validate, jsonable_encoder, json.dumps
+        content = jsonable_encoder(adapter.validate_python(tasks, from_attributes=True))
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+    encoders: List[Tuple[str, Callable[[], bytes]]] = [("json + jsonable_encoder", standard)]
+    if orjson is not None:
+        encoders.append(("orjson + jsonable_encoder", lambda: orjson.dumps(
+            jsonable_encoder(adapter.validate_python(tasks, from_attributes=True))
+        )))
+    encoders.append(("render_json (pydantic-core)", lambda: render_json(tasks, TaskResponse)))
+    if msgpack is not None:
+        encoders.append(("render_json + msgpack", lambda: json_to_msgpack(render_json(tasks, TaskResponse))))
+
+    print(f"📦 {args.tasks} tasks, best of {args.repeat}\n")
+    print(f"{'encoder':<32}{'encode ms':>12}{'bytes':>12}")
+    bodies = {}
+    for name, encode in encoders:
+        body, ms = timed(encode, args.repeat)
+        bodies[name] = body
+        print(f"{name:<32}{ms:>12.1f}{len(body):>12}")
+
+    json_body = bodies["render_json (pydantic-core)"]
+    compressors: List[Tuple[str, Callable[[bytes], bytes]]] = [
+        ("gzip -1", lambda b: gzip.compress(b, compresslevel=1, mtime=0)),
+        ("gzip -6", lambda b: gzip.compress(b, compresslevel=6, mtime=0)),
+    ]
+    if brotli is not None:
+        compressors += [
+            ("brotli q4", lambda b: brotli.compress(b, quality=4)),
+            ("brotli q11", lambda b: brotli.compress(b, quality=11)),
+        ]
+
+    print(f"\n{'on the wire':<32}{'compress ms':>12}{'bytes':>12}{'ratio':>8}")
+    print(f"{'json (identity)':<32}{0.0:>12.1f}{len(json_body):>12}{1.0:>8.2f}")
+    sources = [("json", json_body)]
+    if msgpack is not None:
+        sources.append(("msgpack", bodies["render_json + msgpack"]))
+    for source_name, source in sources:
+        for name, compress in compressors:
+            compressed, ms = timed(lambda: compress(source), args.repeat)
+            label = f"{source_name} + {name}"
+            print(f"{label:<32}{ms:>12.1f}{len(compressed):>12}{len(json_body) / len(compressed):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import random
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, func, lambda_stmt, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from db.base import Base
+from models.outbox import OutboxEvent  # noqa: F401  (creates every table)
+from models.project import Project
+from models.task import Task
+from repositories.task_repository import TaskRepository
+
+
+def seed(session: Session, projects: int, tasks_per_project: int) -> Tuple[List[str], List[str]]:
+    """
+    Create projects and tasks in the benchmark database.
+
+    Returns:
+        The project IDs and task IDs.
+    """
+    project_ids, task_ids = [], []
+    for i in range(projects):
+        project = Project(id=uuid.uuid4().hex, name=f"bench-{i}")
+        session.add(project)
+        project_ids.append(project.id)
+        for j in range(tasks_per_project):
+            task = Task(
+                id=uuid.uuid4().hex,
+                title=f"task {j}",
+                project_id=project.id,
+                deadline=date.today() + timedelta(days=j % 30)
+            )
+            session.add(task)
+            task_ids.append(task.id)
+    session.commit()
+    return project_ids, task_ids
+
+
+def measure(func: Callable[[], object], calls: int) -> float:
+    """
+    Return the mean time per call of ``func`` in microseconds.
+    """
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Per-call overhead of the hot repository reads: legacy Query, lambda statements, select()."
+    )
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--tasks-per-project", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    # In-memory SQLite keeps I/O out of the numbers, leaving the Python overhead
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session = Session(engine, expire_on_commit=False)
+    project_ids, task_ids = seed(session, args.projects, args.tasks_per_project)
+    repo = TaskRepository(session)
+
+    def by_lambda_id(task_id: str):
+        return session.scalars(lambda_stmt(lambda: select(Task).where(Task.id == task_id).limit(1))).first()
+
+    def by_lambda_project(project_id: str):
+        return session.scalars(lambda_stmt(lambda: select(Task).where(Task.project_id == project_id))).all()
+
+    def count_lambda(project_id: str):
+        return session.scalar(lambda_stmt(
+            lambda: select(func.count()).select_from(Task).where(Task.project_id == project_id)
+        ))
+
+    variants: Dict[str, Dict[str, Callable[[str], object]]] = {
+        "query": {
+            "get_task_by_id": lambda task_id: session.query(Task).filter(Task.id == task_id).first(),
+            "get_tasks_by_project_id": lambda project_id: session.query(Task).filter(
+                Task.project_id == project_id
+            ).all(),
+            "count_tasks_for_project": lambda project_id: session.query(Task).filter(
+                Task.project_id == project_id
+            ).count(),
+        },
+        "lambda": {
+            "get_task_by_id": by_lambda_id,
+            "get_tasks_by_project_id": by_lambda_project,
+            "count_tasks_for_project": count_lambda,
+        },
+        "select": {
+            "get_task_by_id": lambda task_id: session.scalars(
+                select(Task).where(Task.id == task_id).limit(1)
+            ).first(),
+            "get_tasks_by_project_id": lambda project_id: session.scalars(
+                select(Task).where(Task.project_id == project_id)
+            ).all(),
+            "count_tasks_for_project": lambda project_id: session.scalar(
+                select(func.count()).select_from(Task).where(Task.project_id == project_id)
+            ),
+        },
+        "repository": {
+            "get_task_by_id": repo.get_task_by_id,
+            "get_tasks_by_project_id": repo.get_tasks_by_project_id,
+            "count_tasks_for_project": repo.count_tasks_for_project,
+        },
+    }
+    keys: Dict[str, List[str]] = {
+        "get_task_by_id": task_ids,
+        "get_tasks_by_project_id": project_ids,
+        "count_tasks_for_project": project_ids,
+    }
+
+    results: Dict[str, Dict[str, float]] = {}
+    for variant, operations in variants.items():
+        results[variant] = {}
+        for name, operation in operations.items():
+            operation(keys[name][0])  # warm the compiled cache
+            results[variant][name] = measure(lambda: operation(random.choice(keys[name])), args.calls)
+
+    print(f"⏱ {args.projects} projects × {args.tasks_per_project} tasks, {args.calls} calls each (µs per call)\n")
+    print(f"{'operation':<26}" + "".join(f"{variant:>12}" for variant in variants))
+    for name in variants["query"]:
+        print(f"{name:<26}" + "".join(f"{results[variant][name]:>12.1f}" for variant in variants))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import random
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from db.base import Base
+from db.session import SessionLocal, engine
+from models.outbox import OutboxEvent  # noqa: F401  (creates every table)
+from models.project import Project
+from models.task import Task
+from repositories.memory import InMemoryProjectRepository, InMemoryStore, InMemoryTaskRepository
+from repositories.project_repository import ProjectRepository
+from repositories.task_repository import TaskRepository
+from services.task_service import TaskService
+
+
+def build_service(backend: str) -> TaskService:
+    """
+    Create a TaskService on the in-memory or SQL (DATABASE_URL) repositories.
+    """
+    if backend == "memory":
+        store = InMemoryStore()
+        return TaskService(task_repo=InMemoryTaskRepository(store), project_repo=InMemoryProjectRepository(store))
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    return TaskService(task_repo=TaskRepository(session), project_repo=ProjectRepository(session))
+
+
+def seed(service: TaskService, projects: int, tasks_per_project: int) -> Tuple[List[str], List[str]]:
+    """
+    Create projects and tasks straight through the repositories (bypassing limits).
+
+    Returns:
+        The project IDs and task IDs.
+    """
+    project_ids, task_ids = [], []
+    for i in range(projects):
+        project = service.project_repo.create_project(Project(id=uuid.uuid4().hex, name=f"bench-{i}"))
+        project_ids.append(project.id)
+        for j in range(tasks_per_project):
+            task = service.task_repo.create_task(Task(
+                id=uuid.uuid4().hex,
+                title=f"task {j}",
+                project_id=project.id,
+                deadline=date.today() + timedelta(days=j % 60 - 5)
+            ))
+            task_ids.append(task.id)
+    return project_ids, task_ids
+
+
+def measure(func: Callable[[], object], calls: int) -> float:
+    """
+    Return the mean time per call of ``func`` in microseconds.
+    """
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-call cost of TaskService operations per repository backend.")
+    parser.add_argument("--backend", choices=["memory", "sql", "both"], default="both")
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--tasks-per-project", type=int, default=100)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    backends = ["memory", "sql"] if args.backend == "both" else [args.backend]
+    results: Dict[str, Dict[str, float]] = {}
+    for backend in backends:
+        service = build_service(backend)
+        project_ids, task_ids = seed(service, args.projects, args.tasks_per_project)
+        operations: List[Tuple[str, Callable[[], object]]] = [
+            ("get_task", lambda: service.get_task(random.choice(task_ids))),
+            ("list_tasks", lambda: service.list_tasks(random.choice(project_ids))),
+            ("update_task", lambda: service.update_task(random.choice(task_ids), title="renamed")),
+            ("update_status", lambda: service.update_status(random.choice(task_ids), random.choice(["todo", "doing"]))),
+            ("list_all_overdue", lambda: service.task_repo.list_all_overdue()),
+        ]
+        results[backend] = {name: measure(op, args.calls) for name, op in operations}
+
+    print(f"⏱ {args.projects} projects × {args.tasks_per_project} tasks, {args.calls} calls each (µs per call)\n")
+    print(f"{'operation':<20}" + "".join(f"{backend:>12}" for backend in backends))
+    for name in results[backends[0]]:
+        print(f"{name:<20}" + "".join(f"{results[backend][name]:>12.1f}" for backend in backends))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+import argparse
+import json
+import sys
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from api.controller_schemas.responses.projects_response_schema import ProjectResponse
+from api.controller_schemas.responses.tasks_response_schema import TaskResponse
+from api.responses import json_loads, render_json_object
+from db.session import DATABASE_URL, SessionLocal, create_database_engine, shard_router
+from repositories.factory import REPOSITORY_BACKEND, create_project_repository, create_task_repository
+from services.overdue_engine import overdue_engine
+from services.project_service import ProjectService
+from services.task_service import TaskService
+
+Record = Dict[str, Any]
+
+
+# -----------------------------
+# SESSION
+# -----------------------------
+@contextmanager
+def batch_session() -> Iterator[Tuple[Session, Optional[Connection]]]:
+    """
+    Open the single session all operations of a run share.
+
+    On a single SQL database the session is bound to one connection with an
+    outer transaction and ``join_transaction_mode="create_savepoint"``: the
+    ``commit()`` each repository method issues only releases a savepoint, and
+    the caller decides when the outer transaction commits. Sharded and
+    in-memory setups fall back to a regular session (one commit per write).
+
+    Yields:
+        The session, and the connection owning the outer transaction (None
+        in the fallback case).
+    """
+    if REPOSITORY_BACKEND == "memory" or shard_router is not None:
+        session = SessionLocal()
+        try:
+            yield session, None
+        finally:
+            session.close()
+        return
+
+    engine = create_database_engine(DATABASE_URL)
+    if engine.dialect.name == "sqlite":
+        # pysqlite defers BEGIN, which breaks SAVEPOINT; let SQLAlchemy emit it
+        @event.listens_for(engine, "connect")
+        def _disable_pysqlite_transactions(dbapi_connection, connection_record) -> None:
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def _begin(conn: Connection) -> None:
+            conn.exec_driver_sql("BEGIN")
+
+    connection = engine.connect()
+    connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+    try:
+        yield session, connection
+    finally:
+        session.close()
+        if connection.in_transaction():
+            connection.rollback()
+        connection.close()
+        engine.dispose()
+
+
+class BatchRunner:
+    """
+    Run many operations through the services in one session.
+
+    Operations are grouped into transactions of ``batch_size`` operations.
+    A failing operation is rolled back to its savepoint; unless
+    ``continue_on_error`` is set, the run then stops and the current batch
+    is rolled back.
+
+    Attributes:
+        succeeded: Operations that completed.
+        failed: Operations that raised.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        connection: Optional[Connection],
+        batch_size: int = 1000,
+        dry_run: bool = False,
+        continue_on_error: bool = False
+    ) -> None:
+        """
+        Args:
+            session: Session shared by all operations.
+            connection: Connection owning the outer transaction (None: each write commits).
+            batch_size: Operations per transaction (0: a single transaction).
+            dry_run: Roll everything back at the end.
+            continue_on_error: Keep going after a failed operation.
+        """
+        self.session = session
+        self.connection = connection
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.continue_on_error = continue_on_error
+        self.succeeded = 0
+        self.failed = 0
+        self._pending = 0
+
+    def run(self, operations: Iterable[Tuple[Any, Callable[[], Record]]]) -> Iterator[Record]:
+        """
+        Execute ``(input, operation)`` pairs and yield one record per operation.
+
+        Records are ``{"ok": true, ...}`` with the operation's result, or
+        ``{"ok": false, "input": ..., "error": ...}``.
+        """
+        for item, operation in operations:
+            try:
+                record = {"ok": True, **operation()}
+            except Exception as e:
+                self.session.rollback()
+                self.failed += 1
+                yield {"ok": False, "input": item, "error": str(e)}
+                if not self.continue_on_error:
+                    self._end_batch(commit=False)
+                    return
+                continue
+            self.succeeded += 1
+            self._pending += 1
+            yield record
+            if self.batch_size and self._pending >= self.batch_size:
+                self._end_batch(commit=not self.dry_run)
+        self._end_batch(commit=not self.dry_run)
+
+    def _end_batch(self, commit: bool) -> None:
+        self._pending = 0
+        if self.connection is None:
+            return
+        self.session.commit()
+        if commit:
+            self.connection.commit()
+        else:
+            self.connection.rollback()
+        self.connection.begin()
+
+
+# -----------------------------
+# INPUT / OUTPUT
+# -----------------------------
+def read_records(source: TextIO) -> Iterator[Any]:
+    """
+    Read a JSON array, or one JSON value per line (NDJSON).
+
+    A line that is not JSON is returned as a plain string (e.g. a task ID).
+    """
+    text = source.read()
+    if text.lstrip().startswith("["):
+        yield from json_loads(text)
+        return
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json_loads(line)
+        except ValueError:
+            yield line
+
+
+def write_records(records: Iterable[Record], output_format: str, out: TextIO = sys.stdout) -> None:
+    """
+    Print records as one JSON array or as NDJSON (streamed).
+    """
+    if output_format == "ndjson":
+        for record in records:
+            out.write(json.dumps(record, default=str) + "\n")
+        return
+    json.dump(list(records), out, default=str, indent=2)
+    out.write("\n")
+
+
+def _task_record(task: Any) -> Record:
+    return json_loads(render_json_object(task, TaskResponse))
+
+
+def _project_record(project: Any) -> Record:
+    return json_loads(render_json_object(project, ProjectResponse))
+
+
+def _open(path: str) -> TextIO:
+    return sys.stdin if path == "-" else open(path, encoding="utf-8")
+
+
+# -----------------------------
+# COMMANDS
+# -----------------------------
+def tasks_import(args: argparse.Namespace, runner: BatchRunner, task_service: TaskService) -> Iterator[Record]:
+    def create(item: Record) -> Callable[[], Record]:
+        def operation() -> Record:
+            task = task_service.create_task(
+                project_id=item["project_id"],
+                title=item["title"],
+                description=item.get("description"),
+                deadline=item.get("deadline"),
+                recurrence=item.get("recurrence")
+            )
+            if item.get("status") and item["status"] != task.status:
+                task = task_service.update_status(task.id, item["status"])
+            return _task_record(task)
+        return operation
+
+    with _open(args.file) as source:
+        items = list(read_records(source))
+    return runner.run((item, create(item)) for item in items)
+
+
+def tasks_export(args: argparse.Namespace, project_service: ProjectService, task_service: TaskService) -> Iterator[Record]:
+    project_ids = args.project_id or [project.id for project in project_service.list_projects()]
+    for project_id in project_ids:
+        for task in task_service.list_tasks(project_id, include_archived=args.include_archived):
+            if args.status is None or task.status == args.status:
+                yield _task_record(task)
+
+
+def tasks_set_status(args: argparse.Namespace, runner: BatchRunner, task_service: TaskService) -> Iterator[Record]:
+    items: List[Any] = list(args.task_ids)
+    if args.file:
+        with _open(args.file) as source:
+            items.extend(read_records(source))
+
+    def update(item: Any) -> Callable[[], Record]:
+        task_id, status = (item["id"], args.status or item.get("status")) if isinstance(item, dict) else (item, args.status)
+        if status is None:
+            raise SystemExit(f"❌ No status given for task {task_id} (use --status or a \"status\" field).")
+        return lambda: _task_record(task_service.update_status(task_id, status))
+
+    return runner.run((item, update(item)) for item in items)
+
+
+def tasks_close_overdue(args: argparse.Namespace, runner: BatchRunner, session: Session) -> Iterator[Record]:
+    return runner.run([("close-overdue", lambda: {"closed": overdue_engine.catch_up(session)})])
+
+
+def projects_list(args: argparse.Namespace, project_service: ProjectService) -> Iterator[Record]:
+    return (_project_record(project) for project in project_service.list_projects())
+
+
+def projects_stats(args: argparse.Namespace, project_service: ProjectService, task_service: TaskService) -> Iterator[Record]:
+    today = date.today()
+    for project in project_service.list_projects():
+        tasks = task_service.list_tasks(project.id, include_archived=True, fields=("status", "deadline"))
+        by_status: Dict[str, int] = {}
+        for task in tasks:
+            if not task.archived:
+                by_status[task.status] = by_status.get(task.status, 0) + 1
+        yield {
+            **_project_record(project),
+            "tasks": sum(by_status.values()),
+            "by_status": by_status,
+            "overdue": sum(
+                1 for task in tasks
+                if not task.archived and task.deadline is not None and task.deadline < today and task.status != "done"
+            ),
+            "archived": sum(1 for task in tasks if task.archived),
+        }
+
+
+# -----------------------------
+# ENTRY POINT
+# -----------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="todolist",
+        description="Non-interactive batch operations on projects and tasks, with JSON/NDJSON output."
+    )
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json", help="Output format.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Operations per transaction (0: one transaction).")
+    parser.add_argument("--dry-run", action="store_true", help="Run everything, then roll back.")
+    parser.add_argument("--continue-on-error", action="store_true", help="Keep going after a failed operation.")
+    groups = parser.add_subparsers(dest="group", required=True)
+
+    tasks = groups.add_parser("tasks", help="Task operations.").add_subparsers(dest="command", required=True)
+    task_import = tasks.add_parser("import", help="Create tasks from a JSON array or NDJSON file.")
+    task_import.add_argument(
+        "file", help='File of {"project_id", "title", "description"?, "deadline"?, "recurrence"?, "status"?} objects ("-": stdin).'
+    )
+    task_export = tasks.add_parser("export", help="Print tasks.")
+    task_export.add_argument("--project-id", action="append", help="Only this project (repeatable).")
+    task_export.add_argument("--status", choices=["todo", "doing", "done"])
+    task_export.add_argument("--include-archived", action="store_true")
+    set_status = tasks.add_parser("set-status", help="Change the status of tasks.")
+    set_status.add_argument("task_ids", nargs="*", help="Task IDs.")
+    set_status.add_argument("--status", choices=["todo", "doing", "done"], help="Status for every task.")
+    set_status.add_argument(
+        "--file", help='Task IDs, one per line, or {"id", "status"} objects, e.g. an export ("-": stdin).'
+    )
+    tasks.add_parser("close-overdue", help="Mark every overdue task as done.")
+
+    projects = groups.add_parser("projects", help="Project operations.").add_subparsers(dest="command", required=True)
+    projects.add_parser("list", help="Print projects.")
+    projects.add_parser("stats", help="Print task counts per project.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the ``todolist`` command.
+
+    Returns:
+        The exit code: 0, or 1 if any operation failed.
+    """
+    args = build_parser().parse_args(argv)
+    with batch_session() as (session, connection):
+        if args.dry_run and connection is None:
+            raise SystemExit("❌ --dry-run needs a single SQL database (not sharded, not REPOSITORY_BACKEND=memory).")
+        project_repo = create_project_repository(session)
+        task_service = TaskService(task_repo=create_task_repository(session), project_repo=project_repo)
+        project_service = ProjectService(project_repo=project_repo)
+        runner = BatchRunner(session, connection, args.batch_size, args.dry_run, args.continue_on_error)
+
+        command = (args.group, args.command)
+        if command == ("tasks", "import"):
+            records = tasks_import(args, runner, task_service)
+        elif command == ("tasks", "export"):
+            records = tasks_export(args, project_service, task_service)
+        elif command == ("tasks", "set-status"):
+            records = tasks_set_status(args, runner, task_service)
+        elif command == ("tasks", "close-overdue"):
+            records = tasks_close_overdue(args, runner, session)
+        elif command == ("projects", "list"):
+            records = projects_list(args, project_service)
+        else:
+            records = projects_stats(args, project_service, task_service)
+        write_records(records, args.format)
+
+    if runner.succeeded or runner.failed:
+        if args.dry_run:
+            suffix = " (dry run, rolled back)"
+        elif runner.failed and not args.continue_on_error:
+            suffix = " (stopped at the first error, its batch rolled back)"
+        else:
+            suffix = ""
+        print(f"✅ {runner.succeeded} succeeded, ❌ {runner.failed} failed{suffix}", file=sys.stderr)
+    return 1 if runner.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
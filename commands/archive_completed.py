@@ -0,0 +1,38 @@
+import argparse
+from datetime import datetime
+
+from db.session import SessionLocal
+from repositories.factory import create_project_repository, create_task_repository
+from services.task_service import TaskService, TASK_ARCHIVE_RETENTION_DAYS, TASK_ARCHIVE_BATCH_SIZE
+
+
+def archive_completed(retention_days: int, batch_size: int) -> int:
+    """
+    Run one archival pass and exit.
+
+    Args:
+        retention_days: Days a done task stays in the hot table.
+        batch_size: Tasks moved per transaction.
+
+    Returns:
+        The number of tasks archived.
+    """
+    session = SessionLocal()
+    try:
+        service = TaskService(
+            task_repo=create_task_repository(session),
+            project_repo=create_project_repository(session)
+        )
+        return service.archive_completed(retention_days=retention_days, batch_size=batch_size)
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move old done tasks to the tasks_archive table.")
+    parser.add_argument("--retention-days", type=int, default=TASK_ARCHIVE_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=TASK_ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    archived: int = archive_completed(args.retention_days, args.batch_size)
+    print(f"🗄 {archived} completed tasks archived at {datetime.now()}")
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from services.overdue_engine import OverdueEngine
+
+
+def autoclose_overdue() -> int:
+    """
+    Close every overdue task once (full catch-up scan) and exit.
+
+    Returns:
+        The number of tasks closed.
+    """
+    return OverdueEngine().run_due()
+
+
+if __name__ == "__main__":
+    closed: int = autoclose_overdue()
+    print(f"✅ {closed} overdue tasks updated at {datetime.now()}")
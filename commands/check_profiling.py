@@ -0,0 +1,64 @@
+import sys
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from api.middlewares.profiling import PROFILE_ID_HEADER, ProfileStore, ProfilingMiddleware
+from api.routing import InstrumentedRoute
+
+TOKEN: str = "check-profiling"
+
+
+def _busy(n: int) -> int:
+    return n if n < 2 else _busy(n - 1) + _busy(n - 2)
+
+
+def sync_endpoint() -> dict:
+    return {"total": _busy(20)}
+
+
+async def async_endpoint() -> dict:
+    return {"total": _busy(20)}
+
+
+def build_app(store: ProfileStore) -> FastAPI:
+    """
+    A minimal app with the profiling middleware and one sync and one async
+    instrumented route.
+    """
+    router = APIRouter(route_class=InstrumentedRoute)
+    router.add_api_route("/sync", sync_endpoint)
+    router.add_api_route("/async", async_endpoint)
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, token=TOKEN, store=store)
+    app.include_router(router)
+    return app
+
+
+def check(client: TestClient, store: ProfileStore, path: str, function: str) -> list:
+    """
+    Send a profiled request and return what went wrong, if anything.
+    """
+    response = client.get(path, headers={"X-Profile": TOKEN})
+    if response.status_code != 200:
+        return [f"{path}: HTTP {response.status_code}"]
+    profile_id = response.headers.get(PROFILE_ID_HEADER.decode())
+    profile = store.get(profile_id) if profile_id else None
+    if profile is None:
+        return [f"{path}: no profile stored"]
+    if not any(f"({function})" in entry["function"] for entry in profile.functions):
+        return [f"{path}: {function} missing from the profile"]
+    return []
+
+
+if __name__ == "__main__":
+    store = ProfileStore()
+    with TestClient(build_app(store), raise_server_exceptions=False) as client:
+        errors = check(client, store, "/sync", "sync_endpoint") + check(client, store, "/async", "async_endpoint")
+
+    version = ".".join(map(str, sys.version_info[:3]))
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        sys.exit(1)
+    print(f"✅ Profiled sync and async endpoints on Python {version}")
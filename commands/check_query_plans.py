@@ -0,0 +1,235 @@
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from db.session import SessionLocal
+from models.project import Project
+from models.task import Task, ArchivedTask
+from repositories.project_repository import ProjectRepository
+from repositories.task_repository import TaskRepository
+
+WATCHED_TABLES: Tuple[str, ...] = ("projects", "tasks", "tasks_archive")
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?! USING (?:COVERING )?INDEX)")
+
+
+@dataclass
+class QueryCheck:
+    """
+    A repository query with its plan and runtime expectations.
+
+    Attributes:
+        name: ``Repository.method`` being checked.
+        call: Runs the method once.
+        budget_ms: Maximum median runtime (None: check the plan only, for
+            queries whose result grows with the dataset).
+        allow_scan: The query reads whole tables by design.
+    """
+    name: str
+    call: Callable[[], Any]
+    budget_ms: Optional[float]
+    allow_scan: bool = False
+
+
+@dataclass
+class CheckResult:
+    name: str
+    scans: List[str] = field(default_factory=list)
+    median_ms: Optional[float] = None
+    budget_ms: Optional[float] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+# -----------------------------
+# PLANS
+# -----------------------------
+@contextmanager
+def captured_statements() -> Iterator[List[Tuple[Engine, str, Any]]]:
+    """
+    Record the SELECTs sent to any engine without running them.
+
+    Each statement is wrapped in a ``LIMIT 0`` subquery, so the repository
+    method returns an empty result immediately whatever the data size.
+
+    Yields:
+        The list receiving ``(engine, statement, parameters)`` tuples.
+    """
+    statements: List[Tuple[Engine, str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return statement, parameters
+        statements.append((conn.engine, statement, parameters))
+        return f"SELECT * FROM ({statement}) AS plan_check LIMIT 0", parameters
+
+    event.listen(Engine, "before_cursor_execute", capture, retval=True)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture)
+
+
+def full_scans(target: Engine, statement: str, parameters: Any) -> List[str]:
+    """
+    EXPLAIN a statement and list the watched tables it reads sequentially.
+
+    Raises:
+        NotImplementedError: For dialects other than PostgreSQL and SQLite.
+    """
+    with target.connect() as conn:
+        if target.dialect.name == "postgresql":
+            plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scans: List[str] = []
+            nodes = [plan[0]["Plan"]]
+            while nodes:
+                node = nodes.pop()
+                if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in WATCHED_TABLES:
+                    scans.append(node["Relation Name"])
+                nodes.extend(node.get("Plans", []))
+            return scans
+        if target.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            return [
+                match.group(1) for match in (_SQLITE_SCAN.match(row[-1]) for row in rows)
+                if match and match.group(1) in WATCHED_TABLES
+            ]
+    raise NotImplementedError(f"No plan check for {target.dialect.name}")
+
+
+def check(query: QueryCheck, repeat: int, budget_scale: float) -> CheckResult:
+    """
+    Check the plan of every statement a query issues, then its runtime.
+    """
+    result = CheckResult(query.name)
+    with captured_statements() as statements:
+        query.call()
+    for target, statement, parameters in statements:
+        try:
+            scans = full_scans(target, statement, parameters)
+        except NotImplementedError as e:
+            result.errors.append(str(e))
+            continue
+        result.scans.extend(scans)
+        if scans and not query.allow_scan:
+            result.errors.append(f"sequential scan on {', '.join(sorted(set(scans)))}")
+
+    if query.budget_ms is not None:
+        result.budget_ms = query.budget_ms * budget_scale
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            query.call()
+            timings.append((time.perf_counter() - started) * 1000)
+        result.median_ms = statistics.median(timings)
+        if result.median_ms > result.budget_ms:
+            result.errors.append(f"{result.median_ms:.1f} ms over the {result.budget_ms:.0f} ms budget")
+    return result
+
+
+# -----------------------------
+# QUERIES
+# -----------------------------
+def _largest_project(session: Session) -> Optional[str]:
+    rows = session.execute(
+        select(Task.project_id, func.count().label("n")).group_by(Task.project_id).order_by(func.count().desc()).limit(1)
+    ).all()
+    return max(rows, key=lambda row: row.n).project_id if rows else None
+
+
+def build_checks(session: Session) -> List[QueryCheck]:
+    """
+    The repository queries to check, with representative arguments.
+
+    Per-project queries use the largest project, the worst case.
+    """
+    project_repo = ProjectRepository(session)
+    task_repo = TaskRepository(session)
+    project_id = _largest_project(session) or session.scalars(select(Project.id).limit(1)).first() or "missing"
+    task_ids = session.scalars(select(Task.id).limit(100)).all() or ["missing"]
+    task_id = task_ids[0]
+    series_id = session.scalars(select(Task.series_id).where(Task.series_id.is_not(None)).limit(1)).first() or "missing"
+    archived_id = session.scalars(select(ArchivedTask.id).limit(1)).first() or "missing"
+    today = date.today()
+
+    return [
+        QueryCheck("ProjectRepository.get_project_by_id", lambda: project_repo.get_project_by_id(project_id), 5),
+        QueryCheck("ProjectRepository.list_projects", project_repo.list_projects, None, allow_scan=True),
+        QueryCheck("TaskRepository.get_task_by_id", lambda: task_repo.get_task_by_id(task_id), 5),
+        QueryCheck("TaskRepository.get_tasks_by_ids", lambda: task_repo.get_tasks_by_ids(task_ids), 20),
+        QueryCheck("TaskRepository.get_tasks_by_project_id", lambda: task_repo.get_tasks_by_project_id(project_id), 100),
+        QueryCheck("TaskRepository.get_last_position", lambda: task_repo.get_last_position(project_id), 5),
+        QueryCheck(
+            "TaskRepository.get_next_position", lambda: task_repo.get_next_position(project_id, "i", [task_id]), 20
+        ),
+        QueryCheck("TaskRepository.count_tasks_for_project", lambda: task_repo.count_tasks_for_project(project_id), 20),
+        QueryCheck(
+            "TaskRepository.get_series_head", lambda: task_repo.get_series_head(series_id, project_id), 5
+        ),
+        QueryCheck("TaskRepository.list_series_heads", lambda: task_repo.list_series_heads(project_id), 20),
+        QueryCheck("TaskRepository.list_all_overdue", task_repo.list_all_overdue, None),
+        QueryCheck(
+            "TaskRepository.list_overdue_between",
+            lambda: task_repo.list_overdue_between(today - timedelta(days=1), today),
+            500
+        ),
+        QueryCheck("TaskRepository.next_open_deadline", lambda: task_repo.next_open_deadline(today), 20),
+        QueryCheck(
+            "TaskRepository.list_archivable",
+            lambda: task_repo.list_archivable(datetime.utcnow() - timedelta(days=30), 500),
+            500
+        ),
+        QueryCheck("TaskRepository.get_archived_task_by_id", lambda: task_repo.get_archived_task_by_id(archived_id), 5),
+        QueryCheck(
+            "TaskRepository.get_archived_tasks_by_project_id",
+            lambda: task_repo.get_archived_tasks_by_project_id(project_id),
+            100
+        ),
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fail when a repository query plans a sequential scan or exceeds its runtime budget "
+                    "(run against a dataset from commands.generate_dataset)."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query (the median is compared).")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every runtime budget.")
+    parser.add_argument("--only", help="Only check queries whose name contains this text.")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        checks = [c for c in build_checks(session) if not args.only or args.only in c.name]
+        results = [check(c, args.repeat, args.budget_scale) for c in checks]
+    finally:
+        session.close()
+
+    print(f"{'query':<48}{'median ms':>11}{'budget ms':>11}  result")
+    for result in results:
+        median = f"{result.median_ms:.1f}" if result.median_ms is not None else "-"
+        budget = f"{result.budget_ms:.0f}" if result.budget_ms is not None else "-"
+        status = "✅" if result.ok else "❌ " + "; ".join(result.errors)
+        print(f"{result.name:<48}{median:>11}{budget:>11}  {status}")
+
+    failed = [result for result in results if not result.ok]
+    if failed:
+        print(f"\n❌ {len(failed)} of {len(results)} queries regressed")
+        sys.exit(1)
+    print(f"\n✅ {len(results)} queries use indexes and stay within budget")
@@ -0,0 +1,162 @@
+import argparse
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import Table, insert, text
+from sqlalchemy.engine import Engine
+
+from db.base import Base
+from db.positions import sequential_keys
+from db.session import engine, shard_router
+from models.outbox import OutboxEvent  # noqa: F401  (creates every table)
+from models.idempotency import IdempotencyKey  # noqa: F401
+from models.job import BackgroundJob  # noqa: F401
+from models.project import Project
+from models.task import Task, ArchivedTask
+from services.task_service import TASK_ARCHIVE_RETENTION_DAYS
+
+# Share of tasks per status, and of tasks without a deadline
+STATUS_WEIGHTS: Dict[str, float] = {"todo": 0.45, "doing": 0.2, "done": 0.35}
+NO_DEADLINE_RATIO: float = 0.25
+
+_WORDS: List[str] = [
+    "review", "deploy", "fix", "write", "plan", "call", "update", "test", "design", "refactor",
+    "invoice", "report", "backup", "migrate", "release", "audit", "document", "prepare", "sync", "clean"
+]
+
+
+def _engine_for(project_id: str) -> Engine:
+    return shard_router.engines[shard_router.shard_for(project_id)] if shard_router is not None else engine
+
+
+def _tasks_in_project(rng: random.Random, mean: float) -> int:
+    """
+    Skewed project size: most projects are small, a few are very large.
+    """
+    # Pareto(1.5) has a mean of 3
+    return min(int(rng.paretovariate(1.5) * mean / 3), int(mean * 50))
+
+
+def _task_row(rng: random.Random, project_id: str, today: date, now: datetime) -> Dict[str, Any]:
+    status = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()))[0]
+    deadline = None
+    if rng.random() >= NO_DEADLINE_RATIO:
+        # Clustered around the next few weeks, with a long tail both ways
+        deadline = today + timedelta(days=int(rng.gauss(20, 45)))
+    completed_at = None
+    if status == "done":
+        completed_at = now - timedelta(days=rng.expovariate(1 / 45))
+    return {
+        "id": uuid.uuid4().hex,
+        "title": f"{rng.choice(_WORDS).capitalize()} {rng.choice(_WORDS)} #{rng.randint(1, 9999)}",
+        "description": None if rng.random() < 0.6 else "Generated task",
+        "status": status,
+        "deadline": deadline,
+        "completed_at": completed_at,
+        "version": 1,
+        "project_id": project_id,
+    }
+
+
+def _flush(table: Table, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert rows in one executemany per target database.
+    """
+    by_engine: Dict[Engine, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        by_engine[_engine_for(row.get("project_id") or row["id"])].append(row)
+    for target, target_rows in by_engine.items():
+        with target.begin() as conn:
+            conn.execute(insert(table), target_rows)
+    rows.clear()
+
+
+def generate(projects: int, tasks_per_project: float, batch_size: int, seed: int) -> Dict[str, int]:
+    """
+    Bulk insert a synthetic dataset.
+
+    Done tasks completed longer ago than TASK_ARCHIVE_RETENTION_DAYS go to
+    ``tasks_archive``, as the archival job would have moved them.
+
+    Args:
+        projects: Number of projects.
+        tasks_per_project: Mean number of tasks per project.
+        batch_size: Rows per INSERT batch.
+        seed: Random seed (same seed, same distributions).
+
+    Returns:
+        Rows inserted per table.
+    """
+    rng = random.Random(seed)
+    today, now = date.today(), datetime.utcnow()
+    archive_before = now - timedelta(days=TASK_ARCHIVE_RETENTION_DAYS)
+    buffers: Dict[Table, List[Dict[str, Any]]] = {
+        Project.__table__: [], Task.__table__: [], ArchivedTask.__table__: []
+    }
+    counts: Dict[str, int] = defaultdict(int)
+    started = time.perf_counter()
+
+    for i in range(projects):
+        project_id = uuid.uuid4().hex
+        buffers[Project.__table__].append({
+            "id": project_id,
+            "name": f"Project {i}",
+            "description": None if rng.random() < 0.3 else "Generated project",
+            "version": 1,
+        })
+        counts["projects"] += 1
+        for position in sequential_keys(_tasks_in_project(rng, tasks_per_project)):
+            row = dict(_task_row(rng, project_id, today, now), position=position)
+            if row["completed_at"] is not None and row["completed_at"] < archive_before:
+                buffers[ArchivedTask.__table__].append(dict(row, archived_at=now))
+                counts["tasks_archive"] += 1
+            else:
+                buffers[Task.__table__].append(row)
+                counts["tasks"] += 1
+
+        if sum(len(rows) for rows in buffers.values()) >= batch_size:
+            # Projects first: tasks reference them
+            for table, rows in buffers.items():
+                _flush(table, rows)
+            elapsed = time.perf_counter() - started
+            total = sum(counts.values())
+            print(f"   {i + 1}/{projects} projects, {total} rows ({total / elapsed:.0f} rows/s)", flush=True)
+
+    for table, rows in buffers.items():
+        _flush(table, rows)
+    return dict(counts)
+
+
+def analyze() -> None:
+    """
+    Refresh planner statistics on every database after the load.
+    """
+    targets = list(shard_router.engines.values()) if shard_router is not None else [engine]
+    for target in targets:
+        with target.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bulk insert a large synthetic dataset into DATABASE_URL (or the shards), bypassing the limits."
+    )
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--tasks-per-project", type=float, default=20, help="Mean tasks per project (skewed).")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per INSERT batch.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for target in ([engine] + list(shard_router.engines.values()) if shard_router is not None else [engine]):
+        Base.metadata.create_all(target)
+
+    print(f"🌱 Generating {args.projects} projects (~{args.tasks_per_project:g} tasks each) "
+          f"into {engine.url.render_as_string(hide_password=True)}")
+    load_started = time.perf_counter()
+    inserted = generate(args.projects, args.tasks_per_project, args.batch_size, args.seed)
+    analyze()
+    print(f"✅ {inserted} in {time.perf_counter() - load_started:.0f}s")
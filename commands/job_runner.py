@@ -0,0 +1,324 @@
+import asyncio
+import logging
+import random
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------
+# SCHEDULES
+# -----------------------------
+class IntervalSchedule:
+    """
+    Run a job every ``seconds`` seconds, measured from the end of the previous run.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+
+    def next_after(self, now: datetime) -> Optional[datetime]:
+        return now + timedelta(seconds=self.seconds)
+
+
+class CronSchedule:
+    """
+    Cron-like schedule: ``minute hour day-of-month month day-of-week``.
+
+    Each field accepts ``*``, numbers, ranges (``1-5``), lists (``1,15``) and
+    steps (``*/15``, ``0-30/10``). Day of week runs from 0 (Sunday) to 6.
+    As in cron, when both day fields are restricted a day matching either
+    one is accepted.
+    """
+
+    _BOUNDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression: str) -> None:
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(f, lo, hi) for f, (lo, hi) in zip(fields, self._BOUNDS)
+        )
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse(field_expr: str, lo: int, hi: int) -> Set[int]:
+        values: Set[int] = set()
+        for part in field_expr.split(","):
+            step = 1
+            if "/" in part:
+                part, step_expr = part.split("/")
+                step = int(step_expr)
+            if part == "*":
+                start, end = lo, hi
+            elif "-" in part:
+                start, end = (int(p) for p in part.split("-"))
+            else:
+                start = end = int(part)
+            if start < lo or end > hi or step < 1:
+                raise ValueError(f"Cron field '{field_expr}' out of range {lo}-{hi}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day:
+            return weekday_ok
+        if self._any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, now: datetime) -> Optional[datetime]:
+        moment = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = now + timedelta(days=366 * 4)
+        while moment <= limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        return None
+
+
+class DynamicSchedule:
+    """
+    Schedule whose next run time is computed by a callable (e.g. the overdue engine).
+
+    The callable returns the next run time or None; sleep is capped at
+    ``max_sleep_seconds`` either way.
+    """
+
+    def __init__(self, next_run: Callable[[], Optional[datetime]], max_sleep_seconds: float) -> None:
+        self.next_run = next_run
+        self.max_sleep_seconds = max_sleep_seconds
+
+    def next_after(self, now: datetime) -> Optional[datetime]:
+        cap = now + timedelta(seconds=self.max_sleep_seconds)
+        planned = self.next_run()
+        return min(planned, cap) if planned is not None else cap
+
+
+# -----------------------------
+# JOBS
+# -----------------------------
+@dataclass
+class Job:
+    """
+    A scheduled job and its run statistics.
+
+    Attributes:
+        name: Unique job name.
+        func: Blocking callable receiving a fresh Session for each run.
+        schedule: IntervalSchedule, CronSchedule or DynamicSchedule.
+        jitter_seconds: Random delay (0..jitter) added to every scheduled run.
+        run_on_start: Run once as soon as the runner starts.
+        next_run_at: When the job is due next.
+        runs: Completed runs.
+        failures: Runs that raised an exception.
+        skipped: Runs skipped because another process held the job lock.
+        last_duration: Duration of the last run, in seconds.
+        total_duration: Sum of all run durations, in seconds.
+        max_duration: Longest run, in seconds.
+        last_error: Message of the last failure.
+    """
+    name: str
+    func: Callable[[Session], Any]
+    schedule: Any
+    jitter_seconds: float = 0.0
+    run_on_start: bool = False
+    next_run_at: Optional[datetime] = None
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_duration: Optional[float] = None
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    last_error: Optional[str] = None
+    _wake: Optional[asyncio.Event] = field(default=None, repr=False)
+    _loop: Optional[asyncio.AbstractEventLoop] = field(default=None, repr=False)
+
+    def wake(self) -> None:
+        """
+        Run the job as soon as possible (safe to call from any thread).
+        """
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "next_run_at": self.next_run_at,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_duration": self.last_duration,
+            "avg_duration": self.total_duration / self.runs if self.runs else None,
+            "max_duration": self.max_duration,
+            "last_error": self.last_error,
+        }
+
+
+class JobRunner:
+    """
+    Asyncio-native scheduler running blocking jobs in worker threads.
+
+    Every job has its own loop: it sleeps until the next scheduled time (or
+    until woken), then runs the job in a thread with a fresh session that is
+    closed afterwards. A job never overlaps with itself: its loop waits for
+    the current run, and on PostgreSQL a session-level advisory lock keeps
+    other processes (e.g. other API workers) from running it concurrently.
+
+    Start it from the FastAPI lifespan with ``start()``/``stop()``, or
+    standalone with ``asyncio.run(runner.run())``.
+    """
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal) -> None:
+        self.session_factory = session_factory
+        self.jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._stopping: Optional[asyncio.Event] = None
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[Session], Any],
+        schedule: Any,
+        jitter_seconds: float = 0.0,
+        run_on_start: bool = False
+    ) -> Job:
+        """
+        Register a job.
+
+        Args:
+            name: Unique job name (also used for the advisory lock).
+            func: Blocking callable receiving a fresh Session.
+            schedule: When to run the job.
+            jitter_seconds: Maximum random delay added to each run.
+            run_on_start: Run once as soon as the runner starts.
+
+        Returns:
+            The registered Job.
+        """
+        job = Job(name=name, func=func, schedule=schedule, jitter_seconds=jitter_seconds, run_on_start=run_on_start)
+        self.jobs[name] = job
+        return job
+
+    async def run(self) -> None:
+        """
+        Run all jobs until ``stop()`` is called.
+        """
+        self.start()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def start(self) -> None:
+        """
+        Start one asyncio task per job on the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        for job in self.jobs.values():
+            job._loop = loop
+            job._wake = asyncio.Event()
+            if job.run_on_start:
+                job._wake.set()
+            self._tasks.append(asyncio.create_task(self._job_loop(job), name=f"job:{job.name}"))
+
+    async def stop(self) -> None:
+        """
+        Stop all job loops, waiting for running jobs to finish.
+        """
+        if self._stopping is not None:
+            self._stopping.set()
+        for job in self.jobs.values():
+            if job._wake is not None:
+                job._wake.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _job_loop(self, job: Job) -> None:
+        while not self._stopping.is_set():
+            now = datetime.now()
+            next_run = job.schedule.next_after(now)
+            if next_run is None:
+                return
+            job.next_run_at = next_run + timedelta(seconds=random.uniform(0, job.jitter_seconds))
+            delay = max(0.0, (job.next_run_at - now).total_seconds())
+            try:
+                await asyncio.wait_for(job._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            job._wake.clear()
+            if self._stopping.is_set():
+                return
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        started = time.perf_counter()
+        try:
+            ran = await asyncio.to_thread(self._execute, job)
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            logger.exception("Job %s failed", job.name)
+            return
+        if not ran:
+            job.skipped += 1
+            return
+        duration = time.perf_counter() - started
+        job.runs += 1
+        job.last_duration = duration
+        job.total_duration += duration
+        job.max_duration = max(job.max_duration, duration)
+        logger.info("Job %s finished in %.3fs", job.name, duration)
+
+    def _execute(self, job: Job) -> bool:
+        with self._job_lock(job.name) as acquired:
+            if not acquired:
+                return False
+            session = self.session_factory()
+            try:
+                job.func(session)
+            finally:
+                session.close()
+            return True
+
+    @contextmanager
+    def _job_lock(self, name: str) -> Iterator[bool]:
+        engine = self.session_factory.kw["bind"]
+        if engine.dialect.name != "postgresql":
+            yield True
+            return
+        key = zlib.crc32(f"job:{name}".encode())
+        with engine.connect() as conn:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar()
+            try:
+                yield bool(acquired)
+            finally:
+                if acquired:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                conn.commit()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Return run statistics of every job.
+        """
+        return [job.stats() for job in self.jobs.values()]
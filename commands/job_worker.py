@@ -0,0 +1,110 @@
+import argparse
+import os
+import socket
+import threading
+import time
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from db.session import SessionLocal
+from models.job import BackgroundJob
+from services.job_service import JobService
+
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", 2))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 1.0))
+
+
+class JobWorker:
+    """
+    Runs queued background jobs in ``concurrency`` threads.
+
+    Each thread claims one job at a time with a fresh session and polls
+    every ``poll_interval`` seconds while the queue is empty. Several
+    worker processes can share the queue: a job is claimed exactly once.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        concurrency: int = JOB_WORKER_CONCURRENCY,
+        poll_interval: float = JOB_POLL_INTERVAL
+    ) -> None:
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def run_once(self, worker: Optional[str] = None) -> Optional[BackgroundJob]:
+        """
+        Run the oldest queued job, if any.
+
+        Args:
+            worker: Identifier stored on the claimed job (the process name if omitted).
+
+        Returns:
+            The finished job, or None if the queue was empty.
+        """
+        session = self.session_factory()
+        try:
+            job = JobService(session).run_next(worker or self.name)
+            if job is not None:
+                outcome = "✅" if job.status == "succeeded" else f"❌ {job.error}"
+                print(f"{outcome} job {job.id} ({job.kind}) {job.status} after {job.progress} units")
+            return job
+        finally:
+            session.close()
+
+    def start(self) -> None:
+        """
+        Start the worker threads (returns immediately).
+        """
+        self._stopping.clear()
+        for index in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._loop, args=(f"{self.name}:{index}",), name=f"job-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop polling and wait for the running jobs to finish.
+        """
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def _loop(self, worker: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = self.run_once(worker)
+            except Exception as e:
+                print(f"❌ Job worker {worker} failed to claim a job: {e}")
+                job = None
+            if job is None:
+                self._stopping.wait(self.poll_interval)
+
+    def run_forever(self) -> None:
+        """
+        Run the worker threads until interrupted.
+        """
+        print(f"🛠 Job worker {self.name} started with {self.concurrency} threads")
+        self.start()
+        try:
+            while any(thread.is_alive() for thread in self._threads):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("👋 Stopping after the running jobs")
+            self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run queued background jobs (project deletes, task imports).")
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKER_CONCURRENCY, help="Jobs run in parallel.")
+    parser.add_argument("--poll-interval", type=float, default=JOB_POLL_INTERVAL, help="Seconds between polls when idle.")
+    args = parser.parse_args()
+    JobWorker(concurrency=args.concurrency, poll_interval=args.poll_interval).run_forever()
@@ -0,0 +1,222 @@
+import hashlib
+import hmac
+import json
+import os
+import random
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from db.session import SessionLocal
+from models.outbox import OutboxEvent, WebhookSubscription
+from repositories.outbox_repository import OutboxRepository
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 100))
+OUTBOX_CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", 4))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 1.0))
+OUTBOX_RETENTION_HOURS = float(os.getenv("OUTBOX_RETENTION_HOURS", 24))
+OUTBOX_VISIBILITY_DELAY_SECONDS = float(os.getenv("OUTBOX_VISIBILITY_DELAY_SECONDS", 5))
+WEBHOOK_TIMEOUT_SECONDS = float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", 5))
+WEBHOOK_MAX_BACKOFF_SECONDS = float(os.getenv("WEBHOOK_MAX_BACKOFF_SECONDS", 300))
+
+
+@dataclass
+class OutboxMetrics:
+    """
+    Running counters of the delivery worker.
+
+    Attributes:
+        delivered_events: Events delivered to subscribers.
+        coalesced_events: Events superseded by a later event for the same entity.
+        delivered_batches: Successful webhook requests.
+        failed_batches: Failed webhook requests.
+        lag_seconds: Age of the oldest event delivered in the last cycle.
+        started_at: When the worker started.
+    """
+    delivered_events: int = 0
+    coalesced_events: int = 0
+    delivered_batches: int = 0
+    failed_batches: int = 0
+    lag_seconds: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def throughput(self) -> float:
+        """Delivered events per second since start."""
+        elapsed = time.monotonic() - self.started_at
+        return self.delivered_events / elapsed if elapsed > 0 else 0.0
+
+
+def coalesce(events: List[OutboxEvent]) -> List[OutboxEvent]:
+    """
+    Keep only the latest event per entity, preserving outbox order.
+
+    Args:
+        events: Events in outbox order.
+
+    Returns:
+        The events that are not superseded by a later one.
+    """
+    latest: Dict[Tuple[str, str], OutboxEvent] = {}
+    for event in events:
+        entity = event.event_type.split(".", 1)[0]
+        latest[(entity, json.loads(event.payload).get("id"))] = event
+    return sorted(latest.values(), key=lambda e: e.id)
+
+
+def _matches(subscription: WebhookSubscription, event: OutboxEvent) -> bool:
+    if subscription.project_id and subscription.project_id != event.project_id:
+        return False
+    if subscription.event_types:
+        return event.event_type in {t.strip() for t in subscription.event_types.split(",")}
+    return True
+
+
+class OutboxDeliveryWorker:
+    """
+    Drains the outbox and delivers events to webhook subscribers.
+
+    Each cycle reads up to ``batch_size`` events past every due subscriber's
+    cursor, coalesces them per subscriber and POSTs them as one JSON batch,
+    with at most ``concurrency`` requests in flight. A successful delivery
+    advances the subscriber's cursor; a failure keeps it and schedules a
+    retry with exponential backoff.
+
+    Events younger than ``visibility_delay`` seconds are left for a later
+    cycle: the outbox row is written just before its transaction commits,
+    but another transaction holding a lower ID may not have committed yet,
+    and moving the cursor past that ID would skip its event for good.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        concurrency: int = OUTBOX_CONCURRENCY,
+        timeout: float = WEBHOOK_TIMEOUT_SECONDS,
+        max_backoff: float = WEBHOOK_MAX_BACKOFF_SECONDS,
+        visibility_delay: float = OUTBOX_VISIBILITY_DELAY_SECONDS
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.visibility_delay = visibility_delay
+        self.metrics = OutboxMetrics()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="webhook")
+
+    def run_once(self, session: Optional[Session] = None) -> int:
+        """
+        Run one delivery cycle.
+
+        Args:
+            session: Session to use (a new one is opened and closed if omitted).
+
+        Returns:
+            The number of subscribers whose cursor advanced in this cycle.
+        """
+        owns_session = session is None
+        session = session or self.session_factory()
+        try:
+            repo = OutboxRepository(session)
+            now = datetime.utcnow()
+            visible_before = now - timedelta(seconds=self.visibility_delay)
+            plans: List[Tuple[WebhookSubscription, List[OutboxEvent], int]] = []
+            for subscription in repo.list_due_subscriptions(now):
+                events = repo.list_events_after(subscription.last_event_id, self.batch_size, visible_before)
+                if not events:
+                    continue
+                matching = [e for e in events if _matches(subscription, e)]
+                batch = coalesce(matching)
+                self.metrics.coalesced_events += len(matching) - len(batch)
+                plans.append((subscription, batch, events[-1].id))
+
+            futures = [
+                self._executor.submit(self._deliver, sub.url, sub.secret, batch) if batch else None
+                for sub, batch, _ in plans
+            ]
+
+            handled = 0
+            for (subscription, batch, cursor), future in zip(plans, futures):
+                if future is None or future.result():
+                    subscription.last_event_id = cursor
+                    subscription.failure_count = 0
+                    subscription.next_attempt_at = None
+                    handled += 1
+                    if batch:
+                        self.metrics.delivered_batches += 1
+                        self.metrics.delivered_events += len(batch)
+                        self.metrics.lag_seconds = (now - batch[0].created_at).total_seconds()
+                else:
+                    subscription.failure_count += 1
+                    backoff = min(self.max_backoff, 2 ** (subscription.failure_count - 1))
+                    subscription.next_attempt_at = now + timedelta(seconds=backoff * random.uniform(0.8, 1.2))
+                    self.metrics.failed_batches += 1
+            repo.update_subscriptions()
+            self._prune(repo)
+            return handled
+        finally:
+            if owns_session:
+                session.close()
+
+    def _deliver(self, url: str, secret: Optional[str], batch: List[OutboxEvent]) -> bool:
+        body = json.dumps({
+            "events": [
+                {
+                    "id": e.event_id,
+                    "type": e.event_type,
+                    "project_id": e.project_id,
+                    "created_at": e.created_at.isoformat(),
+                    "data": json.loads(e.payload),
+                }
+                for e in batch
+            ]
+        }).encode()
+        headers = {"Content-Type": "application/json", "X-Todolist-Delivery": uuid.uuid4().hex}
+        if secret:
+            headers["X-Todolist-Signature"] = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+        try:
+            request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return 200 <= response.status < 300
+        except Exception as e:
+            # Any failure (bad URL, protocol error, ...) only backs off this subscriber
+            print(f"❌ Webhook delivery to {url} failed: {e!r}")
+            return False
+
+    def _prune(self, repo: OutboxRepository) -> None:
+        subscriptions = [s for s in repo.list_subscriptions() if s.active]
+        up_to = min((s.last_event_id for s in subscriptions), default=None)
+        repo.prune_events(up_to, datetime.utcnow() - timedelta(hours=OUTBOX_RETENTION_HOURS))
+
+    def run_forever(self, poll_interval: float = OUTBOX_POLL_INTERVAL) -> None:
+        """
+        Deliver continuously, sleeping ``poll_interval`` when the outbox is idle.
+        """
+        print("📤 Outbox delivery worker started")
+        while True:
+            try:
+                handled = self.run_once()
+            except Exception as e:
+                print(f"❌ Outbox delivery cycle failed: {e}")
+                handled = 0
+            if handled == 0:
+                time.sleep(poll_interval)
+                continue
+            m = self.metrics
+            print(
+                f"✅ delivered={m.delivered_events} batches={m.delivered_batches} failed={m.failed_batches} "
+                f"coalesced={m.coalesced_events} lag={m.lag_seconds:.1f}s throughput={m.throughput:.1f}/s"
+            )
+
+
+if __name__ == "__main__":
+    OutboxDeliveryWorker().run_forever()
@@ -0,0 +1,79 @@
+import argparse
+from typing import List, Tuple
+
+from sqlalchemy.orm import Session
+
+from db.session import shard_router
+from events.changes import snapshot
+from models.project import Project
+from models.task import Task, ArchivedTask
+
+
+def misplaced_projects() -> List[Tuple[str, str, str]]:
+    """
+    Find projects stored on a shard other than the one their ID hashes to.
+
+    Returns:
+        ``(project_id, current_shard, target_shard)`` tuples.
+    """
+    moves: List[Tuple[str, str, str]] = []
+    for shard_id, engine in shard_router.engines.items():
+        with Session(bind=engine) as session:
+            for (project_id,) in session.query(Project.id).all():
+                target = shard_router.shard_for(project_id)
+                if target != shard_id:
+                    moves.append((project_id, shard_id, target))
+    return moves
+
+
+def move_project(project_id: str, source_id: str, target_id: str) -> int:
+    """
+    Copy a project with its tasks and archived tasks to the target shard,
+    then delete it from the source shard.
+
+    The outbox is not supported when sharded, so there are no outbox
+    events to move.
+
+    The copy is committed before the delete, so an interrupted move leaves
+    the project on both shards and can simply be rerun.
+
+    Returns:
+        The number of rows moved.
+    """
+    with Session(bind=shard_router.engines[source_id]) as source, \
+            Session(bind=shard_router.engines[target_id]) as target:
+        project = source.get(Project, project_id)
+        if project is None:
+            return 0
+        tasks = source.query(Task).filter(Task.project_id == project_id).all()
+        archived = source.query(ArchivedTask).filter(ArchivedTask.project_id == project_id).all()
+
+        target.merge(Project(**snapshot(project)))
+        target.flush()
+        for obj in tasks + archived:
+            target.merge(type(obj)(**snapshot(obj)))
+        target.commit()
+
+        source.delete(project)
+        source.commit()
+        return 1 + len(tasks) + len(archived)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Move projects to the shard their ID hashes to (after changing SHARD_DATABASE_URLS)."
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only list the projects that would move.")
+    args = parser.parse_args()
+
+    if shard_router is None:
+        raise SystemExit("❌ SHARD_DATABASE_URLS is not set.")
+
+    moves = misplaced_projects()
+    print(f"🔎 {len(moves)} projects to move across {len(shard_router.shard_ids)} shards")
+    for project_id, source_id, target_id in moves:
+        if args.dry_run:
+            print(f"   {project_id}: shard {source_id} → shard {target_id}")
+            continue
+        rows = move_project(project_id, source_id, target_id)
+        print(f"🚚 {project_id}: shard {source_id} → shard {target_id} ({rows} rows)")
@@ -1,40 +1,132 @@
-import schedule
-import time
+import asyncio
+import os
 from datetime import datetime
-from typing import List
 
+from commands.job_runner import JobRunner, CronSchedule, DynamicSchedule, IntervalSchedule
+from commands.outbox_worker import OutboxDeliveryWorker, OUTBOX_POLL_INTERVAL
+from events.changes import OUTBOX_ENABLED
+from services.overdue_engine import overdue_engine
 from services.task_service import TaskService
-from repositories.task_repository import TaskRepository
-from repositories.project_repository import ProjectRepository
-from db.session import SessionLocal
-from models.task import Task
+from services.idempotency_service import IdempotencyService
+from services.job_service import JobService
+from repositories.factory import create_project_repository, create_task_repository
 
+SCHEDULER_CATCH_UP_INTERVAL = float(os.getenv("SCHEDULER_CATCH_UP_INTERVAL", 0))
+SCHEDULER_JITTER_SECONDS = float(os.getenv("SCHEDULER_JITTER_SECONDS", 30))
+TASK_ARCHIVE_CRON = os.getenv("TASK_ARCHIVE_CRON", "30 3 * * *")
+IDEMPOTENCY_PRUNE_INTERVAL = float(os.getenv("IDEMPOTENCY_PRUNE_INTERVAL", 3600))
+JOB_PRUNE_INTERVAL = float(os.getenv("JOB_PRUNE_INTERVAL", 3600))
 
-# Initialize database session and repositories
-db_session = SessionLocal()
-project_repo = ProjectRepository(db_session)
-task_repo = TaskRepository(db_session)
-task_service = TaskService(task_repo, project_repo)
+
+def archive_completed_tasks(session) -> int:
+    """
+    Move done tasks past their retention period to the archive.
+
+    Args:
+        session: Session to use.
+
+    Returns:
+        The number of tasks archived.
+    """
+    service = TaskService(
+        task_repo=create_task_repository(session),
+        project_repo=create_project_repository(session)
+    )
+    archived: int = service.archive_completed()
+    print(f"🗄 {archived} completed tasks archived at {datetime.now()}")
+    return archived
+
+
+def prune_idempotency_keys(session) -> int:
+    """
+    Delete Idempotency-Key responses past their TTL.
+
+    Args:
+        session: Session to use.
+
+    Returns:
+        The number of keys deleted.
+    """
+    pruned: int = IdempotencyService(session).prune_expired()
+    print(f"🧹 {pruned} expired idempotency keys pruned at {datetime.now()}")
+    return pruned
 
 
-def close_overdue_tasks() -> None:
+def prune_background_jobs(session) -> int:
     """
-    Mark all overdue tasks as done.
+    Delete finished background jobs past their retention period.
 
-    Uses TaskRepository to fetch all overdue tasks and updates their status.
+    Args:
+        session: Session to use.
+
+    Returns:
+        The number of jobs deleted.
+    """
+    pruned: int = JobService(session).prune_finished()
+    print(f"🧹 {pruned} finished background jobs pruned at {datetime.now()}")
+    return pruned
+
+
+def build_job_runner() -> JobRunner:
     """
-    tasks: List[Task] = task_repo.list_all_overdue()  # Adjusted repo function to take no parameter
-    for task in tasks:
-        task.status = "done"
-        task_repo.update_task(task)
-    print(f"✅ {len(tasks)} overdue tasks updated at {datetime.now()}")
+    Create the job runner with the application's periodic jobs.
+
+    Jobs:
+        close-overdue: driven by the overdue engine's next deadline boundary
+            and woken up by deadline edits.
+        overdue-catch-up: optional safety net, a full overdue scan every
+            SCHEDULER_CATCH_UP_INTERVAL seconds (off by default: TaskService
+            closes tasks written with a past deadline itself).
+        archive-completed: moves old done tasks to the archive on TASK_ARCHIVE_CRON (03:30 by default).
+        prune-idempotency-keys: drops expired Idempotency-Key responses every IDEMPOTENCY_PRUNE_INTERVAL seconds.
+        prune-background-jobs: drops finished background jobs every JOB_PRUNE_INTERVAL seconds.
+        outbox-delivery: webhook delivery cycle, when OUTBOX_ENABLED.
+
+    Returns:
+        A JobRunner, not started yet.
+    """
+    runner = JobRunner()
+    overdue_job = runner.add_job(
+        "close-overdue",
+        lambda session: overdue_engine.run_due(session=session),
+        DynamicSchedule(lambda: overdue_engine.next_run_at, overdue_engine.max_sleep_seconds),
+        run_on_start=True
+    )
+    overdue_engine.add_wake_callback(overdue_job.wake)
+
+    if SCHEDULER_CATCH_UP_INTERVAL > 0:
+        runner.add_job(
+            "overdue-catch-up",
+            overdue_engine.catch_up,
+            IntervalSchedule(SCHEDULER_CATCH_UP_INTERVAL),
+            jitter_seconds=SCHEDULER_JITTER_SECONDS
+        )
+
+    runner.add_job(
+        "archive-completed",
+        archive_completed_tasks,
+        CronSchedule(TASK_ARCHIVE_CRON),
+        jitter_seconds=SCHEDULER_JITTER_SECONDS
+    )
+
+    runner.add_job(
+        "prune-idempotency-keys",
+        prune_idempotency_keys,
+        IntervalSchedule(IDEMPOTENCY_PRUNE_INTERVAL)
+    )
+
+    runner.add_job(
+        "prune-background-jobs",
+        prune_background_jobs,
+        IntervalSchedule(JOB_PRUNE_INTERVAL)
+    )
 
+    if OUTBOX_ENABLED:
+        worker = OutboxDeliveryWorker()
+        runner.add_job("outbox-delivery", worker.run_once, IntervalSchedule(OUTBOX_POLL_INTERVAL))
+    return runner
 
-# Schedule tasks
-schedule.every().day.at("02:00").do(close_overdue_tasks)  # Daily at 2 AM
-schedule.every(15).minutes.do(close_overdue_tasks)        # Every 15 minutes
 
-print("⏱ Scheduler started")
-while True:
-    schedule.run_pending()
-    time.sleep(900)  # Sleep for 15 minutes
+if __name__ == "__main__":
+    print("⏱ Scheduler started")
+    asyncio.run(build_job_runner().run())
@@ -0,0 +1,43 @@
+import argparse
+import json
+import random
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class WebhookStubHandler(BaseHTTPRequestHandler):
+    """
+    Local webhook receiver printing each delivered batch.
+
+    Used to exercise the outbox delivery worker; ``fail_rate`` makes a share
+    of requests answer 500 so retries and backoff can be observed.
+    """
+    fail_rate: float = 0.0
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if random.random() < self.fail_rate:
+            self.send_response(500)
+            self.end_headers()
+            print(f"💥 Rejected delivery {self.headers.get('X-Todolist-Delivery')}")
+            return
+
+        events = json.loads(body)["events"]
+        print(f"📥 Delivery {self.headers.get('X-Todolist-Delivery')}: {len(events)} events")
+        for event in events:
+            print(f"   {event['id']} {event['type']} {event['data'].get('id')}")
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local webhook receiver for testing outbox delivery.")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    WebhookStubHandler.fail_rate = args.fail_rate
+    print(f"🛰 Webhook stub listening on http://127.0.0.1:{args.port}/")
+    ThreadingHTTPServer(("127.0.0.1", args.port), WebhookStubHandler).serve_forever()
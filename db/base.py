@@ -1,4 +1,6 @@
+from typing import Iterable, List
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm.attributes import InstrumentedAttribute
 
 Base: type = declarative_base()
 """
@@ -6,3 +8,20 @@ SQLAlchemy declarative base class.
 
 All ORM models should inherit from this Base.
 """
+
+
+def fieldset_columns(model: type, fields: Iterable[str]) -> List[InstrumentedAttribute]:
+    """
+    Map response field names to the model's columns, for ``load_only()``.
+
+    Names that are not columns of the model (e.g. computed attributes) are skipped.
+
+    Args:
+        model: ORM model class.
+        fields: Requested field names.
+
+    Returns:
+        The matching column attributes.
+    """
+    columns = model.__table__.columns
+    return [getattr(model, name) for name in fields if name in columns]
@@ -0,0 +1,121 @@
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+WAIT_BUCKETS_MS: Tuple[float, ...] = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class WaitStats:
+    """
+    Thread-safe counters for time spent waiting on a bounded resource.
+
+    Attributes:
+        count: Completed waits.
+        total_seconds: Sum of all waits.
+        max_seconds: Longest wait.
+        waiting: Callers waiting right now.
+        max_waiting: Highest observed ``waiting``.
+        timeouts: Waits that gave up.
+        buckets: Wait counts per upper bound in milliseconds (WAIT_BUCKETS_MS, then +inf).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every counter (except callers currently waiting)."""
+        with self._lock:
+            self.count = 0
+            self.total_seconds = 0.0
+            self.max_seconds = 0.0
+            self.waiting = getattr(self, "waiting", 0)
+            self.max_waiting = self.waiting
+            self.timeouts = 0
+            self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def started(self) -> None:
+        """A caller starts waiting."""
+        with self._lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def finished(self, seconds: float, timed_out: bool = False) -> None:
+        """A caller stops waiting after ``seconds``."""
+        milliseconds = seconds * 1000
+        bucket = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if milliseconds <= bound), len(WAIT_BUCKETS_MS))
+        with self._lock:
+            self.waiting -= 1
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self.buckets[bucket] += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters, with the average wait and labelled buckets."""
+        with self._lock:
+            labels = [f"<={bound:g}ms" for bound in WAIT_BUCKETS_MS] + [f">{WAIT_BUCKETS_MS[-1]:g}ms"]
+            return {
+                "count": self.count,
+                "avg_ms": self.total_seconds / self.count * 1000 if self.count else 0.0,
+                "max_ms": self.max_seconds * 1000,
+                "total_seconds": self.total_seconds,
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "timeouts": self.timeouts,
+                "buckets": dict(zip(labels, self.buckets)),
+            }
+
+
+connection_wait: WaitStats = WaitStats()
+"""
+Time requests spent checking a connection out of the engine pools.
+"""
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool recording checkout waits in ``connection_wait``.
+
+    The measured time covers waiting for a free connection and, when the
+    pool grows into its overflow, opening a new one; checkouts that hit
+    ``pool_timeout`` are counted as timeouts.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        connection_wait.started()
+        timed_out = False
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            connection_wait.finished(time.perf_counter() - started, timed_out)
+
+
+def pool_status(engine) -> Dict[str, Any]:
+    """
+    Occupancy of an engine's connection pool.
+
+    Returns:
+        The pool's capacity and current use (only the class name for pools
+        without a fixed size, e.g. SQLite in-memory pools).
+    """
+    pool = engine.pool
+    status: Dict[str, Any] = {"url": engine.url.render_as_string(hide_password=True), "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    return status
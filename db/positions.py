@@ -0,0 +1,134 @@
+from typing import List, Optional, Tuple
+
+DIGITS: str = "0123456789abcdefghijklmnopqrstuvwxyz"
+"""
+Digits of a position key, in ascending byte order, so keys compare as plain strings.
+"""
+
+_BASE: int = len(DIGITS)
+_FIRST_POSITIVE: int = DIGITS.index("i")
+
+FIRST_KEY: str = "i0"
+"""
+Key of the first task of a project.
+"""
+
+
+# A key is an integer part followed by an optional fraction:
+#
+# - The integer part is a head digit and the number of digits it announces:
+#   "i" one digit ("i0".."iz"), "j" two digits, ... and going down "h" one
+#   digit, "g" two digits, ... Appending or prepending a task increments or
+#   decrements it, so keys grow by one digit per 36**n moves to an end.
+# - The fraction is read as a base-36 fraction ("i" is 0.5) and never ends
+#   in "0", so there is always room for another key below any key. Moving a
+#   task between two others halves the gap in the fraction.
+def _integer_length(head: str) -> int:
+    index = DIGITS.index(head)
+    return index - _FIRST_POSITIVE + 2 if index >= _FIRST_POSITIVE else _FIRST_POSITIVE - index + 1
+
+
+def _split(key: str) -> Tuple[str, str]:
+    length = _integer_length(key[0])
+    if len(key) < length or key[length:].endswith("0"):
+        raise ValueError(f"Invalid position key {key!r}.")
+    return key[:length], key[length:]
+
+
+def _increment(integer: str) -> Optional[str]:
+    digits = [DIGITS.index(c) for c in integer[1:]]
+    for i in reversed(range(len(digits))):
+        if digits[i] < _BASE - 1:
+            digits[i] += 1
+            return integer[0] + "".join(DIGITS[d] for d in digits)
+        digits[i] = 0
+    head = DIGITS.index(integer[0]) + 1
+    if head == _BASE:
+        return None
+    return DIGITS[head] + "0" * (_integer_length(DIGITS[head]) - 1)
+
+
+def _decrement(integer: str) -> Optional[str]:
+    digits = [DIGITS.index(c) for c in integer[1:]]
+    for i in reversed(range(len(digits))):
+        if digits[i] > 0:
+            digits[i] -= 1
+            return integer[0] + "".join(DIGITS[d] for d in digits)
+        digits[i] = _BASE - 1
+    head = DIGITS.index(integer[0]) - 1
+    if head < 0:
+        return None
+    return DIGITS[head] + DIGITS[-1] * (_integer_length(DIGITS[head]) - 1)
+
+
+def _midpoint(lower: str, upper: Optional[str]) -> str:
+    """
+    The shortest fraction strictly between two fractions (``upper`` None: 1).
+    """
+    key = ""
+    for i in range(len(lower) + len(upper or "") + 1):
+        low = DIGITS.index(lower[i]) if i < len(lower) else 0
+        high = DIGITS.index(upper[i]) if upper is not None and i < len(upper) else _BASE
+        if high - low > 1:
+            return key + DIGITS[(low + high) // 2]
+        key += DIGITS[low]
+        if high - low == 1:
+            # Any continuation of ``key`` now sorts before ``upper``
+            upper = None
+    raise ValueError(f"No fraction between {lower!r} and {upper!r}.")
+
+
+def key_between(lower: Optional[str], upper: Optional[str]) -> str:
+    """
+    A key sorting strictly between two keys.
+
+    Args:
+        lower: Key to sort after (None: before everything else).
+        upper: Key to sort before (None: after everything else).
+
+    Returns:
+        The new key.
+
+    Raises:
+        ValueError: If a key is malformed or ``lower`` does not sort before
+            ``upper`` (e.g. two tasks got the same key); the project's keys
+            need rebalancing.
+    """
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError(f"No position key between {lower!r} and {upper!r}.")
+    if lower is None and upper is None:
+        return FIRST_KEY
+    if lower is None:
+        integer, fraction = _split(upper)
+        if fraction:
+            return integer
+        previous = _decrement(integer)
+        if previous is None:
+            raise ValueError(f"No position key before {upper!r}.")
+        return previous
+    integer, fraction = _split(lower)
+    if upper is None:
+        following = _increment(integer)
+        return following if following is not None else integer + _midpoint(fraction, None)
+    upper_integer, upper_fraction = _split(upper)
+    if integer == upper_integer:
+        return integer + _midpoint(fraction, upper_fraction)
+    following = _increment(integer)
+    if following is not None and following < upper:
+        return following
+    return integer + _midpoint(fraction, None)
+
+
+def sequential_keys(count: int) -> List[str]:
+    """
+    ``count`` ascending keys without fractions, the shortest there are.
+
+    Used to rebalance a project whose keys grew long from repeated moves
+    into the same gap.
+    """
+    keys: List[str] = []
+    key = FIRST_KEY
+    for _ in range(count):
+        keys.append(key)
+        key = _increment(key)
+    return keys
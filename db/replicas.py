@@ -0,0 +1,210 @@
+import functools
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_POOL_KEY: str = "replica_pool"
+_PIN_KEY: str = "primary_pins"
+_WROTE_KEY: str = "wrote"
+
+_PG_LAG_QUERY = text(
+    "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+)
+
+
+class ReplicaPool:
+    """
+    Round-robin set of read replicas with health and lag tracking.
+
+    A replica is skipped while it is marked unhealthy: after a failed read
+    it is retried once ``retry_after`` seconds have passed, and the
+    background health check takes it out of rotation while its replication
+    lag exceeds ``max_lag_seconds``.
+    """
+
+    def __init__(self, engines: List[Engine], max_lag_seconds: float = 5.0, retry_after: float = 30.0) -> None:
+        """
+        Initialize the ReplicaPool.
+
+        Args:
+            engines: One engine per replica.
+            max_lag_seconds: Maximum tolerated replication lag.
+            retry_after: Seconds a failed replica stays out of rotation.
+        """
+        self.engines = engines
+        self.max_lag_seconds = max_lag_seconds
+        self.retry_after = retry_after
+        self._unhealthy_until: Dict[Engine, float] = {}
+        self._cycle = itertools.cycle(engines)
+        self._lock = threading.Lock()
+
+    def choose(self) -> Optional[Engine]:
+        """
+        Pick the next healthy replica.
+
+        Returns:
+            A replica engine, or None if every replica is unhealthy.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                engine = next(self._cycle)
+                if self._unhealthy_until.get(engine, 0.0) <= now:
+                    return engine
+        return None
+
+    def mark_failed(self, engine: Engine, seconds: Optional[float] = None) -> None:
+        """
+        Take a replica out of rotation.
+
+        Args:
+            engine: The failing replica.
+            seconds: How long to skip it (defaults to ``retry_after``).
+        """
+        with self._lock:
+            self._unhealthy_until[engine] = time.monotonic() + (seconds or self.retry_after)
+
+    def check_health(self) -> None:
+        """
+        Probe every replica and update its availability.
+
+        A replica is healthy when it answers and, on PostgreSQL, its replay
+        lag is within ``max_lag_seconds``.
+        """
+        for engine in self.engines:
+            try:
+                with engine.connect() as conn:
+                    lag = 0.0
+                    if engine.dialect.name == "postgresql":
+                        lag = float(conn.execute(_PG_LAG_QUERY).scalar() or 0.0)
+                    else:
+                        conn.execute(text("SELECT 1"))
+            except DBAPIError as e:
+                logger.warning("Replica %s failed health check: %s", engine.url, e)
+                self.mark_failed(engine)
+                continue
+
+            if lag > self.max_lag_seconds:
+                logger.warning("Replica %s lags %.1fs behind the primary", engine.url, lag)
+                self.mark_failed(engine)
+            else:
+                with self._lock:
+                    self._unhealthy_until.pop(engine, None)
+
+    def start_health_checks(self, interval: float) -> threading.Thread:
+        """
+        Run ``check_health`` periodically on a daemon thread.
+
+        Args:
+            interval: Seconds between two health checks.
+
+        Returns:
+            The started thread.
+        """
+        def loop() -> None:
+            while True:
+                self.check_health()
+                time.sleep(interval)
+
+        thread = threading.Thread(target=loop, name="replica-health-check", daemon=True)
+        thread.start()
+        return thread
+
+
+def install_replica_routing(session_factory: sessionmaker, pool: ReplicaPool) -> None:
+    """
+    Make sessions from ``session_factory`` eligible for replica reads.
+
+    Once a session has flushed a write it stays on the primary for the rest
+    of its life, so later reads in the same unit of work see that write.
+
+    Args:
+        session_factory: The application's sessionmaker.
+        pool: Replicas to route reads to.
+    """
+    session_factory.kw.setdefault("info", {})[_POOL_KEY] = pool
+
+    @event.listens_for(session_factory, "after_flush")
+    def _pin_after_write(session: Session, flush_context) -> None:
+        session.info[_WROTE_KEY] = True
+
+
+@contextmanager
+def use_primary(session: Optional[Session]) -> Iterator[None]:
+    """
+    Keep reads issued inside the block on the primary.
+
+    Use it around reads that a write decision depends on (limit checks,
+    uniqueness checks), where replica lag must not be tolerated.
+
+    Args:
+        session: The session whose reads should be pinned.
+    """
+    if session is None:
+        yield
+        return
+    session.info[_PIN_KEY] = session.info.get(_PIN_KEY, 0) + 1
+    try:
+        yield
+    finally:
+        session.info[_PIN_KEY] -= 1
+
+
+def replica_read(method: F) -> F:
+    """
+    Run a read-only repository method against a replica when possible.
+
+    The method runs on a short-lived session bound to the chosen replica and
+    returns detached instances. It falls back to the repository's own
+    (primary) session when no replicas are configured or healthy, when the
+    session has pending or flushed writes or is pinned with ``use_primary``,
+    or when the replica read fails.
+
+    Args:
+        method: A repository method reading through ``self.db_session``.
+
+    Returns:
+        The wrapped method.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        session: Session = self.db_session
+        pool: Optional[ReplicaPool] = session.info.get(_POOL_KEY) if session is not None else None
+        if (
+            pool is None
+            or session.info.get(_PIN_KEY)
+            or session.info.get(_WROTE_KEY)
+            or session.new or session.dirty or session.deleted
+        ):
+            return method(self, *args, **kwargs)
+
+        engine = pool.choose()
+        if engine is None:
+            return method(self, *args, **kwargs)
+
+        replica_session = Session(bind=engine, autoflush=False)
+        self.db_session = replica_session
+        try:
+            return method(self, *args, **kwargs)
+        except DBAPIError as e:
+            logger.warning("Replica read %s failed on %s, using primary: %s", method.__qualname__, engine.url, e)
+            pool.mark_failed(engine)
+            self.db_session = session
+            return method(self, *args, **kwargs)
+        finally:
+            self.db_session = session
+            replica_session.close()
+
+    return wrapper  # type: ignore[return-value]
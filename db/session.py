@@ -1,24 +1,170 @@
 import os
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Generator, Optional
+
+from db.pool import InstrumentedQueuePool
+from db.slow_query import SlowQueryRecorder
+from db.replicas import ReplicaPool, install_replica_routing
+from db.sharding import ShardRouter
+from db.sqlite import SQLiteWriteLock, apply_pragmas
+from events.changes import OUTBOX_ENABLED
 
 # Load environment variables from .env file
 load_dotenv()
 
 DATABASE_URL: str | None = os.getenv("DATABASE_URL")
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=False
-)
+# Connection pool (SQLAlchemy defaults: 5 + 10 overflow)
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_CAPACITY: int = DB_POOL_SIZE + DB_MAX_OVERFLOW
+
+# Optional read replicas (comma-separated SQLAlchemy URLs)
+DATABASE_REPLICA_URLS: list[str] = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+REPLICA_RETRY_AFTER_SECONDS: float = float(os.getenv("REPLICA_RETRY_AFTER_SECONDS", 30))
+REPLICA_HEALTH_CHECK_INTERVAL: float = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL", 10))
+
+# Optional hash sharding by project (comma-separated SQLAlchemy URLs, one per shard)
+SHARD_DATABASE_URLS: list[str] = [u.strip() for u in os.getenv("SHARD_DATABASE_URLS", "").split(",") if u.strip()]
+
+# SQLite tuning (applied when DATABASE_URL is a sqlite:// URL)
+SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", 65536))
+SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_WRITE_LOCK: bool = os.getenv("SQLITE_WRITE_LOCK", "true").lower() == "true"
+SQLITE_WRITE_LOCK_TIMEOUT: float = float(os.getenv("SQLITE_WRITE_LOCK_TIMEOUT", 30))
+
+# Slow-query log (opt-in)
+SLOW_QUERY_LOG_ENABLED: bool = os.getenv("SLOW_QUERY_LOG_ENABLED", "false").lower() == "true"
+SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+SLOW_QUERY_BUFFER_SIZE: int = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", 100))
+SLOW_QUERY_REDACT_PARAMS: bool = os.getenv("SLOW_QUERY_REDACT_PARAMS", "true").lower() == "true"
+SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+
+
+def _pool_options(url: str) -> dict:
+    """
+    Queue pool class and sizing for ``url`` (in-memory SQLite uses a single-connection pool).
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+
+
+def _sqlite_pragmas() -> dict:
+    """
+    PRAGMAs applied to every SQLite connection (an empty value skips the PRAGMA).
+    """
+    pragmas = {
+        "journal_mode": SQLITE_JOURNAL_MODE,
+        "synchronous": SQLITE_SYNCHRONOUS,
+        "cache_size": -SQLITE_CACHE_SIZE_KB,
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    }
+    return {name: value for name, value in pragmas.items() if value != ""}
+
+
+def create_database_engine(url: str):
+    """
+    Create an engine for ``url``, tuning SQLite connections when applicable.
+    """
+    new_engine = create_engine(url, echo=False, **_pool_options(url))
+    if new_engine.dialect.name == "sqlite":
+        apply_pragmas(new_engine, _sqlite_pragmas())
+    return new_engine
+
+
+engine = create_database_engine(DATABASE_URL)
+
+slow_query_recorder: Optional[SlowQueryRecorder] = None
+"""
+Recorder for statements slower than SLOW_QUERY_THRESHOLD_MS, or None when disabled.
+"""
+
+if SLOW_QUERY_LOG_ENABLED:
+    slow_query_recorder = SlowQueryRecorder(
+        threshold_ms=SLOW_QUERY_THRESHOLD_MS,
+        buffer_size=SLOW_QUERY_BUFFER_SIZE,
+        redact_params=SLOW_QUERY_REDACT_PARAMS,
+        capture_plans=SLOW_QUERY_EXPLAIN
+    )
+    slow_query_recorder.attach(engine)
+
+replica_pool: Optional[ReplicaPool] = None
+"""
+Read replicas used by read-only repository methods, or None when not configured.
+"""
+
+shard_router: Optional[ShardRouter] = None
+"""
+Router spreading projects over SHARD_DATABASE_URLS, or None when not sharded.
+"""
+
+if SHARD_DATABASE_URLS and OUTBOX_ENABLED:
+    # Each shard numbers its outbox events on its own, while a webhook
+    # subscription keeps a single cursor: deliveries would skip events
+    raise RuntimeError("OUTBOX_ENABLED is not supported together with SHARD_DATABASE_URLS.")
+
+if SHARD_DATABASE_URLS:
+    shard_router = ShardRouter(
+        [create_database_engine(url) for url in SHARD_DATABASE_URLS],
+        global_engine=engine
+    )
+    if slow_query_recorder is not None:
+        for shard_engine in shard_router.engines.values():
+            slow_query_recorder.attach(shard_engine)
+
+if DATABASE_REPLICA_URLS and shard_router is None:
+    replica_pool = ReplicaPool(
+        [create_engine(url, echo=False) for url in DATABASE_REPLICA_URLS],
+        max_lag_seconds=REPLICA_MAX_LAG_SECONDS,
+        retry_after=REPLICA_RETRY_AFTER_SECONDS
+    )
+    if slow_query_recorder is not None:
+        for replica_engine in replica_pool.engines:
+            slow_query_recorder.attach(replica_engine)
+
+if shard_router is not None:
+    SessionLocal: sessionmaker = shard_router.sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine
+    )
+else:
+    SessionLocal: sessionmaker = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine
+    )
+
+sqlite_write_lock: Optional[SQLiteWriteLock] = None
+"""
+Single-writer queue for SQLite sessions, or None on other backends.
+"""
+
+if engine.dialect.name == "sqlite" and shard_router is None and SQLITE_WRITE_LOCK:
+    sqlite_write_lock = SQLiteWriteLock(timeout=SQLITE_WRITE_LOCK_TIMEOUT)
+    sqlite_write_lock.install(SessionLocal)
 
-SessionLocal: sessionmaker = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
+if replica_pool is not None:
+    install_replica_routing(SessionLocal, replica_pool)
+    replica_pool.start_health_checks(REPLICA_HEALTH_CHECK_INTERVAL)
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -0,0 +1,215 @@
+import copy
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import Mapper, ORMExecuteState, Session, sessionmaker
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+SHARD_KEY_OPTION: str = "shard_project_id"
+"""
+Execution option carrying the project a query is scoped to.
+"""
+
+GLOBAL_SHARD: str = "global"
+"""
+Shard id of the DATABASE_URL database, holding tables not keyed by project.
+"""
+
+_ROUTER_KEY: str = "shard_router"
+_PINNED_KEY: str = "pinned_shard"
+
+
+def jump_hash(key: str, buckets: int) -> int:
+    """
+    Jump consistent hash (Lamping & Veach) of a string key.
+
+    Growing from N to N+1 buckets only moves about 1/(N+1) of the keys.
+
+    Args:
+        key: The key to place.
+        buckets: Number of buckets.
+
+    Returns:
+        A bucket number in ``[0, buckets)``.
+    """
+    k = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        k = (k * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * (float(1 << 31) / float((k >> 33) + 1)))
+    return b
+
+
+class ShardRouter:
+    """
+    Routes projects, and everything keyed by project, to one of N databases.
+
+    A project lives on shard ``jump_hash(project.id, N)``; its tasks and
+    archived tasks follow it (the outbox is not supported when sharded). Tables without a
+    ``project_id`` (webhook subscriptions) stay on the global database.
+    Queries scoped with the ``shard_project_id`` execution option hit a
+    single shard; other queries on sharded tables run on every shard.
+    """
+
+    def __init__(self, engines: List[Engine], global_engine: Engine) -> None:
+        """
+        Initialize the ShardRouter.
+
+        Args:
+            engines: One engine per shard, in shard order.
+            global_engine: Engine of the DATABASE_URL database.
+        """
+        self.shard_ids: List[str] = [str(i) for i in range(len(engines))]
+        self.engines: Dict[str, Engine] = dict(zip(self.shard_ids, engines))
+        self.global_engine = global_engine
+        self._executor = ThreadPoolExecutor(max_workers=len(engines), thread_name_prefix="shard-fan-out")
+        self._session_kw: Dict[str, Any] = {}
+
+    def shard_for(self, project_id: str) -> str:
+        """
+        Return the shard id a project lives on.
+        """
+        return self.shard_ids[jump_hash(project_id, len(self.shard_ids))]
+
+    @staticmethod
+    def is_sharded(mapper: Mapper) -> bool:
+        return mapper.class_.__tablename__ == "projects" or "project_id" in mapper.columns
+
+    # -----------------------------
+    # SHARDED SESSION HOOKS
+    # -----------------------------
+    def shard_chooser(self, mapper: Mapper, instance: Any, clause=None) -> str:
+        if not self.is_sharded(mapper):
+            return GLOBAL_SHARD
+        if instance is None:
+            raise ValueError(f"Cannot choose a shard for {mapper.class_.__name__} without an instance")
+        if mapper.class_.__tablename__ == "projects":
+            if instance.id is None:
+                # The shard depends on the ID, so generate it before the flush does
+                instance.id = mapper.primary_key[0].default.arg(None)
+            return self.shard_for(instance.id)
+        return self.shard_for(instance.project_id)
+
+    def identity_chooser(
+        self,
+        mapper: Mapper,
+        primary_key: Any,
+        *,
+        lazy_loaded_from: Any,
+        execution_options: Dict[str, Any],
+        bind_arguments: Dict[str, Any],
+        **kw: Any
+    ) -> Iterable[str]:
+        if lazy_loaded_from is not None:
+            return [lazy_loaded_from.identity_token]
+        return self._targets(mapper, execution_options, None)
+
+    def execute_chooser(self, orm_context: ORMExecuteState) -> Iterable[str]:
+        # Bulk UPDATE/DELETE statements carry no load options
+        if orm_context.is_select and orm_context.lazy_loaded_from is not None:
+            return [orm_context.lazy_loaded_from.identity_token]
+        return self._targets(orm_context.bind_mapper, orm_context.execution_options, orm_context.session)
+
+    def _targets(self, mapper: Optional[Mapper], options: Dict[str, Any], session: Optional[Session]) -> List[str]:
+        if session is not None and session.info.get(_PINNED_KEY):
+            return [session.info[_PINNED_KEY]]
+        if mapper is not None and not self.is_sharded(mapper):
+            return [GLOBAL_SHARD]
+        project_id = options.get(SHARD_KEY_OPTION)
+        if project_id is not None:
+            return [self.shard_for(project_id)]
+        return list(self.shard_ids)
+
+    # -----------------------------
+    # SESSIONS
+    # -----------------------------
+    def sessionmaker(self, **kw: Any) -> sessionmaker:
+        """
+        Build a sessionmaker of ShardedSessions routed by this router.
+
+        Args:
+            **kw: Session options (``bind`` should be the global engine).
+
+        Returns:
+            The sessionmaker.
+        """
+        self._session_kw = dict(
+            kw,
+            shards={GLOBAL_SHARD: self.global_engine, **self.engines},
+            shard_chooser=self.shard_chooser,
+            identity_chooser=self.identity_chooser,
+            execute_chooser=self.execute_chooser,
+        )
+        self._session_kw.setdefault("info", {})[_ROUTER_KEY] = self
+        return sessionmaker(class_=ShardedSession, **self._session_kw)
+
+    def pinned_session(self, shard_id: str) -> ShardedSession:
+        """
+        Open a session whose queries all run on a single shard.
+        """
+        info = dict(self._session_kw.get("info", {}), **{_PINNED_KEY: shard_id})
+        return ShardedSession(**dict(self._session_kw, info=info))
+
+    def map_shards(self, func: Callable[[str], Any]) -> List[Any]:
+        """
+        Run ``func(shard_id)`` for every shard in parallel.
+
+        Returns:
+            The results, in shard order.
+        """
+        return list(self._executor.map(func, self.shard_ids))
+
+
+def shard_fan_out(combine: Optional[Callable[[List[Any]], Any]] = None) -> Callable[[F], F]:
+    """
+    Run a cross-shard repository method on every shard in parallel.
+
+    Each shard gets its own short-lived session on a worker thread; the
+    returned instances are merged into the repository's session, so callers
+    can keep modifying them. Without sharding the method runs unchanged.
+
+    Args:
+        combine: Merges the per-shard results (list concatenation by default).
+
+    Returns:
+        A decorator for repository methods reading through ``self.db_session``.
+    """
+    def decorator(method: F) -> F:
+        @functools.wraps(method)
+        def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+            session: Session = self.db_session
+            router: Optional[ShardRouter] = session.info.get(_ROUTER_KEY) if session is not None else None
+            if router is None or session.info.get(_PINNED_KEY):
+                return method(self, *args, **kwargs)
+
+            def run(shard_id: str) -> Any:
+                shard_session = router.pinned_session(shard_id)
+                repo = copy.copy(self)
+                repo.db_session = shard_session
+                try:
+                    return method(repo, *args, **kwargs)
+                finally:
+                    shard_session.close()
+
+            results = router.map_shards(run)
+            if combine is not None:
+                return combine(results)
+            return [
+                session.merge(obj, load=False) if _is_mapped(obj) else obj
+                for result in results for obj in result
+            ]
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _is_mapped(obj: Any) -> bool:
+    return inspect(obj, raiseerr=False) is not None and hasattr(obj, "__tablename__")
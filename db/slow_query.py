@@ -0,0 +1,190 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+REDACTED: str = "<redacted>"
+_SKIP_OPTION: str = "slow_query_skip"
+_REPOSITORIES_DIR: str = os.sep + "repositories" + os.sep
+
+
+@dataclass
+class SlowQuery:
+    """
+    A single statement that exceeded the slow-query threshold.
+
+    Attributes:
+        recorded_at: When the statement finished.
+        duration_ms: Wall-clock execution time in milliseconds.
+        statement: The SQL statement as sent to the driver.
+        parameters: Bound parameters (redacted unless redaction is disabled).
+        caller: Repository method that issued the statement, if any.
+        plan: Captured query plan, filled in asynchronously.
+        plan_error: Error raised while capturing the plan, if any.
+    """
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: Any
+    caller: Optional[str] = None
+    plan: Optional[str] = None
+    plan_error: Optional[str] = None
+
+
+@dataclass
+class SlowQueryRecorder:
+    """
+    Engine hook that keeps the most recent slow statements in a ring buffer.
+
+    Statements slower than ``threshold_ms`` are logged together with their
+    parameters and the repository method that issued them. Plans for SELECT
+    statements are captured on a background thread so the request that ran
+    the slow query is not delayed any further.
+
+    Attributes:
+        threshold_ms: Minimum duration for a statement to be recorded.
+        buffer_size: Maximum number of entries kept in memory.
+        redact_params: Replace parameter values with a placeholder.
+        capture_plans: Run EXPLAIN for recorded SELECT statements.
+    """
+    threshold_ms: float = 200.0
+    buffer_size: int = 100
+    redact_params: bool = True
+    capture_plans: bool = True
+    _entries: Deque[SlowQuery] = field(init=False, repr=False)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+    _executor: Optional[ThreadPoolExecutor] = field(init=False, repr=False, default=None)
+
+    def __post_init__(self) -> None:
+        self._entries = deque(maxlen=self.buffer_size)
+
+    # -----------------------------
+    # ENGINE HOOKS
+    # -----------------------------
+    def attach(self, engine: Engine) -> None:
+        """
+        Register the cursor execution listeners on an engine.
+
+        Args:
+            engine: The SQLAlchemy engine to instrument.
+        """
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        # On the execution context, not the connection: a failing statement
+        # never reaches after_cursor_execute and must not leave a start behind
+        context._slow_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_slow_query_start", None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms or conn.get_execution_options().get(_SKIP_OPTION):
+            return
+
+        entry = SlowQuery(
+            recorded_at=datetime.now(),
+            duration_ms=round(duration_ms, 3),
+            statement=statement,
+            parameters=self._redact(parameters) if self.redact_params else parameters,
+            caller=self._find_caller(),
+        )
+        with self._lock:
+            self._entries.append(entry)
+
+        logger.warning(
+            "Slow query (%.1f ms) from %s: %s params=%s",
+            entry.duration_ms, entry.caller or "<unknown>", statement, entry.parameters
+        )
+
+        if self.capture_plans and not executemany and statement.lstrip().upper().startswith("SELECT"):
+            self._explain_async(conn.engine, entry, statement, parameters)
+
+    # -----------------------------
+    # PLAN CAPTURE
+    # -----------------------------
+    def _explain_async(self, engine: Engine, entry: SlowQuery, statement: str, parameters: Any) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._executor.submit(self._explain, engine, entry, statement, parameters)
+
+    @staticmethod
+    def _explain(engine: Engine, entry: SlowQuery, statement: str, parameters: Any) -> None:
+        if engine.dialect.name == "postgresql":
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+        else:
+            prefix = "EXPLAIN QUERY PLAN "
+        try:
+            with engine.connect().execution_options(**{_SKIP_OPTION: True}) as conn:
+                rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+                conn.rollback()
+            entry.plan = "\n".join(" ".join(str(col) for col in row) for row in rows)
+        except Exception as e:
+            entry.plan_error = str(e)
+
+    # -----------------------------
+    # HELPERS
+    # -----------------------------
+    @staticmethod
+    def _redact(parameters: Any) -> Any:
+        if isinstance(parameters, dict):
+            return {key: REDACTED for key in parameters}
+        if isinstance(parameters, (list, tuple)):
+            return [SlowQueryRecorder._redact(p) if isinstance(p, (dict, list, tuple)) else REDACTED
+                    for p in parameters]
+        return REDACTED
+
+    @staticmethod
+    def _find_caller() -> Optional[str]:
+        """
+        Walk up the stack to the innermost repository method.
+
+        Returns:
+            ``ClassName.method`` (or ``module.function``), or None when the
+            statement was not issued from the repositories package.
+        """
+        frame = sys._getframe(1)
+        while frame is not None:
+            if _REPOSITORIES_DIR in frame.f_code.co_filename:
+                owner = frame.f_locals.get("self")
+                prefix = type(owner).__name__ if owner is not None else frame.f_globals.get("__name__")
+                return f"{prefix}.{frame.f_code.co_name}"
+            frame = frame.f_back
+        return None
+
+    def entries(self, limit: Optional[int] = None) -> List[SlowQuery]:
+        """
+        Return recorded slow queries, most recent first.
+
+        Args:
+            limit: Maximum number of entries to return (optional).
+
+        Returns:
+            A list of SlowQuery entries.
+
+        Raises:
+            ValueError: If ``limit`` is negative.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative.")
+        with self._lock:
+            items = list(reversed(self._entries))
+        return items[:limit] if limit is not None else items
+
+    def clear(self) -> None:
+        """Drop all recorded entries."""
+        with self._lock:
+            self._entries.clear()
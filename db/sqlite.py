@@ -0,0 +1,95 @@
+import threading
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+
+_LOCK_KEY: str = "sqlite_write_lock"
+
+
+def apply_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """
+    Apply PRAGMA settings to every new connection of a SQLite engine.
+
+    ``journal_mode`` is persistent in the database file and is skipped for
+    in-memory databases.
+
+    Args:
+        engine: A SQLite engine.
+        pragmas: PRAGMA name to value, e.g. ``{"journal_mode": "WAL"}``.
+    """
+    in_memory = engine.url.database in (None, "", ":memory:")
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                if name == "journal_mode" and in_memory:
+                    continue
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+class SQLiteWriteLock:
+    """
+    Process-wide single-writer queue for SQLite.
+
+    SQLite allows one writer at a time; concurrent writers otherwise spin on
+    ``busy_timeout`` and eventually fail with ``database is locked``. A
+    session takes the lock on its first write (flush or bulk UPDATE/DELETE)
+    and holds it until the transaction ends, so writers of this process
+    queue in order. ``busy_timeout`` still covers writers in other
+    processes (e.g. the scheduler).
+    """
+
+    def __init__(self, timeout: float = 30.0) -> None:
+        """
+        Args:
+            timeout: Seconds a session waits for the lock before failing.
+        """
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.timeouts = 0
+
+    def install(self, session_factory: sessionmaker) -> None:
+        """
+        Register the session listeners on a sessionmaker.
+        """
+        event.listen(session_factory, "before_flush", self._before_flush)
+        event.listen(session_factory, "do_orm_execute", self._before_bulk_write)
+        event.listen(session_factory, "after_transaction_end", self._after_transaction_end)
+        event.listen(session_factory, "after_rollback", self._release)
+
+    def _acquire(self, session: Session) -> None:
+        if session.info.get(_LOCK_KEY):
+            return
+        if not self._lock.acquire(timeout=self.timeout):
+            self.timeouts += 1
+            raise OperationalError(
+                "SQLite write lock", None, Exception(f"waited more than {self.timeout}s for the write lock")
+            )
+        self.acquisitions += 1
+        session.info[_LOCK_KEY] = True
+
+    def _before_flush(self, session: Session, flush_context, instances) -> None:
+        self._acquire(session)
+
+    def _before_bulk_write(self, orm_execute_state: ORMExecuteState) -> None:
+        if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+            self._acquire(orm_execute_state.session)
+
+    def _after_transaction_end(self, session: Session, transaction) -> None:
+        # Commit, rollback or close of the outermost transaction
+        if transaction.parent is None:
+            self._release(session)
+
+    def _release(self, session: Session) -> None:
+        # Also called on the database rollback of a failed flush, which leaves
+        # the session's transaction open until the caller rolls it back
+        if session.info.pop(_LOCK_KEY, False):
+            self._lock.release()
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+ORIGIN: str = uuid.uuid4().hex[:8]
+"""
+Identifier of this process, used to tell local events from bridged ones.
+"""
+
+
+def new_event_id() -> str:
+    """
+    Generate a sortable event ID (nanosecond timestamp plus process origin).
+    """
+    return f"{time.time_ns():020d}-{ORIGIN}"
+
+
+@dataclass
+class ChangeEvent:
+    """
+    A change to a project or one of its tasks.
+
+    Attributes:
+        type: Event type, e.g. ``task.created`` or ``project.deleted``.
+        project_id: Project the change belongs to.
+        data: Snapshot of the changed entity.
+        id: Sortable event ID, used for Last-Event-ID resume.
+        origin: Process that produced the event.
+    """
+    type: str
+    project_id: str
+    data: Dict[str, Any]
+    id: str = field(default_factory=new_event_id)
+    origin: str = ORIGIN
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"id": self.id, "type": self.type, "project_id": self.project_id, "data": self.data, "origin": self.origin},
+            default=str
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "ChangeEvent":
+        return cls(**json.loads(raw))
+
+    def to_sse(self) -> str:
+        """
+        Format the event as a server-sent-events message.
+        """
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+
+class Subscription:
+    """
+    A subscriber to one project's events, with a bounded queue.
+
+    When the subscriber falls ``max_queue`` events behind, its queue is
+    closed (a ``None`` sentinel is delivered); the client is expected to
+    reconnect with Last-Event-ID and catch up from the broker's history.
+    """
+
+    def __init__(self, project_id: str, loop: asyncio.AbstractEventLoop, max_queue: int) -> None:
+        self.project_id = project_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue + 1)
+        self.max_queue = max_queue
+        self.closed = False
+
+    def offer(self, event: ChangeEvent) -> None:
+        """
+        Hand an event to the subscriber (safe to call from any thread).
+        """
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: ChangeEvent) -> None:
+        if self.closed:
+            return
+        if self.queue.qsize() >= self.max_queue:
+            self.closed = True
+            self.queue.put_nowait(None)
+            return
+        self.queue.put_nowait(event)
+
+
+class EventBroker:
+    """
+    In-process fan-out of change events to per-project subscribers.
+
+    A short per-project history is kept so reconnecting clients can resume
+    from their Last-Event-ID. An optional bridge forwards locally produced
+    events to other worker processes.
+    """
+
+    def __init__(self, history_size: int = 500, queue_size: int = 100) -> None:
+        """
+        Initialize the EventBroker.
+
+        Args:
+            history_size: Events kept per project for resume.
+            queue_size: Maximum backlog per subscriber before it is dropped.
+        """
+        self.history_size = history_size
+        self.queue_size = queue_size
+        self.bridge: Optional[Any] = None
+        self._history: Dict[str, Deque[ChangeEvent]] = {}
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._listeners: List[Callable[[ChangeEvent], None]] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: Callable[[ChangeEvent], None]) -> None:
+        """
+        Call ``listener`` for every event, whatever its project.
+        """
+        self._listeners.append(listener)
+
+    def publish(self, event: ChangeEvent) -> None:
+        """
+        Deliver an event to local subscribers and forward it to the bridge.
+
+        Args:
+            event: The event to publish.
+        """
+        with self._lock:
+            history = self._history.setdefault(event.project_id, deque(maxlen=self.history_size))
+            history.append(event)
+            subscribers = list(self._subscribers.get(event.project_id, ()))
+
+        for subscription in subscribers:
+            subscription.offer(event)
+        for listener in self._listeners:
+            listener(event)
+
+        if self.bridge is not None and event.origin == ORIGIN:
+            self.bridge.forward(event)
+
+    def receive_remote(self, event: ChangeEvent) -> None:
+        """
+        Publish an event received from another worker through the bridge.
+        """
+        if event.origin != ORIGIN:
+            self.publish(event)
+
+    def subscribe(self, project_id: str, last_event_id: Optional[str] = None) -> Tuple[Subscription, List[ChangeEvent]]:
+        """
+        Register a subscriber on the running event loop.
+
+        Args:
+            project_id: Project whose events are wanted.
+            last_event_id: Last event the client has seen, if resuming.
+
+        Returns:
+            The subscription and the history events missed since ``last_event_id``.
+        """
+        subscription = Subscription(project_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(project_id, set()).add(subscription)
+            history = list(self._history.get(project_id, ()))
+        missed = [e for e in history if e.id > last_event_id] if last_event_id else []
+        return subscription, missed
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.project_id]
+
+
+event_broker: EventBroker = EventBroker(
+    history_size=int(os.getenv("EVENTS_HISTORY_SIZE", 500)),
+    queue_size=int(os.getenv("EVENTS_QUEUE_SIZE", 100))
+)
+"""
+Process-wide broker for project and task change events.
+"""
@@ -0,0 +1,102 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from events.broker import ChangeEvent, event_broker
+from models.outbox import OutboxEvent
+
+OUTBOX_ENABLED: bool = os.getenv("OUTBOX_ENABLED", "false").lower() == "true"
+
+_PENDING_KEY: str = "pending_changes"
+_READY_KEY: str = "ready_changes"
+
+
+def snapshot(obj: Any) -> Dict[str, Any]:
+    """
+    Copy the column values of an ORM instance into a plain dict.
+
+    Args:
+        obj: A mapped instance (Task, Project).
+
+    Returns:
+        Column name to value mapping.
+    """
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def _project_id_of(data: Dict[str, Any]) -> str:
+    return data.get("project_id") or data["id"]
+
+
+def record_change(session: Optional[Session], event_type: str, obj: Any) -> None:
+    """
+    Record a change to be published once the session commits.
+
+    The entity is snapshotted at commit time (after flush, so generated IDs
+    are available), except for deletions, which are snapshotted right away.
+    With OUTBOX_ENABLED the event is also written to the outbox table as
+    part of the same transaction. Without a session the event is published
+    immediately.
+
+    Args:
+        session: Session the change is made in.
+        event_type: Event type, e.g. ``task.updated``.
+        obj: The changed Task or Project.
+    """
+    if session is None:
+        data = snapshot(obj)
+        event_broker.publish(ChangeEvent(type=event_type, project_id=_project_id_of(data), data=data))
+        return
+
+    eager = snapshot(obj) if event_type.endswith((".deleted", ".archived")) else None
+    session.info.setdefault(_PENDING_KEY, []).append((event_type, obj, eager))
+
+
+def publish_pending(session: Any) -> None:
+    """
+    Publish the changes recorded on a session-like object right away.
+
+    Used by the in-memory repositories, which have no transaction to hook
+    into (and no outbox table).
+
+    Args:
+        session: Object whose ``info`` dict received ``record_change`` calls.
+    """
+    for event_type, obj, eager in session.info.pop(_PENDING_KEY, ()):
+        data = eager if eager is not None else snapshot(obj)
+        event_broker.publish(ChangeEvent(type=event_type, project_id=_project_id_of(data), data=data))
+
+
+@event.listens_for(Session, "before_commit")
+def _materialize_changes(session: Session) -> None:
+    pending: List[Tuple[str, Any, Optional[Dict[str, Any]]]] = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    session.flush()
+    ready = session.info.setdefault(_READY_KEY, [])
+    for event_type, obj, eager in pending:
+        data = eager if eager is not None else snapshot(obj)
+        change = ChangeEvent(type=event_type, project_id=_project_id_of(data), data=data)
+        ready.append(change)
+        if OUTBOX_ENABLED:
+            session.add(OutboxEvent(
+                event_id=change.id,
+                event_type=change.type,
+                project_id=change.project_id,
+                payload=json.dumps(change.data, default=str)
+            ))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session) -> None:
+    for change in session.info.pop(_READY_KEY, ()):
+        event_broker.publish(change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_READY_KEY, None)
@@ -0,0 +1,93 @@
+import logging
+import select
+import threading
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+
+from events.broker import ChangeEvent, EventBroker
+
+logger = logging.getLogger(__name__)
+
+CHANNEL: str = "todolist_events"
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD_BYTES: int = 7900
+
+
+class PostgresNotifyBridge:
+    """
+    Relay change events between worker processes with LISTEN/NOTIFY.
+
+    Locally produced events are sent with ``pg_notify``; notifications from
+    other workers are handed to the broker. Events whose payload does not fit
+    into a notification are forwarded without their entity snapshot.
+    """
+
+    def __init__(self, broker: EventBroker, database_url: str, channel: str = CHANNEL) -> None:
+        """
+        Initialize the bridge.
+
+        Args:
+            broker: The local event broker.
+            database_url: SQLAlchemy URL of the PostgreSQL database.
+            channel: Notification channel name.
+        """
+        self.broker = broker
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self._notify_conn = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _connect(self):
+        import psycopg2
+
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def start(self) -> None:
+        """
+        Attach to the broker and start listening on a daemon thread.
+        """
+        self.broker.bridge = self
+        self._thread = threading.Thread(target=self._listen_forever, name="pg-event-bridge", daemon=True)
+        self._thread.start()
+
+    def forward(self, event: ChangeEvent) -> None:
+        """
+        Send a local event to the other workers.
+
+        Args:
+            event: Event produced in this process.
+        """
+        payload = event.to_json()
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            data = {"id": event.data.get("id"), "truncated": True}
+            payload = ChangeEvent(type=event.type, project_id=event.project_id, data=data, id=event.id).to_json()
+        try:
+            with self._lock:
+                if self._notify_conn is None or self._notify_conn.closed:
+                    self._notify_conn = self._connect()
+                with self._notify_conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+        except Exception as e:
+            logger.warning("Could not forward event %s: %s", event.id, e)
+            self._notify_conn = None
+
+    def _listen_forever(self) -> None:
+        while True:
+            try:
+                conn = self._connect()
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                while True:
+                    if select.select([conn], [], [], 30.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self.broker.receive_remote(ChangeEvent.from_json(notify.payload))
+            except Exception as e:
+                logger.warning("Event bridge connection lost, reconnecting: %s", e)
+                threading.Event().wait(5.0)
@@ -0,0 +1,5 @@
+# exceptions/repository_exceptions.py
+
+class StaleVersionError(Exception):
+    """Raised when a row was changed by another transaction since it was loaded."""
+    pass
@@ -7,3 +7,43 @@ class TaskLimitReachedError(Exception):
 class ProjectLimitReachedError(Exception):
     """Raised when the maximum number of projects is exceeded."""
     pass
+
+class WebhookNotFoundError(Exception):
+    """Raised when a webhook subscription does not exist."""
+    pass
+
+class ArchivedTaskNotFoundError(Exception):
+    """Raised when a task is not in the archive."""
+    pass
+
+class InvalidIdempotencyKeyError(Exception):
+    """Raised when an Idempotency-Key header is empty or too long."""
+    pass
+
+class IdempotencyKeyInProgressError(Exception):
+    """Raised when a request with the same Idempotency-Key is still running or never finished."""
+    pass
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when an Idempotency-Key is reused for a different request."""
+    pass
+
+class VersionConflictError(Exception):
+    """Raised when an update targets an outdated version of a task or project."""
+    pass
+
+class JobNotFoundError(Exception):
+    """Raised when a background job does not exist."""
+    pass
+
+class BatchTooLargeError(Exception):
+    """Raised when a request asks for more items than allowed in one batch."""
+    pass
+
+class InvalidRecurrenceError(Exception):
+    """Raised when a task's recurrence rule cannot be parsed."""
+    pass
+
+class InvalidTaskMoveError(Exception):
+    """Raised when a task cannot be placed after the given task."""
+    pass
@@ -1,16 +1,115 @@
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from api.routers import api_router
+from api.middlewares.profiling import ProfilingMiddleware
+from api.middlewares.admission import AdmissionControlMiddleware
+from api.middlewares.compression import ResponseEncodingMiddleware
+from api.responses import DefaultJSONResponse
+from api.threadpool import configure_threadpool
 from cli.console import TaskCLI
 from services.project_service import ProjectService
 from services.task_service import TaskService
-from db.session import SessionLocal
-from repositories.project_repository import ProjectRepository
-from repositories.task_repository import TaskRepository
+from db.session import SessionLocal, DATABASE_URL, DB_POOL_CAPACITY
+from events.broker import event_broker
+from events.pg_bridge import PostgresNotifyBridge
+from commands.scheduler import build_job_runner
+from commands.job_worker import JobWorker
+from repositories.factory import (
+    REPOSITORY_BACKEND,
+    create_project_repository,
+    create_task_repository,
+    ensure_sql_tables
+)
 
 
-app = FastAPI(title="ToDoList API", version="1.0")
+PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_TOKEN: str | None = os.getenv("PROFILE_TOKEN")
+EVENTS_PG_BRIDGE: bool = os.getenv("EVENTS_PG_BRIDGE", "false").lower() == "true"
+SCHEDULER_IN_PROCESS: bool = os.getenv("SCHEDULER_IN_PROCESS", "false").lower() == "true"
+JOB_WORKER_IN_PROCESS: bool = os.getenv("JOB_WORKER_IN_PROCESS", "false").lower() == "true"
+THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE") or DB_POOL_CAPACITY)
+ADMISSION_CONTROL_ENABLED: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "false").lower() == "true"
+ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY") or DB_POOL_CAPACITY)
+ADMISSION_MAX_WAIT_SECONDS: float = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", 0.5))
+ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", 100))
+RATE_LIMIT_PER_SECOND: float = float(os.getenv("RATE_LIMIT_PER_SECOND", 0))
+RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", 0))
+RATE_LIMIT_API_KEYS: list[str] = [k.strip() for k in os.getenv("RATE_LIMIT_API_KEYS", "").split(",") if k.strip()]
+COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+MSGPACK_ENABLED: bool = os.getenv("MSGPACK_ENABLED", "true").lower() == "true"
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Start and stop background components of the API process.
+    """
+    # Sync endpoints hold a thread while they wait for a connection: more
+    # threads than connections only moves the queue into the pool
+    configure_threadpool(THREADPOOL_SIZE)
+
+    if REPOSITORY_BACKEND == "memory":
+        ensure_sql_tables()
+
+    if EVENTS_PG_BRIDGE:
+        PostgresNotifyBridge(event_broker, DATABASE_URL).start()
+
+    app.state.job_runner = None
+    if SCHEDULER_IN_PROCESS:
+        app.state.job_runner = build_job_runner()
+        app.state.job_runner.start()
+
+    app.state.job_worker = None
+    if JOB_WORKER_IN_PROCESS:
+        app.state.job_worker = JobWorker()
+        app.state.job_worker.start()
+    yield
+    if app.state.job_runner is not None:
+        await app.state.job_runner.stop()
+    if app.state.job_worker is not None:
+        await run_in_threadpool(app.state.job_worker.stop)
+
+
+app = FastAPI(
+    title="ToDoList API",
+    version="1.0",
+    lifespan=lifespan,
+    default_response_class=DefaultJSONResponse
+)
+
+# Content negotiation: gzip/brotli above a size threshold, MessagePack via Accept
+if COMPRESSION_ENABLED or MSGPACK_ENABLED:
+    app.add_middleware(
+        ResponseEncodingMiddleware,
+        minimum_size=COMPRESSION_MIN_SIZE,
+        gzip_level=COMPRESSION_GZIP_LEVEL,
+        brotli_quality=COMPRESSION_BROTLI_QUALITY,
+        compression=COMPRESSION_ENABLED,
+        allow_msgpack=MSGPACK_ENABLED
+    )
+
+# Per-request profiling, triggered by a matching X-Profile header
+if PROFILING_ENABLED and PROFILE_TOKEN:
+    app.add_middleware(ProfilingMiddleware, token=PROFILE_TOKEN)
+
+# Admission control: per-client rate limits and a concurrency cap sized to the DB pool
+if ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        max_concurrency=ADMISSION_MAX_CONCURRENCY,
+        rate=RATE_LIMIT_PER_SECOND,
+        burst=RATE_LIMIT_BURST,
+        api_keys=RATE_LIMIT_API_KEYS,
+        max_wait=ADMISSION_MAX_WAIT_SECONDS,
+        max_queue=ADMISSION_MAX_QUEUE
+    )
+
 # Register API routers
 app.include_router(api_router)
 
@@ -22,10 +121,10 @@ def run_cli() -> None:
     repositories, and handles user input for all CLI actions.
     """
     db_session = SessionLocal()
-    project_repo = ProjectRepository(db_session)
-    task_repo = TaskRepository(db_session)
+    project_repo = create_project_repository(db_session)
+    task_repo = create_task_repository(db_session)
 
-    project_service = ProjectService(db_session=db_session)
+    project_service = ProjectService(project_repo=project_repo)
     task_service = TaskService(task_repo=task_repo, project_repo=project_repo)
 
     cli = TaskCLI(project_service, task_service)
@@ -0,0 +1,33 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Integer, DateTime
+from db.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    SQLAlchemy model for a client-supplied Idempotency-Key and the response
+    of the request that first used it.
+
+    A row is inserted before the request runs (reserving the key) and
+    completed with the response afterwards, so retries and concurrent
+    duplicates never repeat the write.
+
+    Attributes:
+        key: The Idempotency-Key header value.
+        fingerprint: SHA-256 of the method, path and body of the first request.
+        status_code: Status of the stored response (None while the first request is running).
+        response_body: The stored JSON response body.
+        created_at: When the key was reserved.
+        expires_at: When the key may be forgotten.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key: str = Column(String(255), primary_key=True)
+    fingerprint: str = Column(String(64), nullable=False)
+    status_code: int | None = Column(Integer, nullable=True)
+    response_body: str | None = Column(Text, nullable=True)
+    created_at: datetime = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at: datetime = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey key={self.key} status={self.status_code}>"
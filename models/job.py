@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index
+from db.base import Base
+
+
+class BackgroundJob(Base):
+    """
+    SQLAlchemy model for a long-running operation queued for the job workers.
+
+    Attributes:
+        id: Unique identifier for the job (first 6 chars of UUID4 by default).
+        kind: Handler to run, e.g. 'project.delete' or 'tasks.import'.
+        payload: JSON arguments of the handler.
+        status: One of: queued, running, succeeded, failed.
+        progress: Units of work done so far.
+        total: Units of work in total, when known.
+        result: JSON result of a succeeded job.
+        error: Error message of a failed job.
+        attempts: How many times a worker claimed the job.
+        worker: Worker currently (or last) running the job.
+        created_at: When the job was queued.
+        started_at: When the current attempt started.
+        heartbeat_at: Last sign of life of the running worker.
+        finished_at: When the job succeeded or failed.
+    """
+    __tablename__ = "jobs"
+
+    id: str = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4())[:6])
+    kind: str = Column(String(50), nullable=False)
+    payload: str = Column(Text, nullable=False, default="{}")
+    status: str = Column(String(20), nullable=False, default="queued")
+    progress: int = Column(Integer, nullable=False, default=0)
+    total: int | None = Column(Integer, nullable=True)
+    result: str | None = Column(Text, nullable=True)
+    error: str | None = Column(Text, nullable=True)
+    attempts: int = Column(Integer, nullable=False, default=0)
+    worker: str | None = Column(String(100), nullable=True)
+    created_at: datetime = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at: datetime | None = Column(DateTime, nullable=True)
+    heartbeat_at: datetime | None = Column(DateTime, nullable=True)
+    finished_at: datetime | None = Column(DateTime, nullable=True)
+
+    # Workers claim the oldest queued job
+    __table_args__ = (Index("ix_jobs_status_created_at", "status", "created_at"),)
+
+    def __repr__(self) -> str:
+        return f"<BackgroundJob id={self.id} kind={self.kind} status={self.status}>"
@@ -0,0 +1,63 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Integer, DateTime, Boolean
+from db.base import Base
+
+
+class OutboxEvent(Base):
+    """
+    SQLAlchemy model for a change event waiting in the transactional outbox.
+
+    Rows are written in the same transaction as the change they describe
+    and drained by the webhook delivery worker.
+
+    Attributes:
+        id: Monotonic sequence number, used as the delivery cursor.
+        event_id: ID of the change event (same as in the SSE feed).
+        event_type: Event type, e.g. 'task.created'.
+        project_id: Project the change belongs to.
+        payload: JSON snapshot of the changed entity.
+        created_at: When the change was committed.
+    """
+    __tablename__ = "outbox_events"
+
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    event_id: str = Column(String(40), nullable=False)
+    event_type: str = Column(String(50), nullable=False)
+    project_id: str = Column(String(36), nullable=False)
+    payload: str = Column(Text, nullable=False)
+    created_at: datetime = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent id={self.id} type={self.event_type}>"
+
+
+class WebhookSubscription(Base):
+    """
+    SQLAlchemy model for a webhook receiving outbox events.
+
+    Attributes:
+        id: Unique identifier for the subscription (first 6 chars of UUID4 by default).
+        url: Endpoint the event batches are POSTed to.
+        project_id: Only deliver events of this project (all projects if empty).
+        event_types: Comma-separated event types to deliver (all if empty).
+        secret: Optional key used to sign deliveries (HMAC-SHA256).
+        last_event_id: Outbox cursor: last event handled for this subscriber.
+        failure_count: Consecutive failed deliveries.
+        next_attempt_at: Earliest time of the next attempt while backing off.
+        active: Whether the subscription receives events.
+    """
+    __tablename__ = "webhook_subscriptions"
+
+    id: str = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4())[:6])
+    url: str = Column(String(500), nullable=False)
+    project_id: str | None = Column(String(36), nullable=True)
+    event_types: str | None = Column(String(200), nullable=True)
+    secret: str | None = Column(String(100), nullable=True)
+    last_event_id: int = Column(Integer, nullable=False, default=0)
+    failure_count: int = Column(Integer, nullable=False, default=0)
+    next_attempt_at: datetime | None = Column(DateTime, nullable=True)
+    active: bool = Column(Boolean, nullable=False, default=True)
+
+    def __repr__(self) -> str:
+        return f"<WebhookSubscription id={self.id} url={self.url}>"
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, String, Text, Integer
 from sqlalchemy.orm import relationship
 from db.base import Base
 
@@ -19,13 +19,16 @@ class Project(Base):
         id: Unique identifier for the project (first 6 chars of UUID4 by default).
         name: Name of the project.
         description: Optional description of the project.
+        version: Row version, incremented on every UPDATE (optimistic locking).
         tasks: One-to-many relationship with Task entity.
+        archived_tasks: One-to-many relationship with archived tasks.
     """
     __tablename__ = "projects"
 
     id: str = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4())[:6])
     name: str = Column(String(100), nullable=False)
     description: str | None = Column(Text, nullable=True)
+    version: int = Column(Integer, nullable=False, default=1, server_default="1")
 
     tasks = relationship(
         "Task",
@@ -33,5 +36,14 @@ class Project(Base):
         cascade="all, delete-orphan"
     )
 
+    archived_tasks = relationship(
+        "ArchivedTask",
+        back_populates="project",
+        cascade="all, delete-orphan"
+    )
+
+    # UPDATEs check and bump the version; a concurrent change raises StaleDataError
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self) -> str:
         return f"<Project id={self.id} name={self.name}>"
@@ -1,6 +1,7 @@
 import uuid
-from sqlalchemy import Column, String, Text, ForeignKey, Date
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from sqlalchemy import Column, String, Text, ForeignKey, Date, DateTime, Integer, Index
+from sqlalchemy.orm import relationship, validates
 from db.base import Base
 
 
@@ -14,19 +15,96 @@ class Task(Base):
         description: Optional description of the task.
         status: Task status, default is 'todo'.
         deadline: Optional deadline date for the task.
+        completed_at: When the task was marked as done (None while open).
+        version: Row version, incremented on every UPDATE (optimistic locking).
+        recurrence: Repeat rule of a recurring task (see services.recurrence).
+        series_id: ID of the first occurrence of a recurring task, shared by all its occurrences.
+        position: Sort key of the task within its project (see db.positions).
         project_id: Foreign key referencing the related project.
         project: Relationship to the Project entity.
     """
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Latest occurrence of a series: the last entry of its index range
+        Index("ix_tasks_series_id_deadline", "series_id", "deadline"),
+        # Ordered listing of a project (and every other lookup by project)
+        Index("ix_tasks_project_id_position", "project_id", "position"),
+    )
 
     id: str = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4())[:6])
     title: str = Column(String(100), nullable=False)
     description: str | None = Column(Text, nullable=True)
     status: str = Column(String(20), nullable=False, default="todo")
-    deadline: Date | None = Column(Date, nullable=True)
+    deadline: Date | None = Column(Date, nullable=True, index=True)
+    completed_at: datetime | None = Column(DateTime, nullable=True, index=True)
+    version: int = Column(Integer, nullable=False, default=1, server_default="1")
+    recurrence: str | None = Column(String(200), nullable=True)
+    series_id: str | None = Column(String(36), nullable=True)
+    position: str = Column(String(100), nullable=False)
 
     project_id: str = Column(String(36), ForeignKey("projects.id"), nullable=False)
     project = relationship("Project", back_populates="tasks")
 
+    archived: bool = False
+
+    # UPDATEs check and bump the version; a concurrent change raises StaleDataError
+    __mapper_args__ = {"version_id_col": version}
+
+    @validates("status")
+    def _track_completion(self, key: str, status: str) -> str:
+        """
+        Stamp ``completed_at`` when the task becomes done, clear it when reopened.
+        """
+        if status == "done" and self.status != "done":
+            self.completed_at = datetime.utcnow()
+        elif status != "done":
+            self.completed_at = None
+        return status
+
     def __repr__(self) -> str:
         return f"<Task id={self.id} title={self.title}>"
+
+
+class ArchivedTask(Base):
+    """
+    SQLAlchemy model for a done task moved out of the hot ``tasks`` table.
+
+    The archival job moves tasks completed longer ago than the retention
+    period here, keeping ``tasks`` (and its indexes) small; a task can be
+    restored on demand.
+
+    Attributes:
+        id: Identifier the task had in ``tasks``.
+        title: Title of the task.
+        description: Optional description of the task.
+        status: Task status at archival time (always 'done').
+        deadline: Optional deadline date for the task.
+        completed_at: When the task was marked as done.
+        archived_at: When the task was moved to the archive.
+        version: Row version the task had when archived.
+        recurrence: Repeat rule the task had.
+        series_id: Series the task belonged to.
+        position: Sort key the task had (None for tasks archived before ordering existed).
+        project_id: Foreign key referencing the related project.
+    """
+    __tablename__ = "tasks_archive"
+
+    id: str = Column(String(36), primary_key=True)
+    title: str = Column(String(100), nullable=False)
+    description: str | None = Column(Text, nullable=True)
+    status: str = Column(String(20), nullable=False)
+    deadline: Date | None = Column(Date, nullable=True)
+    completed_at: datetime | None = Column(DateTime, nullable=True)
+    archived_at: datetime = Column(DateTime, nullable=False, default=datetime.utcnow)
+    version: int = Column(Integer, nullable=False, default=1, server_default="1")
+    recurrence: str | None = Column(String(200), nullable=True)
+    series_id: str | None = Column(String(36), nullable=True)
+    position: str | None = Column(String(100), nullable=True)
+
+    project_id: str = Column(String(36), ForeignKey("projects.id"), nullable=False, index=True)
+    project = relationship("Project", back_populates="archived_tasks")
+
+    archived: bool = True
+
+    def __repr__(self) -> str:
+        return f"<ArchivedTask id={self.id} title={self.title}>"
@@ -0,0 +1,73 @@
+import os
+from typing import List, Optional, Union
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from db.session import SessionLocal, engine
+from events.changes import OUTBOX_ENABLED
+from models.idempotency import IdempotencyKey
+from models.job import BackgroundJob
+from models.outbox import OutboxEvent, WebhookSubscription
+from repositories.memory import InMemoryProjectRepository, InMemoryTaskRepository
+from repositories.project_repository import ProjectRepository
+from repositories.task_repository import TaskRepository
+
+REPOSITORY_BACKEND: str = os.getenv("REPOSITORY_BACKEND", "sql").lower()
+
+
+def create_project_repository(
+    db_session: Optional[Session] = None
+) -> Union[ProjectRepository, InMemoryProjectRepository]:
+    """
+    Create the project repository of the configured backend.
+
+    Args:
+        db_session: Session for the SQL backend (a new one if omitted; ignored in memory).
+
+    Returns:
+        A ProjectRepository, or an InMemoryProjectRepository when REPOSITORY_BACKEND=memory.
+    """
+    if REPOSITORY_BACKEND == "memory":
+        return InMemoryProjectRepository()
+    return ProjectRepository(db_session or SessionLocal())
+
+
+def create_task_repository(
+    db_session: Optional[Session] = None
+) -> Union[TaskRepository, InMemoryTaskRepository]:
+    """
+    Create the task repository of the configured backend.
+
+    Args:
+        db_session: Session for the SQL backend (a new one if omitted; ignored in memory).
+
+    Returns:
+        A TaskRepository, or an InMemoryTaskRepository when REPOSITORY_BACKEND=memory.
+    """
+    if REPOSITORY_BACKEND == "memory":
+        return InMemoryTaskRepository()
+    return TaskRepository(db_session or SessionLocal())
+
+
+def ensure_sql_tables() -> None:
+    """
+    Fail fast when tables needed by every backend are missing.
+
+    The memory backend only keeps projects and tasks: Idempotency-Key
+    responses, background jobs and (with OUTBOX_ENABLED) the outbox still
+    live in DATABASE_URL, so it must point to a migrated database.
+
+    Raises:
+        RuntimeError: If a table is missing.
+    """
+    models: List[type] = [IdempotencyKey, BackgroundJob]
+    if OUTBOX_ENABLED:
+        models += [OutboxEvent, WebhookSubscription]
+    existing = set(inspect(engine).get_table_names())
+    missing = [model.__tablename__ for model in models if model.__tablename__ not in existing]
+    if missing:
+        raise RuntimeError(
+            f"REPOSITORY_BACKEND={REPOSITORY_BACKEND} still needs the SQL tables {', '.join(missing)} "
+            f"in DATABASE_URL; run 'alembic upgrade head'."
+        )
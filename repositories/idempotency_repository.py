@@ -0,0 +1,95 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models.idempotency import IdempotencyKey
+
+
+class IdempotencyRepository:
+    """
+    Repository class for stored Idempotency-Key responses.
+    """
+
+    def __init__(self, db_session: Session) -> None:
+        """
+        Initialize IdempotencyRepository.
+
+        Args:
+            db_session: SQLAlchemy database session.
+        """
+        self.db_session = db_session
+
+    def get_key(self, key: str) -> Optional[IdempotencyKey]:
+        """
+        Retrieve a stored key.
+
+        Args:
+            key: The Idempotency-Key value.
+
+        Returns:
+            The matching IdempotencyKey, or None if not found.
+        """
+        return self.db_session.scalars(select(IdempotencyKey).where(IdempotencyKey.key == key)).first()
+
+    def reserve_key(self, record: IdempotencyKey) -> bool:
+        """
+        Insert a key without a response yet.
+
+        Args:
+            record: The IdempotencyKey to insert.
+
+        Returns:
+            True if the key was reserved, False if it already exists.
+        """
+        self.db_session.add(record)
+        try:
+            self.db_session.commit()
+        except IntegrityError:
+            self.db_session.rollback()
+            return False
+        return True
+
+    def complete_key(self, record: IdempotencyKey, status_code: int, response_body: str) -> IdempotencyKey:
+        """
+        Store the response of a reserved key.
+
+        Args:
+            record: The reserved IdempotencyKey.
+            status_code: HTTP status of the response.
+            response_body: The JSON response body.
+
+        Returns:
+            The completed IdempotencyKey.
+        """
+        record.status_code = status_code
+        record.response_body = response_body
+        self.db_session.commit()
+        return record
+
+    def delete_key(self, record: IdempotencyKey) -> None:
+        """
+        Delete a key (e.g. release a reservation after a failed request).
+
+        Args:
+            record: The IdempotencyKey to remove.
+        """
+        self.db_session.delete(record)
+        self.db_session.commit()
+
+    def prune_expired(self, now: datetime) -> int:
+        """
+        Delete keys past their expiry.
+
+        Args:
+            now: Current time.
+
+        Returns:
+            The number of deleted keys.
+        """
+        result = self.db_session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at < now),
+            execution_options={"synchronize_session": False}
+        )
+        self.db_session.commit()
+        return result.rowcount
@@ -0,0 +1,172 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+from models.job import BackgroundJob
+
+
+class JobRepository:
+    """
+    Repository class for the background job queue.
+    """
+
+    def __init__(self, db_session: Session) -> None:
+        """
+        Initialize JobRepository.
+
+        Args:
+            db_session: SQLAlchemy database session.
+        """
+        self.db_session = db_session
+
+    def create_job(self, job: BackgroundJob) -> BackgroundJob:
+        """
+        Queue a new job.
+
+        Args:
+            job: The BackgroundJob to insert.
+
+        Returns:
+            The created BackgroundJob instance.
+        """
+        self.db_session.add(job)
+        self.db_session.commit()
+        self.db_session.refresh(job)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[BackgroundJob]:
+        """
+        Retrieve a job by its ID.
+
+        Args:
+            job_id: Job identifier.
+
+        Returns:
+            The matching BackgroundJob, or None if not found.
+        """
+        return self.db_session.scalars(select(BackgroundJob).where(BackgroundJob.id == job_id)).first()
+
+    def get_queued_job(self, kind: str, payload: str) -> Optional[BackgroundJob]:
+        """
+        Retrieve a job that is still waiting for a worker.
+
+        Args:
+            kind: Job kind.
+            payload: JSON arguments of the job, as stored.
+
+        Returns:
+            The oldest matching queued BackgroundJob, or None.
+        """
+        stmt = (
+            select(BackgroundJob)
+            .where(BackgroundJob.status == "queued", BackgroundJob.kind == kind, BackgroundJob.payload == payload)
+            .order_by(BackgroundJob.created_at)
+            .limit(1)
+        )
+        return self.db_session.scalars(stmt).first()
+
+    def claim_next(self, worker: str, now: datetime) -> Optional[BackgroundJob]:
+        """
+        Mark the oldest queued job as running for ``worker``.
+
+        On PostgreSQL the candidate is selected ``FOR UPDATE SKIP LOCKED``,
+        so concurrent workers pick different jobs without waiting on each
+        other. The UPDATE is conditional on the job still being queued,
+        which makes the claim safe where row locks do not exist (SQLite).
+
+        Args:
+            worker: Identifier of the claiming worker.
+            now: Current time.
+
+        Returns:
+            The claimed BackgroundJob, or None if the queue is empty.
+        """
+        while True:
+            job_id = self.db_session.scalars(
+                select(BackgroundJob.id)
+                .where(BackgroundJob.status == "queued")
+                .order_by(BackgroundJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).first()
+            if job_id is None:
+                self.db_session.rollback()
+                return None
+            claimed = self.db_session.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job_id, BackgroundJob.status == "queued")
+                .values(
+                    status="running",
+                    worker=worker,
+                    attempts=BackgroundJob.attempts + 1,
+                    started_at=now,
+                    heartbeat_at=now
+                ),
+                execution_options={"synchronize_session": False}
+            ).rowcount
+            self.db_session.commit()
+            if claimed:
+                return self.get_job(job_id)
+
+    def update_job(self, job: BackgroundJob) -> BackgroundJob:
+        """
+        Persist changes to a job (progress, heartbeat, outcome).
+
+        Args:
+            job: The modified BackgroundJob.
+
+        Returns:
+            The updated BackgroundJob instance.
+        """
+        self.db_session.commit()
+        return job
+
+    def requeue_stale(self, heartbeat_before: datetime, max_attempts: int, now: datetime) -> int:
+        """
+        Recover running jobs whose worker stopped sending heartbeats.
+
+        Jobs with attempts left go back to the queue; the others fail.
+
+        Args:
+            heartbeat_before: Running jobs with an older heartbeat are stale.
+            max_attempts: Attempts after which a stale job fails.
+            now: Current time.
+
+        Returns:
+            The number of recovered jobs.
+        """
+        stale = (BackgroundJob.status == "running", BackgroundJob.heartbeat_at < heartbeat_before)
+        requeued = self.db_session.execute(
+            update(BackgroundJob)
+            .where(*stale, BackgroundJob.attempts < max_attempts)
+            .values(status="queued", worker=None),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        failed = self.db_session.execute(
+            update(BackgroundJob)
+            .where(*stale)
+            .values(status="failed", error="Worker stopped responding.", finished_at=now),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        self.db_session.commit()
+        return requeued + failed
+
+    def prune_finished(self, finished_before: datetime) -> int:
+        """
+        Delete succeeded and failed jobs that finished before a cutoff.
+
+        Args:
+            finished_before: Jobs finished before this moment are deleted.
+
+        Returns:
+            The number of deleted jobs.
+        """
+        deleted = self.db_session.execute(
+            delete(BackgroundJob).where(
+                BackgroundJob.status.in_(("succeeded", "failed")),
+                BackgroundJob.finished_at < finished_before
+            ),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        self.db_session.commit()
+        return deleted
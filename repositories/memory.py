@@ -0,0 +1,394 @@
+import bisect
+import threading
+import uuid
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from db.positions import key_between
+from events.changes import publish_pending, snapshot
+from exceptions.repository_exceptions import StaleVersionError
+from models.project import Project as ProjectModel
+from models.task import Task as TaskModel, ArchivedTask
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())[:6]
+
+
+def _copy(instance):
+    """
+    Detached copy of a stored instance (None passes through).
+
+    The store never hands out its own instances, so a request editing a
+    task does not expose half-applied changes to other requests.
+    """
+    return type(instance)(**snapshot(instance)) if instance is not None else None
+
+
+class InMemoryStore:
+    """
+    Process-local storage shared by the in-memory repositories.
+
+    Attributes:
+        projects: Projects by ID, in creation order.
+        tasks: Tasks by ID.
+        tasks_by_project: Task IDs of each project, in creation order.
+        archived: Archived tasks by ID.
+        archived_by_project: Archived task IDs of each project.
+        open_deadlines: Sorted ``(deadline, task_id)`` pairs of open tasks with a deadline.
+        lock: Guards every structure above.
+
+    Repositories keep their own copies of instances here and return copies.
+    """
+
+    def __init__(self) -> None:
+        self.projects: Dict[str, ProjectModel] = {}
+        self.tasks: Dict[str, TaskModel] = {}
+        self.tasks_by_project: Dict[str, Dict[str, None]] = {}
+        self.archived: Dict[str, ArchivedTask] = {}
+        self.archived_by_project: Dict[str, Dict[str, None]] = {}
+        self.open_deadlines: List[Tuple[date, str]] = []
+        self.lock = threading.RLock()
+        self._indexed: Dict[str, Optional[Tuple[date, str]]] = {}
+
+    def clear(self) -> None:
+        """Drop all data."""
+        with self.lock:
+            self.__init__()
+
+    # -----------------------------
+    # INDEXES
+    # -----------------------------
+    def index_task(self, task: TaskModel) -> None:
+        """
+        Add or refresh a task in the per-project and deadline indexes.
+        """
+        self.tasks[task.id] = task
+        self.tasks_by_project.setdefault(task.project_id, {})[task.id] = None
+        self._drop_deadline(task.id)
+        if task.deadline is not None and task.status != "done":
+            entry = (task.deadline, task.id)
+            bisect.insort(self.open_deadlines, entry)
+            self._indexed[task.id] = entry
+
+    def unindex_task(self, task: TaskModel) -> None:
+        """
+        Remove a task from every index.
+        """
+        self._drop_deadline(task.id)
+        self.tasks.pop(task.id, None)
+        self.tasks_by_project.get(task.project_id, {}).pop(task.id, None)
+
+    def _drop_deadline(self, task_id: str) -> None:
+        entry = self._indexed.pop(task_id, None)
+        if entry is not None:
+            position = bisect.bisect_left(self.open_deadlines, entry)
+            if position < len(self.open_deadlines) and self.open_deadlines[position] == entry:
+                del self.open_deadlines[position]
+
+
+memory_store: InMemoryStore = InMemoryStore()
+"""
+Storage used by the in-memory repositories (REPOSITORY_BACKEND=memory).
+"""
+
+
+class InMemorySession:
+    """
+    Stand-in for a Session in the in-memory repositories.
+
+    Services record changes on ``info`` as with a real session; ``commit``
+    publishes them, after the repository has applied the write.
+    """
+
+    def __init__(self) -> None:
+        self.info: dict = {}
+
+    def commit(self) -> None:
+        publish_pending(self)
+
+    def close(self) -> None:
+        self.info.clear()
+
+
+class InMemoryProjectRepository:
+    """
+    Dict-backed ProjectRepository with the same interface (``fields``
+    arguments are accepted and ignored: nothing is loaded from disk).
+
+    ``db_session`` is an InMemorySession, so change events recorded by
+    the service are published once the write is applied.
+    """
+
+    def __init__(self, store: InMemoryStore = memory_store) -> None:
+        """
+        Initialize the InMemoryProjectRepository.
+
+        Args:
+            store: Storage shared with the task repository.
+        """
+        self.store = store
+        self.db_session = InMemorySession()
+
+    def create_project(self, project: ProjectModel) -> ProjectModel:
+        with self.store.lock:
+            project.id = project.id or _new_id()
+            project.version = project.version or 1
+            self.store.projects[project.id] = _copy(project)
+        self.db_session.commit()
+        return project
+
+    def get_project_by_id(self, project_id: str) -> Optional[ProjectModel]:
+        with self.store.lock:
+            return _copy(self.store.projects.get(project_id))
+
+    def list_projects(self, fields: Optional[Sequence[str]] = None) -> List[ProjectModel]:
+        with self.store.lock:
+            return [_copy(project) for project in self.store.projects.values()]
+
+    def update_project(self, project: ProjectModel) -> ProjectModel:
+        with self.store.lock:
+            stored = self.store.projects.get(project.id)
+            if stored is None or stored.version != project.version:
+                raise StaleVersionError(f"Project '{project.id}' was changed by another request.")
+            project.version += 1
+            self.store.projects[project.id] = _copy(project)
+        self.db_session.commit()
+        return project
+
+    def delete_project(self, project: ProjectModel) -> None:
+        with self.store.lock:
+            for task_id in list(self.store.tasks_by_project.pop(project.id, {})):
+                self.store.unindex_task(self.store.tasks[task_id])
+            for task_id in self.store.archived_by_project.pop(project.id, {}):
+                self.store.archived.pop(task_id, None)
+            self.store.projects.pop(project.id, None)
+        self.db_session.commit()
+
+
+class InMemoryTaskRepository:
+    """
+    Dict-backed TaskRepository with the same interface (``fields``
+    arguments are accepted and ignored).
+
+    Tasks are indexed by ID and by project, and open tasks with a deadline
+    are kept in a deadline-ordered list, so overdue queries are a bisect
+    instead of a scan. Updates check the version like the SQL repository
+    and raise StaleVersionError when the task changed since it was read.
+    """
+
+    def __init__(self, store: InMemoryStore = memory_store) -> None:
+        """
+        Initialize the InMemoryTaskRepository.
+
+        Args:
+            store: Storage shared with the project repository.
+        """
+        self.store = store
+        self.db_session = InMemorySession()
+
+    # -----------------------------
+    # CREATE
+    # -----------------------------
+    def create_task(self, task: TaskModel) -> TaskModel:
+        with self.store.lock:
+            task.id = task.id or _new_id()
+            task.status = task.status or "todo"
+            task.version = task.version or 1
+            if task.position is None:
+                task.position = key_between(self.get_last_position(task.project_id), None)
+            self.store.index_task(_copy(task))
+        self.db_session.commit()
+        return task
+
+    # -----------------------------
+    # READ
+    # -----------------------------
+    def get_task_by_id(self, task_id: str) -> Optional[TaskModel]:
+        with self.store.lock:
+            return _copy(self.store.tasks.get(task_id))
+
+    def get_tasks_by_ids(self, task_ids: List[str]) -> List[TaskModel]:
+        with self.store.lock:
+            return [_copy(self.store.tasks[task_id]) for task_id in task_ids if task_id in self.store.tasks]
+
+    def get_tasks_by_project_id(self, project_id: str, fields: Optional[Sequence[str]] = None) -> List[TaskModel]:
+        with self.store.lock:
+            tasks = [_copy(self.store.tasks[task_id]) for task_id in self.store.tasks_by_project.get(project_id, ())]
+        return sorted(tasks, key=lambda task: (task.position, task.id))
+
+    def get_last_position(self, project_id: str) -> Optional[str]:
+        with self.store.lock:
+            return max(
+                (self.store.tasks[task_id].position for task_id in self.store.tasks_by_project.get(project_id, ())),
+                default=None
+            )
+
+    def get_next_position(self, project_id: str, after: Optional[str], exclude_ids: Sequence[str]) -> Optional[str]:
+        with self.store.lock:
+            return min(
+                (
+                    task.position for task in map(self.store.tasks.get, self.store.tasks_by_project.get(project_id, ()))
+                    if task.id not in exclude_ids and (after is None or task.position >= after)
+                ),
+                default=None
+            )
+
+    def count_tasks_for_project(self, project_id: str, completed_occurrences: bool = False) -> int:
+        with self.store.lock:
+            task_ids = self.store.tasks_by_project.get(project_id, ())
+            if completed_occurrences:
+                return len(task_ids)
+            return sum(
+                1 for task in map(self.store.tasks.get, task_ids)
+                if task.series_id is None or task.status != "done"
+            )
+
+    def get_series_head(self, series_id: str, project_id: str) -> Optional[TaskModel]:
+        heads = [task for task in self.list_series_heads(project_id) if task.series_id == series_id]
+        return heads[0] if heads else None
+
+    def list_series_heads(self, project_id: str) -> List[TaskModel]:
+        heads: Dict[str, TaskModel] = {}
+        with self.store.lock:
+            for task_id in self.store.tasks_by_project.get(project_id, ()):
+                task = self.store.tasks[task_id]
+                if task.series_id is None:
+                    continue
+                head = heads.get(task.series_id)
+                if head is None or (task.deadline or date.min) >= (head.deadline or date.min):
+                    heads[task.series_id] = task
+            return [_copy(head) for head in heads.values()]
+
+    def list_all_overdue(self) -> List[TaskModel]:
+        with self.store.lock:
+            end = bisect.bisect_left(self.store.open_deadlines, (date.today(), ""))
+            return [_copy(self.store.tasks[task_id]) for _, task_id in self.store.open_deadlines[:end]]
+
+    def list_overdue_between(self, start: date, end: date) -> List[TaskModel]:
+        with self.store.lock:
+            lo = bisect.bisect_left(self.store.open_deadlines, (start, ""))
+            hi = bisect.bisect_left(self.store.open_deadlines, (end, ""))
+            return [_copy(self.store.tasks[task_id]) for _, task_id in self.store.open_deadlines[lo:hi]]
+
+    def next_open_deadline(self, from_day: date) -> Optional[date]:
+        with self.store.lock:
+            position = bisect.bisect_left(self.store.open_deadlines, (from_day, ""))
+            if position < len(self.store.open_deadlines):
+                return self.store.open_deadlines[position][0]
+            return None
+
+    # -----------------------------
+    # UPDATE
+    # -----------------------------
+    def update_task(self, task: TaskModel) -> TaskModel:
+        with self.store.lock:
+            self._check_version(task)
+            task.version += 1
+            self.store.index_task(_copy(task))
+        self.db_session.commit()
+        return task
+
+    def _check_version(self, task: TaskModel) -> None:
+        stored = self.store.tasks.get(task.id)
+        if stored is None or stored.version != task.version:
+            raise StaleVersionError(f"Task '{task.id}' was changed by another request.")
+
+    def update_task_status(self, task: TaskModel, new_status: str) -> TaskModel:
+        task.status = new_status
+        return self.update_task(task)
+
+    def update_task_position(self, task: TaskModel, position: str) -> TaskModel:
+        task.position = position
+        return self.update_task(task)
+
+    def set_positions(self, tasks: List[TaskModel], positions: Sequence[str]) -> None:
+        with self.store.lock:
+            for task in tasks:
+                self._check_version(task)
+            for task, position in zip(tasks, positions):
+                task.position = position
+                task.version += 1
+                self.store.index_task(_copy(task))
+        self.db_session.commit()
+
+    def mark_tasks_done(self, tasks: List[TaskModel]) -> None:
+        completed_at = datetime.utcnow()
+        with self.store.lock:
+            for task in tasks:
+                stored = self.store.tasks.get(task.id)
+                if stored is None:
+                    continue
+                stored.status = task.status = "done"
+                stored.completed_at = task.completed_at = completed_at
+                stored.version += 1
+                task.version = stored.version
+                self.store.index_task(stored)
+        self.db_session.commit()
+
+    # -----------------------------
+    # DELETE
+    # -----------------------------
+    def delete_task(self, task: TaskModel) -> None:
+        with self.store.lock:
+            self.store.unindex_task(task)
+        self.db_session.commit()
+
+    def delete_tasks_by_project_id(self, project_id: str, limit: int, archived: bool = False) -> int:
+        with self.store.lock:
+            if archived:
+                archived_ids = self.store.archived_by_project.get(project_id, {})
+                task_ids = list(archived_ids)[:limit]
+                for task_id in task_ids:
+                    archived_ids.pop(task_id)
+                    self.store.archived.pop(task_id, None)
+            else:
+                task_ids = list(self.store.tasks_by_project.get(project_id, {}))[:limit]
+                for task_id in task_ids:
+                    self.store.unindex_task(self.store.tasks[task_id])
+        self.db_session.commit()
+        return len(task_ids)
+
+    # -----------------------------
+    # ARCHIVE
+    # -----------------------------
+    def list_archivable(self, completed_before: datetime, limit: int) -> List[TaskModel]:
+        with self.store.lock:
+            done = [
+                task for task in self.store.tasks.values()
+                if task.status == "done" and task.completed_at is not None and task.completed_at < completed_before
+            ]
+        return sorted(done, key=lambda task: task.completed_at)[:limit]
+
+    def archive_tasks(self, tasks: List[TaskModel]) -> None:
+        with self.store.lock:
+            for task in tasks:
+                task = self.store.tasks.get(task.id, task)
+                archived = ArchivedTask(**snapshot(task), archived_at=datetime.utcnow())
+                self.store.unindex_task(task)
+                self.store.archived[archived.id] = archived
+                self.store.archived_by_project.setdefault(archived.project_id, {})[archived.id] = None
+        self.db_session.commit()
+
+    def get_archived_task_by_id(self, task_id: str) -> Optional[ArchivedTask]:
+        with self.store.lock:
+            return _copy(self.store.archived.get(task_id))
+
+    def get_archived_tasks_by_project_id(
+        self,
+        project_id: str,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[ArchivedTask]:
+        with self.store.lock:
+            return [_copy(self.store.archived[task_id]) for task_id in self.store.archived_by_project.get(project_id, ())]
+
+    def restore_archived_task(self, archived: ArchivedTask, task: TaskModel) -> TaskModel:
+        with self.store.lock:
+            self.store.archived.pop(archived.id, None)
+            self.store.archived_by_project.get(archived.project_id, {}).pop(archived.id, None)
+            task.version = archived.version + 1
+            if task.position is None:
+                task.position = key_between(self.get_last_position(task.project_id), None)
+            self.store.index_task(_copy(task))
+        self.db_session.commit()
+        return task
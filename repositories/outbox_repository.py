@@ -0,0 +1,151 @@
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from models.outbox import OutboxEvent, WebhookSubscription
+
+
+class OutboxRepository:
+    """
+    Repository class for the transactional outbox and webhook subscriptions.
+    """
+
+    def __init__(self, db_session: Session) -> None:
+        """
+        Initialize OutboxRepository.
+
+        Args:
+            db_session: SQLAlchemy database session.
+        """
+        self.db_session = db_session
+
+    # -----------------------------
+    # EVENTS
+    # -----------------------------
+    def list_events_after(
+        self,
+        event_id: int,
+        limit: int,
+        created_before: Optional[datetime] = None
+    ) -> List[OutboxEvent]:
+        """
+        Retrieve outbox events following a cursor, oldest first.
+
+        IDs are allocated when a row is inserted, not when its transaction
+        commits, so a lower ID can become visible after a higher one.
+        ``created_before`` keeps the most recent rows back until any
+        transaction that inserted a lower ID has had time to commit.
+
+        Args:
+            event_id: Cursor (ID of the last handled event).
+            limit: Maximum number of events to return.
+            created_before: Only return events created before this time (optional).
+
+        Returns:
+            A list of OutboxEvent instances.
+        """
+        query = self.db_session.query(OutboxEvent).filter(OutboxEvent.id > event_id)
+        if created_before is not None:
+            query = query.filter(OutboxEvent.created_at < created_before)
+        return query.order_by(OutboxEvent.id).limit(limit).all()
+
+    def prune_events(self, up_to_id: Optional[int], older_than: datetime) -> int:
+        """
+        Delete events every subscriber has handled and that are past retention.
+
+        Args:
+            up_to_id: Highest event ID handled by all subscribers (None: no limit).
+            older_than: Only delete events created before this time.
+
+        Returns:
+            The number of deleted events.
+        """
+        query = self.db_session.query(OutboxEvent).filter(OutboxEvent.created_at < older_than)
+        if up_to_id is not None:
+            query = query.filter(OutboxEvent.id <= up_to_id)
+        deleted = query.delete(synchronize_session=False)
+        self.db_session.commit()
+        return deleted
+
+    # -----------------------------
+    # SUBSCRIPTIONS
+    # -----------------------------
+    def create_subscription(self, subscription: WebhookSubscription) -> WebhookSubscription:
+        """
+        Add a new webhook subscription.
+
+        New subscriptions start at the current end of the outbox, so they
+        only receive events committed after they were created.
+
+        Args:
+            subscription: The WebhookSubscription to insert.
+
+        Returns:
+            The created WebhookSubscription instance.
+        """
+        last = self.db_session.query(OutboxEvent.id).order_by(OutboxEvent.id.desc()).first()
+        subscription.last_event_id = last[0] if last else 0
+        self.db_session.add(subscription)
+        self.db_session.commit()
+        self.db_session.refresh(subscription)
+        return subscription
+
+    def get_subscription_by_id(self, subscription_id: str) -> Optional[WebhookSubscription]:
+        """
+        Retrieve a webhook subscription by its ID.
+
+        Args:
+            subscription_id: Subscription identifier.
+
+        Returns:
+            The matching WebhookSubscription, or None if not found.
+        """
+        return (
+            self.db_session.query(WebhookSubscription)
+            .filter(WebhookSubscription.id == subscription_id)
+            .first()
+        )
+
+    def list_subscriptions(self) -> List[WebhookSubscription]:
+        """
+        Retrieve all webhook subscriptions.
+
+        Returns:
+            A list of WebhookSubscription instances.
+        """
+        return self.db_session.query(WebhookSubscription).all()
+
+    def list_due_subscriptions(self, now: datetime) -> List[WebhookSubscription]:
+        """
+        Retrieve active subscriptions that are not backing off.
+
+        Args:
+            now: Current time.
+
+        Returns:
+            A list of WebhookSubscription instances.
+        """
+        return (
+            self.db_session.query(WebhookSubscription)
+            .filter(
+                WebhookSubscription.active.is_(True),
+                or_(WebhookSubscription.next_attempt_at.is_(None), WebhookSubscription.next_attempt_at <= now)
+            )
+            .all()
+        )
+
+    def update_subscriptions(self) -> None:
+        """
+        Persist cursor and retry state changes made to loaded subscriptions.
+        """
+        self.db_session.commit()
+
+    def delete_subscription(self, subscription: WebhookSubscription) -> None:
+        """
+        Delete a webhook subscription.
+
+        Args:
+            subscription: The WebhookSubscription to remove.
+        """
+        self.db_session.delete(subscription)
+        self.db_session.commit()
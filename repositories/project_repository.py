@@ -1,6 +1,12 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import List, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.exc import StaleDataError
 from models.project import Project as ProjectModel
+from db.base import fieldset_columns
+from db.replicas import replica_read
+from exceptions.repository_exceptions import StaleVersionError
+from db.sharding import SHARD_KEY_OPTION, shard_fan_out
 
 
 class ProjectRepository:
@@ -43,20 +49,28 @@ class ProjectRepository:
         Returns:
             The matching Project instance, or None if not found.
         """
-        return (
-            self.db_session.query(ProjectModel)
-            .filter(ProjectModel.id == project_id)
-            .first()
-        )
+        stmt = select(ProjectModel).where(ProjectModel.id == project_id).limit(1)
+        return self.db_session.scalars(stmt, execution_options={SHARD_KEY_OPTION: project_id}).first()
 
-    def list_projects(self) -> List[ProjectModel]:
+    @shard_fan_out()
+    @replica_read
+    def list_projects(self, fields: Optional[Sequence[str]] = None) -> List[ProjectModel]:
         """
         Retrieve all projects in the database.
+        Served by a read replica when one is configured,
+        queried on all shards in parallel when sharded.
+
+        Args:
+            fields: Only load these columns (plus the primary key); the
+                others stay unloaded. All columns if None.
 
         Returns:
             A list of all Project instances.
         """
-        return self.db_session.query(ProjectModel).all()
+        stmt = select(ProjectModel)
+        if fields is not None:
+            stmt = stmt.options(load_only(*fieldset_columns(ProjectModel, fields)))
+        return self.db_session.scalars(stmt).all()
 
     def update_project(self, project: ProjectModel) -> ProjectModel:
         """
@@ -67,8 +81,16 @@ class ProjectRepository:
 
         Returns:
             The updated Project instance.
+
+        Raises:
+            StaleVersionError: If the project changed since it was loaded.
         """
-        self.db_session.commit()
+        project_id = project.id
+        try:
+            self.db_session.commit()
+        except StaleDataError as e:
+            self.db_session.rollback()
+            raise StaleVersionError(f"Project '{project_id}' was changed by another request.") from e
         self.db_session.refresh(project)
         return project
 
@@ -1,13 +1,29 @@
-from typing import List, Optional
-from datetime import date
-from sqlalchemy.orm import Session
-from models.task import Task as TaskModel
+from typing import List, Optional, Sequence
+from datetime import date, datetime
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.orm.exc import StaleDataError
+from models.task import Task as TaskModel, ArchivedTask
+from events.changes import snapshot
+from exceptions.repository_exceptions import StaleVersionError
+from db.base import fieldset_columns
+from db.positions import key_between
+from db.replicas import replica_read
+from db.sharding import SHARD_KEY_OPTION, shard_fan_out
+
+
+_UPDATE_CHUNK_SIZE: int = 500
 
 
 class TaskRepository:
     """
     Repository class for handling Task database operations.
     Provides CRUD functionality and additional task queries.
+
+    Reads and bulk writes are 2.0-style ``select()``/``update()``/``delete()``
+    statements, whose compiled SQL SQLAlchemy caches; single-row writes go
+    through the unit of work so change events and cascades see them.
     """
 
     def __init__(self, db_session: Session) -> None:
@@ -26,12 +42,16 @@ class TaskRepository:
         """
         Add a new task to the database.
 
+        A task without a position goes to the end of its project.
+
         Args:
             task: The Task instance to insert.
 
         Returns:
             The created Task instance.
         """
+        if task.position is None:
+            task.position = key_between(self.get_last_position(task.project_id), None)
         self.db_session.add(task)
         self.db_session.commit()
         self.db_session.refresh(task)
@@ -50,60 +70,200 @@ class TaskRepository:
         Returns:
             The matching Task instance, or None if not found.
         """
-        return (
-            self.db_session.query(TaskModel)
-            .filter(TaskModel.id == task_id)
-            .first()
-        )
+        stmt = select(TaskModel).where(TaskModel.id == task_id).limit(1)
+        return self.db_session.scalars(stmt).first()
+
+    @shard_fan_out()
+    def get_tasks_by_ids(self, task_ids: List[str]) -> List[TaskModel]:
+        """
+        Retrieve the tasks with the given IDs in one ``IN`` query.
+        Queried on all shards in parallel when sharded.
+
+        Args:
+            task_ids: Task identifiers.
+
+        Returns:
+            The Task instances found, in no particular order.
+        """
+        if not task_ids:
+            return []
+        stmt = select(TaskModel).where(TaskModel.id.in_(task_ids))
+        return self.db_session.scalars(stmt).all()
 
-    def get_tasks_by_project_id(self, project_id: str) -> List[TaskModel]:
+    @replica_read
+    def get_tasks_by_project_id(self, project_id: str, fields: Optional[Sequence[str]] = None) -> List[TaskModel]:
         """
-        Retrieve all tasks belonging to a specific project.
+        Retrieve all tasks belonging to a specific project, in position order.
+        Served by a read replica when one is configured.
 
         Args:
             project_id: The project identifier.
+            fields: Only load these columns (plus the primary key); the
+                others stay unloaded. All columns if None.
 
         Returns:
             A list of Task instances.
         """
-        return (
-            self.db_session.query(TaskModel)
-            .filter(TaskModel.project_id == project_id)
-            .all()
+        stmt = (
+            select(TaskModel)
+            .where(TaskModel.project_id == project_id)
+            .order_by(TaskModel.position, TaskModel.id)
         )
+        if fields is not None:
+            stmt = stmt.options(load_only(*fieldset_columns(TaskModel, fields)))
+        return self.db_session.scalars(stmt, execution_options={SHARD_KEY_OPTION: project_id}).all()
+
+    def get_last_position(self, project_id: str) -> Optional[str]:
+        """
+        Return the greatest position key in a project.
+
+        Args:
+            project_id: The project identifier.
+
+        Returns:
+            The key, or None if the project has no tasks.
+        """
+        stmt = select(func.max(TaskModel.position)).where(TaskModel.project_id == project_id)
+        return self.db_session.scalar(stmt, execution_options={SHARD_KEY_OPTION: project_id})
 
-    def count_tasks_for_project(self, project_id: str) -> int:
+    def get_next_position(self, project_id: str, after: Optional[str], exclude_ids: Sequence[str]) -> Optional[str]:
+        """
+        Return the first position key of a project from a key on.
+
+        A result equal to ``after`` means two tasks share that key.
+
+        Args:
+            project_id: The project identifier.
+            after: Key to look from (None: from the start).
+            exclude_ids: Tasks to ignore (the one being moved and the one holding ``after``).
+
+        Returns:
+            The key, or None if no task follows.
+        """
+        stmt = select(func.min(TaskModel.position)).where(
+            TaskModel.project_id == project_id,
+            TaskModel.id.not_in(exclude_ids)
+        )
+        if after is not None:
+            stmt = stmt.where(TaskModel.position >= after)
+        return self.db_session.scalar(stmt, execution_options={SHARD_KEY_OPTION: project_id})
+
+    def count_tasks_for_project(self, project_id: str, completed_occurrences: bool = False) -> int:
         """
         Count how many tasks exist in a given project.
 
+        Completed occurrences of recurring tasks are left out by default:
+        they stay until archived but do not count toward MAX_NUMBER_OF_TASK,
+        so finishing a daily chore does not use up the project's capacity.
+
         Args:
             project_id: The project identifier.
+            completed_occurrences: Count completed occurrences too.
 
         Returns:
             The number of tasks in the project.
         """
-        return (
-            self.db_session.query(TaskModel)
-            .filter(TaskModel.project_id == project_id)
-            .count()
+        stmt = select(func.count()).select_from(TaskModel).where(TaskModel.project_id == project_id)
+        if not completed_occurrences:
+            stmt = stmt.where(or_(TaskModel.series_id.is_(None), TaskModel.status != "done"))
+        return self.db_session.scalar(stmt, execution_options={SHARD_KEY_OPTION: project_id})
+
+    def get_series_head(self, series_id: str, project_id: str) -> Optional[TaskModel]:
+        """
+        Retrieve the latest occurrence (by deadline) of a recurring task.
+
+        Args:
+            series_id: The series identifier.
+            project_id: The project the series belongs to.
+
+        Returns:
+            The Task instance, or None if the series has no live occurrence.
+        """
+        stmt = (
+            select(TaskModel)
+            .where(TaskModel.series_id == series_id)
+            .order_by(TaskModel.deadline.desc())
+            .limit(1)
         )
+        return self.db_session.scalars(stmt, execution_options={SHARD_KEY_OPTION: project_id}).first()
 
+    def list_series_heads(self, project_id: str) -> List[TaskModel]:
+        """
+        Retrieve the latest occurrence of every recurring task of a project.
+
+        Args:
+            project_id: The project identifier.
+
+        Returns:
+            One Task instance per series.
+        """
+        latest = (
+            select(TaskModel.series_id, func.max(TaskModel.deadline).label("deadline"))
+            .where(TaskModel.project_id == project_id, TaskModel.series_id.is_not(None))
+            .group_by(TaskModel.series_id)
+            .subquery()
+        )
+        stmt = select(TaskModel).join(
+            latest,
+            (TaskModel.series_id == latest.c.series_id) & (TaskModel.deadline == latest.c.deadline)
+        )
+        heads = self.db_session.scalars(stmt, execution_options={SHARD_KEY_OPTION: project_id}).all()
+        # Occurrences edited onto the same day: keep one per series
+        return list({task.series_id: task for task in heads}.values())
+
+    @shard_fan_out()
     def list_all_overdue(self) -> List[TaskModel]:
         """
         Retrieve all overdue tasks that are not marked as done.
+        Queried on all shards in parallel when sharded.
 
         Returns:
             A list of overdue Task instances.
         """
         today = date.today()
-        return (
-            self.db_session.query(TaskModel)
-            .filter(
-                TaskModel.deadline < today,
-                TaskModel.status != "done"
-            )
-            .all()
+        stmt = select(TaskModel).where(
+            TaskModel.deadline < today,
+            TaskModel.status != "done"
+        )
+        return self.db_session.scalars(stmt).all()
+
+    @shard_fan_out()
+    def list_overdue_between(self, start: date, end: date) -> List[TaskModel]:
+        """
+        Retrieve open tasks whose deadline falls in ``[start, end)``.
+        Queried on all shards in parallel when sharded.
+
+        Args:
+            start: First deadline day to include.
+            end: First deadline day to exclude (usually today).
+
+        Returns:
+            A list of Task instances that are not marked as done.
+        """
+        stmt = select(TaskModel).where(
+            TaskModel.deadline >= start,
+            TaskModel.deadline < end,
+            TaskModel.status != "done"
+        )
+        return self.db_session.scalars(stmt).all()
+
+    @shard_fan_out(combine=lambda deadlines: min((d for d in deadlines if d), default=None))
+    def next_open_deadline(self, from_day: date) -> Optional[date]:
+        """
+        Find the earliest deadline on or after a day among open tasks.
+        Queried on all shards in parallel when sharded.
+
+        Args:
+            from_day: First day to consider.
+
+        Returns:
+            The earliest deadline, or None if no open task has one.
+        """
+        stmt = select(func.min(TaskModel.deadline)).where(
+            TaskModel.deadline >= from_day,
+            TaskModel.status != "done"
         )
+        return self.db_session.scalar(stmt)
 
     # -----------------------------
     # UPDATE
@@ -117,10 +277,11 @@ class TaskRepository:
 
         Returns:
             The updated Task instance.
+
+        Raises:
+            StaleVersionError: If the task changed since it was loaded.
         """
-        self.db_session.commit()
-        self.db_session.refresh(task)
-        return task
+        return self._commit_update(task)
 
     def update_task_status(self, task: TaskModel, new_status: str) -> TaskModel:
         """
@@ -132,12 +293,90 @@ class TaskRepository:
 
         Returns:
             Updated Task instance.
+
+        Raises:
+            StaleVersionError: If the task changed since it was loaded.
         """
         task.status = new_status
-        self.db_session.commit()
+        return self._commit_update(task)
+
+    def _commit_update(self, task: TaskModel) -> TaskModel:
+        task_id = task.id
+        try:
+            self.db_session.commit()
+        except StaleDataError as e:
+            self.db_session.rollback()
+            raise StaleVersionError(f"Task '{task_id}' was changed by another request.") from e
         self.db_session.refresh(task)
         return task
 
+    def update_task_position(self, task: TaskModel, position: str) -> TaskModel:
+        """
+        Move a task: a single-row UPDATE of its position key.
+
+        Args:
+            task: Task instance to move.
+            position: Its new key.
+
+        Returns:
+            Updated Task instance.
+
+        Raises:
+            StaleVersionError: If the task changed since it was loaded.
+        """
+        task.position = position
+        return self._commit_update(task)
+
+    def set_positions(self, tasks: List[TaskModel], positions: Sequence[str]) -> None:
+        """
+        Rewrite the position keys of many tasks in one transaction.
+
+        Every task is written, whether its key changes or not, so each
+        UPDATE checks and bumps its version: a move computed from the old
+        keys fails its version check instead of landing in the new key
+        space, and a move committed since ``tasks`` were loaded makes this
+        call fail instead of being undone.
+
+        Args:
+            tasks: Task instances (with ``position`` and ``version`` loaded).
+            positions: New key of each task, in the same order.
+
+        Raises:
+            StaleVersionError: If a task changed since it was loaded.
+        """
+        if not tasks:
+            return
+        for task, position in zip(tasks, positions):
+            task.position = position
+            flag_modified(task, "position")
+        try:
+            self.db_session.commit()
+        except StaleDataError as e:
+            self.db_session.rollback()
+            raise StaleVersionError("Tasks were changed by another request while being renumbered.") from e
+
+    def mark_tasks_done(self, tasks: List[TaskModel]) -> None:
+        """
+        Mark several tasks as done in a single transaction.
+
+        Issues one UPDATE per chunk of IDs instead of one per task; the
+        loaded instances are updated in place. Versions are bumped as an
+        ORM update would, so clients holding an older version get a conflict.
+
+        Args:
+            tasks: Task instances to close.
+        """
+        ids = [task.id for task in tasks]
+        completed_at = datetime.utcnow()
+        for start in range(0, len(ids), _UPDATE_CHUNK_SIZE):
+            self.db_session.execute(
+                update(TaskModel)
+                .where(TaskModel.id.in_(ids[start:start + _UPDATE_CHUNK_SIZE]))
+                .values(status="done", completed_at=completed_at, version=TaskModel.version + 1),
+                execution_options={"synchronize_session": "evaluate"}
+            )
+        self.db_session.commit()
+
     # -----------------------------
     # DELETE
     # -----------------------------
@@ -148,5 +387,137 @@ class TaskRepository:
         Args:
             task: Task instance to remove.
         """
-        self.db_session.delete(task)
+        self.db_session.execute(
+            delete(TaskModel).where(TaskModel.id == task.id),
+            execution_options={SHARD_KEY_OPTION: task.project_id}
+        )
         self.db_session.commit()
+
+    def delete_tasks_by_project_id(self, project_id: str, limit: int, archived: bool = False) -> int:
+        """
+        Delete up to ``limit`` tasks of a project in one transaction.
+
+        Lets a large project be emptied in short transactions before the
+        project itself is deleted.
+
+        Args:
+            project_id: The project identifier.
+            limit: Maximum number of tasks to delete.
+            archived: Delete from the archive instead of the live tasks.
+
+        Returns:
+            The number of deleted tasks (0 once none are left).
+        """
+        model = ArchivedTask if archived else TaskModel
+        ids = self.db_session.scalars(
+            select(model.id).where(model.project_id == project_id).limit(limit),
+            execution_options={SHARD_KEY_OPTION: project_id}
+        ).all()
+        if ids:
+            self.db_session.execute(
+                delete(model).where(model.id.in_(ids)),
+                execution_options={SHARD_KEY_OPTION: project_id, "synchronize_session": False}
+            )
+            self.db_session.commit()
+        return len(ids)
+
+    # -----------------------------
+    # ARCHIVE
+    # -----------------------------
+    @shard_fan_out()
+    def list_archivable(self, completed_before: datetime, limit: int) -> List[TaskModel]:
+        """
+        Retrieve done tasks completed before a cutoff, oldest first.
+        Queried on all shards in parallel when sharded (up to ``limit`` per shard).
+
+        Args:
+            completed_before: Only tasks completed before this moment are returned.
+            limit: Maximum number of tasks (one archival batch).
+
+        Returns:
+            A list of Task instances.
+        """
+        stmt = (
+            select(TaskModel)
+            .where(
+                TaskModel.status == "done",
+                TaskModel.completed_at < completed_before
+            )
+            .order_by(TaskModel.completed_at)
+            .limit(limit)
+        )
+        return self.db_session.scalars(stmt).all()
+
+    def archive_tasks(self, tasks: List[TaskModel]) -> None:
+        """
+        Move tasks to the archive table in a single transaction.
+
+        Args:
+            tasks: Task instances to archive.
+        """
+        for task in tasks:
+            self.db_session.add(ArchivedTask(**snapshot(task)))
+            self.db_session.delete(task)
+        self.db_session.commit()
+
+    def get_archived_task_by_id(self, task_id: str) -> Optional[ArchivedTask]:
+        """
+        Retrieve an archived task by its ID.
+
+        Args:
+            task_id: Unique task identifier.
+
+        Returns:
+            The matching ArchivedTask instance, or None if not found.
+        """
+        stmt = select(ArchivedTask).where(ArchivedTask.id == task_id).limit(1)
+        return self.db_session.scalars(stmt).first()
+
+    @replica_read
+    def get_archived_tasks_by_project_id(
+        self,
+        project_id: str,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[ArchivedTask]:
+        """
+        Retrieve all archived tasks of a project.
+        Served by a read replica when one is configured.
+
+        Args:
+            project_id: The project identifier.
+            fields: Only load these columns (plus the primary key). All columns if None.
+
+        Returns:
+            A list of ArchivedTask instances.
+        """
+        stmt = select(ArchivedTask).where(ArchivedTask.project_id == project_id)
+        if fields is not None:
+            stmt = stmt.options(load_only(*fieldset_columns(ArchivedTask, fields)))
+        return self.db_session.scalars(stmt, execution_options={SHARD_KEY_OPTION: project_id}).all()
+
+    def restore_archived_task(self, archived: ArchivedTask, task: TaskModel) -> TaskModel:
+        """
+        Replace an archived task with its restored copy in a single transaction.
+
+        Args:
+            archived: The ArchivedTask instance to remove from the archive.
+            task: The Task instance to insert.
+
+        Returns:
+            The restored Task instance.
+        """
+        archived_version = archived.version
+        if task.position is None:
+            task.position = key_between(self.get_last_position(task.project_id), None)
+        self.db_session.delete(archived)
+        self.db_session.add(task)
+        self.db_session.flush()
+        # INSERTs start at version 1; continue from the archived version so
+        # an ETag from before the archival cannot match the restored task
+        self.db_session.execute(
+            update(TaskModel).where(TaskModel.id == task.id).values(version=archived_version + 1),
+            execution_options={SHARD_KEY_OPTION: task.project_id, "synchronize_session": "evaluate"}
+        )
+        self.db_session.commit()
+        self.db_session.refresh(task)
+        return task
@@ -0,0 +1,181 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+from models.idempotency import IdempotencyKey
+from repositories.idempotency_repository import IdempotencyRepository
+from exceptions.service_exceptions import (
+    InvalidIdempotencyKeyError,
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyReusedError
+)
+from db.session import SessionLocal
+
+IDEMPOTENCY_TTL_HOURS = float(os.getenv("IDEMPOTENCY_TTL_HOURS", 24))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", 10000))
+
+_MAX_KEY_LENGTH: int = 255
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """
+    Response stored for an Idempotency-Key.
+
+    Attributes:
+        fingerprint: Fingerprint of the request that produced it.
+        status_code: HTTP status.
+        body: JSON body.
+        expires_at: When the key may be forgotten.
+    """
+    fingerprint: str
+    status_code: int
+    body: str
+    expires_at: datetime
+
+
+class ResponseCache:
+    """
+    Bounded in-process LRU of completed keys, in front of the database.
+
+    Entries expire with their key, so a hit never outlives the stored row.
+    """
+
+    def __init__(self, max_size: int = 10000) -> None:
+        """
+        Args:
+            max_size: Maximum number of cached keys.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= datetime.utcnow():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: StoredResponse) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+response_cache: ResponseCache = ResponseCache(IDEMPOTENCY_CACHE_SIZE)
+"""
+Process-wide LRU front of the idempotency_keys table.
+"""
+
+
+class IdempotencyService:
+    """
+    Service layer running requests at most once per Idempotency-Key.
+
+    The first request reserves the key in the database, runs, and stores
+    its response; retries get the stored response back without running
+    again. Only successful responses are stored: a failed request releases
+    its key so the client can retry it.
+
+    The write and the stored response are committed separately, so a key
+    left reserved by a request that never finished (e.g. the process died)
+    may belong to a write that did happen. Such a key is never run again
+    before it expires; retries get 409 instead.
+    """
+
+    def __init__(self, db_session=None, cache: ResponseCache = response_cache) -> None:
+        # Use provided session or create a new one
+        self.db_session = db_session or SessionLocal()
+        self.idempotency_repo = IdempotencyRepository(self.db_session)
+        self.cache = cache
+
+    def run(self, key: str, fingerprint: str, func: Callable[[], Tuple[int, str]]) -> Tuple[StoredResponse, bool]:
+        """
+        Run ``func`` unless ``key`` already has a response.
+
+        Args:
+            key: The Idempotency-Key value.
+            fingerprint: Identifies the request (method, path and body).
+            func: Runs the request and returns its status code and JSON body.
+
+        Returns:
+            The response, and whether it was replayed from an earlier request.
+
+        Raises:
+            InvalidIdempotencyKeyError: if the key is empty or too long.
+            IdempotencyKeyInProgressError: if a request with the key is still
+                running, or never finished.
+            IdempotencyKeyReusedError: if the key was used for a different request.
+        """
+        if not key or len(key) > _MAX_KEY_LENGTH:
+            raise InvalidIdempotencyKeyError(f"Idempotency-Key must be 1 to {_MAX_KEY_LENGTH} characters.")
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._replay(cached, fingerprint), True
+
+        now = datetime.utcnow()
+        record = IdempotencyKey(
+            key=key,
+            fingerprint=fingerprint,
+            created_at=now,
+            expires_at=now + timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+        )
+        while not self.idempotency_repo.reserve_key(record):
+            existing = self.idempotency_repo.get_key(key)
+            if existing is None:
+                continue  # released in the meantime
+            if existing.status_code is not None and existing.expires_at > now:
+                stored = self._stored(existing)
+                self.cache.put(key, stored)
+                return self._replay(stored, fingerprint), True
+            if existing.status_code is None and existing.expires_at > now:
+                if existing.fingerprint != fingerprint:
+                    raise IdempotencyKeyReusedError(f"Idempotency-Key '{key}' was used for a different request.")
+                raise IdempotencyKeyInProgressError(
+                    f"A request with Idempotency-Key '{key}' is in progress or did not finish."
+                )
+            # Expired
+            self.idempotency_repo.delete_key(existing)
+
+        try:
+            status_code, body = func()
+        except BaseException:
+            self.idempotency_repo.delete_key(record)
+            raise
+        stored = self._stored(self.idempotency_repo.complete_key(record, status_code, body))
+        self.cache.put(key, stored)
+        return stored, False
+
+    def prune_expired(self) -> int:
+        """
+        Delete keys past their TTL.
+
+        Returns:
+            The number of deleted keys.
+        """
+        return self.idempotency_repo.prune_expired(datetime.utcnow())
+
+    @staticmethod
+    def _stored(record: IdempotencyKey) -> StoredResponse:
+        return StoredResponse(record.fingerprint, record.status_code, record.response_body, record.expires_at)
+
+    @staticmethod
+    def _replay(stored: StoredResponse, fingerprint: str) -> StoredResponse:
+        if stored.fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError("Idempotency-Key was used for a different request.")
+        return stored
@@ -0,0 +1,217 @@
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from models.job import BackgroundJob
+from repositories.job_repository import JobRepository
+from repositories.factory import create_project_repository, create_task_repository
+from services.project_service import ProjectService
+from services.task_service import TaskService
+from exceptions.service_exceptions import JobNotFoundError
+from db.session import SessionLocal
+
+JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", 500))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+JOB_HEARTBEAT_TIMEOUT_SECONDS = float(os.getenv("JOB_HEARTBEAT_TIMEOUT_SECONDS", 300))
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", 24))
+
+
+class JobContext:
+    """
+    What a running handler gets: the job's arguments, a session and
+    progress reporting (which also serves as the worker's heartbeat).
+    """
+
+    def __init__(self, job: BackgroundJob, job_repo: JobRepository) -> None:
+        self.job = job
+        self.job_repo = job_repo
+        self.db_session = job_repo.db_session
+        self.payload: Dict[str, Any] = json.loads(job.payload)
+
+    @property
+    def progress(self) -> int:
+        """Progress reported by an earlier attempt (to resume from)."""
+        return self.job.progress
+
+    def report(self, progress: int, total: Optional[int] = None) -> None:
+        """
+        Store the progress of the job.
+
+        Args:
+            progress: Units of work done so far.
+            total: Units of work in total, if (now) known.
+        """
+        self.job.progress = progress
+        if total is not None:
+            self.job.total = total
+        self.job.heartbeat_at = datetime.utcnow()
+        self.job_repo.update_job(self.job)
+
+
+# -----------------------------
+# HANDLERS
+# -----------------------------
+def delete_project(context: JobContext) -> Dict[str, Any]:
+    """
+    Delete a project, its tasks first in JOB_BATCH_SIZE transactions.
+
+    Progress counts live tasks; archived tasks are deleted afterwards.
+    """
+    project_id = context.payload["project_id"]
+    task_repo = create_task_repository(context.db_session)
+    project_service = ProjectService(project_repo=create_project_repository(context.db_session))
+    project_service.get_project_by_id(project_id)
+
+    deleted = 0
+    context.report(0, total=task_repo.count_tasks_for_project(project_id, completed_occurrences=True))
+    while batch := task_repo.delete_tasks_by_project_id(project_id, JOB_BATCH_SIZE):
+        deleted += batch
+        context.report(deleted)
+    while task_repo.delete_tasks_by_project_id(project_id, JOB_BATCH_SIZE, archived=True):
+        context.report(deleted)
+    project_service.delete_project(project_id)
+    return {"project_id": project_id, "deleted_tasks": deleted}
+
+
+def import_tasks(context: JobContext) -> Dict[str, Any]:
+    """
+    Create the tasks of a bulk import, reporting progress after each task.
+
+    A retried job resumes after the last reported task, so at most the task
+    being created when the worker died is created twice.
+    """
+    project_id = context.payload["project_id"]
+    items = context.payload["tasks"]
+    task_service = TaskService(
+        task_repo=create_task_repository(context.db_session),
+        project_repo=create_project_repository(context.db_session)
+    )
+    created = context.progress
+    context.report(created, total=len(items))
+    for item in items[created:]:
+        task_service.create_task(
+            project_id=project_id,
+            title=item["title"],
+            description=item.get("description"),
+            deadline=item.get("deadline"),
+            recurrence=item.get("recurrence")
+        )
+        created += 1
+        context.report(created)
+    return {"project_id": project_id, "created_tasks": created}
+
+
+def rebalance_positions(context: JobContext) -> Dict[str, Any]:
+    """
+    Shorten the position keys of a project's tasks.
+    """
+    project_id = context.payload["project_id"]
+    task_service = TaskService(
+        task_repo=create_task_repository(context.db_session),
+        project_repo=create_project_repository(context.db_session)
+    )
+    return {"project_id": project_id, "rebalanced_tasks": task_service.rebalance_positions(project_id)}
+
+
+JOB_HANDLERS: Dict[str, Callable[[JobContext], Any]] = {
+    "project.delete": delete_project,
+    "tasks.import": import_tasks,
+    "tasks.rebalance": rebalance_positions,
+}
+"""
+Job kinds and the functions running them; a handler returns the JSON-serializable result.
+"""
+
+
+class JobService:
+    """
+    Service layer for queuing long-running operations and running them in workers.
+    Uses JobRepository for all database operations.
+    """
+
+    def __init__(self, db_session=None):
+        # Use provided session or create a new one
+        self.db_session = db_session or SessionLocal()
+        self.job_repo = JobRepository(self.db_session)
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], total: Optional[int] = None) -> BackgroundJob:
+        """
+        Queue a job for the workers.
+
+        Raises:
+            ValueError: if no handler exists for ``kind``.
+        """
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind '{kind}'.")
+        job = BackgroundJob(kind=kind, payload=json.dumps(payload, default=str), total=total)
+        return self.job_repo.create_job(job)
+
+    def enqueue_once(self, kind: str, payload: Dict[str, Any]) -> BackgroundJob:
+        """
+        Queue a job unless the same job is already waiting for a worker.
+
+        For idempotent maintenance jobs requested over and over (e.g. on
+        every request that notices the need).
+
+        Returns:
+            The queued job (the waiting one if there is one).
+
+        Raises:
+            ValueError: if no handler exists for ``kind``.
+        """
+        queued = self.job_repo.get_queued_job(kind, json.dumps(payload, default=str))
+        return queued if queued is not None else self.enqueue(kind, payload)
+
+    def get_job(self, job_id: str) -> BackgroundJob:
+        """
+        Get a job by its ID.
+
+        Raises:
+            JobNotFoundError: if the job does not exist.
+        """
+        job = self.job_repo.get_job(job_id)
+        if not job:
+            raise JobNotFoundError(f"Job with ID '{job_id}' not found.")
+        return job
+
+    def run_next(self, worker: str) -> Optional[BackgroundJob]:
+        """
+        Claim the oldest queued job and run it to completion.
+
+        Jobs whose worker stopped sending heartbeats for
+        JOB_HEARTBEAT_TIMEOUT_SECONDS are queued again first (up to
+        JOB_MAX_ATTEMPTS attempts).
+
+        Args:
+            worker: Identifier of the calling worker.
+
+        Returns:
+            The finished job, or None if the queue was empty.
+        """
+        now = datetime.utcnow()
+        self.job_repo.requeue_stale(now - timedelta(seconds=JOB_HEARTBEAT_TIMEOUT_SECONDS), JOB_MAX_ATTEMPTS, now)
+        job = self.job_repo.claim_next(worker, now)
+        if job is None:
+            return None
+
+        try:
+            result = JOB_HANDLERS[job.kind](JobContext(job, self.job_repo))
+        except Exception as e:
+            self.db_session.rollback()
+            job.status = "failed"
+            job.error = str(e) or type(e).__name__
+        else:
+            job.status = "succeeded"
+            job.result = json.dumps(result, default=str)
+        job.finished_at = datetime.utcnow()
+        return self.job_repo.update_job(job)
+
+    def prune_finished(self) -> int:
+        """
+        Delete finished jobs older than JOB_RETENTION_HOURS.
+
+        Returns:
+            The number of deleted jobs.
+        """
+        return self.job_repo.prune_finished(datetime.utcnow() - timedelta(hours=JOB_RETENTION_HOURS))
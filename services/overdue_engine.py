@@ -0,0 +1,164 @@
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from db.session import SessionLocal
+from events.changes import record_change
+from models.task import Task
+from repositories.factory import create_task_repository
+from repositories.task_repository import TaskRepository
+from services.recurrence import continue_series
+
+OVERDUE_MAX_SLEEP_SECONDS = float(os.getenv("OVERDUE_MAX_SLEEP_SECONDS", 6 * 3600))
+
+
+class OverdueEngine:
+    """
+    Deadline-driven closing of overdue tasks.
+
+    A task becomes overdue when the calendar day rolls past its deadline, so
+    instead of rescanning every task on a timer the engine sleeps until the
+    midnight after the earliest open deadline and then only closes tasks
+    whose deadline lies between the last processed day and today.
+
+    TaskService calls ``notify_deadline`` when a task is created or its
+    deadline changes; within the process running the scheduler the engine
+    wakes up, handles deadlines set in the past and recomputes its next
+    wake-up. Hints do not cross processes: TaskService closes tasks written
+    with a past deadline itself, and sleep is capped at ``max_sleep_seconds``
+    so future deadlines set through other processes are picked up
+    eventually. ``catch_up`` remains as an opt-in full scan.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_sleep_seconds: float = OVERDUE_MAX_SLEEP_SECONDS
+    ) -> None:
+        """
+        Initialize the OverdueEngine.
+
+        Args:
+            session_factory: Creates a session for each run.
+            max_sleep_seconds: Upper bound on the time between two runs.
+        """
+        self.session_factory = session_factory
+        self.max_sleep_seconds = max_sleep_seconds
+        self.processed_through: Optional[date] = None
+        self.next_run_at: Optional[datetime] = None
+        self._earliest_hint: Optional[date] = None
+        self._wake_callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def add_wake_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Call ``callback`` whenever a deadline change is signalled.
+
+        Used by schedulers that drive the engine from their own loop.
+        """
+        self._wake_callbacks.append(callback)
+
+    def notify_deadline(self, deadline: Optional[date]) -> None:
+        """
+        Signal that a task with this deadline was created or edited.
+
+        Args:
+            deadline: The new deadline (ignored when None).
+        """
+        if deadline is None:
+            return
+        with self._lock:
+            if self._earliest_hint is None or deadline < self._earliest_hint:
+                self._earliest_hint = deadline
+        for callback in self._wake_callbacks:
+            callback()
+
+    def run_due(self, today: Optional[date] = None, session: Optional[Session] = None) -> int:
+        """
+        Close tasks whose deadline passed since the last run.
+
+        The first run closes every overdue task (catch-up after downtime);
+        later runs only look at the deadline window that just elapsed.
+
+        Args:
+            today: Current day (defaults to date.today()).
+            session: Session to use (a new one is opened and closed if omitted).
+
+        Returns:
+            The number of tasks closed.
+        """
+        today = today or date.today()
+        with self._lock:
+            hint, self._earliest_hint = self._earliest_hint, None
+
+        owns_session = session is None
+        session = session or self.session_factory()
+        try:
+            task_repo = create_task_repository(session)
+            if self.processed_through is None:
+                tasks = task_repo.list_all_overdue()
+            else:
+                start = min(hint, self.processed_through) if hint else self.processed_through
+                tasks = task_repo.list_overdue_between(start, today) if start < today else []
+
+            self._close(task_repo, tasks)
+            self.processed_through = today
+
+            next_deadline = task_repo.next_open_deadline(today)
+            self.next_run_at = (
+                datetime.combine(next_deadline + timedelta(days=1), time.min) if next_deadline else None
+            )
+            return len(tasks)
+        finally:
+            if owns_session:
+                session.close()
+
+    def catch_up(self, session: Session) -> int:
+        """
+        Close every overdue task regardless of the processed window.
+
+        Args:
+            session: Session to use.
+
+        Returns:
+            The number of tasks closed.
+        """
+        task_repo = create_task_repository(session)
+        tasks = task_repo.list_all_overdue()
+        self._close(task_repo, tasks)
+        return len(tasks)
+
+    @staticmethod
+    def _close(task_repo: TaskRepository, tasks: List[Task]) -> None:
+        if not tasks:
+            return
+        for task in tasks:
+            record_change(task_repo.db_session, "task.status_changed", task)
+        task_repo.mark_tasks_done(tasks)
+        # A closed occurrence of a recurring task makes way for the next one
+        for task in tasks:
+            continue_series(task_repo, task)
+
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> float:
+        """
+        Time to sleep before the next deadline boundary.
+
+        Args:
+            now: Current time (defaults to datetime.now()).
+
+        Returns:
+            Seconds until the next run, capped at ``max_sleep_seconds``.
+        """
+        if self.next_run_at is None:
+            return self.max_sleep_seconds
+        now = now or datetime.now()
+        return max(0.0, min(self.max_sleep_seconds, (self.next_run_at - now).total_seconds()))
+
+
+overdue_engine: OverdueEngine = OverdueEngine()
+"""
+Process-wide overdue engine; TaskService signals deadline changes to it.
+"""
@@ -1,12 +1,19 @@
-from typing import List, Optional
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
 import os
 
 from models.project import Project, ProjectError
 from repositories.project_repository import ProjectRepository
-from db.session import SessionLocal
+from repositories.factory import create_project_repository
+from db.replicas import use_primary
+from events.changes import record_change
+from exceptions.service_exceptions import VersionConflictError
+from exceptions.repository_exceptions import StaleVersionError
+from services.single_flight import project_list_flight
 
 MAX_NUMBER_OF_PROJECT = int(os.getenv("MAX_NUMBER_OF_PROJECT", 5))
 
+T = TypeVar("T")
+
 
 class ProjectService:
     """
@@ -14,10 +21,11 @@ class ProjectService:
     Uses ProjectRepository for all database operations.
     """
 
-    def __init__(self, db_session=None):
-        # Use provided session or create a new one
-        self.db_session = db_session or SessionLocal()
-        self.project_repo = ProjectRepository(self.db_session)
+    def __init__(self, db_session=None, project_repo: Optional[ProjectRepository] = None):
+        # Use the provided repository, or one of the configured backend
+        # on the provided (or a new) session
+        self.project_repo = project_repo or create_project_repository(db_session)
+        self.db_session = self.project_repo.db_session
 
     def create_project(self, name: str, description: str) -> Project:
         """
@@ -26,7 +34,8 @@ class ProjectService:
         Raises:
             ProjectError: if project limit exceeded or name already exists.
         """
-        projects = self.project_repo.list_projects()
+        with use_primary(self.db_session):
+            projects = self.project_repo.list_projects()
         if len(projects) >= MAX_NUMBER_OF_PROJECT:
             raise ProjectError(f"Cannot create more than {MAX_NUMBER_OF_PROJECT} projects.")
 
@@ -34,6 +43,7 @@ class ProjectService:
             raise ProjectError(f"A project with the name '{name}' already exists.")
 
         project = Project(name=name, description=description)
+        record_change(self.db_session, "project.created", project)
         return self.project_repo.create_project(project)
 
     def get_project_by_id(self, project_id: str) -> Project:
@@ -48,29 +58,45 @@ class ProjectService:
             raise ProjectError(f"Project with ID '{project_id}' not found.")
         return project
 
-    def list_projects(self) -> List[Project]:
+    def list_projects(self, fields: Optional[Sequence[str]] = None) -> List[Project]:
         """
-        Return all projects.
+        Return all projects, with only ``fields`` loaded if given.
         """
-        return self.project_repo.list_projects()
+        return self.project_repo.list_projects(fields)
+
+    def list_projects_shared(self, render: Callable[[List[Project]], T], fields: Optional[Tuple[str, ...]] = None) -> T:
+        """
+        List and render all projects, sharing the work with concurrent callers.
+        """
+        return project_list_flight.do(("projects", fields), lambda: render(self.list_projects(fields)))
 
     def edit_project(
         self,
         project_id: str,
         new_name: Optional[str] = None,
         new_description: Optional[str] = None,
+        expected_version: Optional[int] = None,
     ) -> Project:
         """
         Update a project's name and/or description.
 
+        ``expected_version`` is the version the client last saw (any version if None).
+
         Raises:
             ProjectError: if project not found.
+            VersionConflictError: if the project is not at ``expected_version``
+                or is changed concurrently.
         """
         project = self.get_project_by_id(project_id)
+        if expected_version is not None and project.version != expected_version:
+            raise VersionConflictError(
+                f"Project '{project_id}' is at version {project.version}, not {expected_version}."
+            )
 
         if new_name:
             # Check for duplicate name
-            all_projects = self.project_repo.list_projects()
+            with use_primary(self.db_session):
+                all_projects = self.project_repo.list_projects()
             if any(p.name == new_name and p.id != project_id for p in all_projects):
                 raise ProjectError(f"A project with the name '{new_name}' already exists.")
             project.name = new_name
@@ -78,7 +104,11 @@ class ProjectService:
         if new_description:
             project.description = new_description
 
-        return self.project_repo.update_project(project)
+        record_change(self.db_session, "project.updated", project)
+        try:
+            return self.project_repo.update_project(project)
+        except StaleVersionError as e:
+            raise VersionConflictError(str(e)) from e
 
     def delete_project(self, project_id: str) -> None:
         """
@@ -88,4 +118,5 @@ class ProjectService:
             ProjectError: if project not found.
         """
         project = self.get_project_by_id(project_id)
+        record_change(self.db_session, "project.deleted", project)
         self.project_repo.delete_project(project)
@@ -0,0 +1,195 @@
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+from events.changes import record_change
+from exceptions.service_exceptions import InvalidRecurrenceError
+from models.task import Task
+
+WEEKDAYS: Tuple[str, ...] = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+_SHORTHANDS = {"daily": "FREQ=DAILY", "weekly": "FREQ=WEEKLY", "monthly": "FREQ=MONTHLY"}
+_MAX_RULE_LENGTH: int = 200
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """
+    A repeat rule: ``daily``, ``weekly``, ``monthly`` or an RFC 5545 RRULE
+    subset (``FREQ=DAILY|WEEKLY|MONTHLY``, ``INTERVAL``, ``BYDAY`` for weekly,
+    ``BYMONTHDAY`` for monthly, ``UNTIL``).
+
+    Attributes:
+        freq: DAILY, WEEKLY or MONTHLY.
+        interval: Repeat every ``interval`` days, weeks or months.
+        by_day: Weekdays of a weekly rule (0 = Monday).
+        by_month_day: Days of the month of a monthly rule (clamped to short months).
+        until: Last day an occurrence may fall on (None: forever).
+    """
+    freq: str
+    interval: int = 1
+    by_day: Tuple[int, ...] = ()
+    by_month_day: Tuple[int, ...] = ()
+    until: Optional[date] = None
+
+    @classmethod
+    def parse(cls, rule: str, anchor: date) -> "RecurrenceRule":
+        """
+        Parse a rule for a series whose first occurrence falls on ``anchor``.
+
+        Weekly and monthly rules without BYDAY/BYMONTHDAY repeat on the
+        anchor's weekday/day of month; that day is made explicit, so the
+        rule keeps its day when an occurrence falls on a clamped date.
+
+        Raises:
+            InvalidRecurrenceError: If the rule is malformed or uses unsupported parts.
+        """
+        text = rule.strip()
+        if not text or len(text) > _MAX_RULE_LENGTH:
+            raise InvalidRecurrenceError(f"A recurrence rule must be 1 to {_MAX_RULE_LENGTH} characters.")
+        text = _SHORTHANDS.get(text.lower(), text)
+        if text.upper().startswith("RRULE:"):
+            text = text[len("RRULE:"):]
+
+        parts = {}
+        for part in text.upper().split(";"):
+            name, separator, value = part.partition("=")
+            if not separator or not value:
+                raise InvalidRecurrenceError(f"Invalid recurrence rule part '{part}'.")
+            parts[name.strip()] = value.strip()
+
+        freq = parts.pop("FREQ", None)
+        if freq not in ("DAILY", "WEEKLY", "MONTHLY"):
+            raise InvalidRecurrenceError("FREQ must be DAILY, WEEKLY or MONTHLY.")
+        try:
+            interval = int(parts.pop("INTERVAL", 1))
+            until = parts.pop("UNTIL", None)
+            until = date(int(until[0:4]), int(until[4:6]), int(until[6:8])) if until else None
+            by_day = tuple(sorted({WEEKDAYS.index(day) for day in parts.pop("BYDAY").split(",")})) \
+                if "BYDAY" in parts else ()
+            by_month_day = tuple(sorted({int(day) for day in parts.pop("BYMONTHDAY").split(",")})) \
+                if "BYMONTHDAY" in parts else ()
+        except ValueError as e:
+            raise InvalidRecurrenceError(f"Invalid recurrence rule '{rule}'.") from e
+        if parts:
+            raise InvalidRecurrenceError(f"Unsupported recurrence rule parts: {', '.join(sorted(parts))}.")
+        if interval < 1:
+            raise InvalidRecurrenceError("INTERVAL must be at least 1.")
+        if by_day and freq != "WEEKLY":
+            raise InvalidRecurrenceError("BYDAY is only supported with FREQ=WEEKLY.")
+        if by_month_day and (freq != "MONTHLY" or not all(1 <= day <= 31 for day in by_month_day)):
+            raise InvalidRecurrenceError("BYMONTHDAY must be 1 to 31, with FREQ=MONTHLY.")
+
+        if freq == "WEEKLY" and not by_day:
+            by_day = (anchor.weekday(),)
+        if freq == "MONTHLY" and not by_month_day:
+            by_month_day = (anchor.day,)
+        return cls(freq, interval, by_day, by_month_day, until)
+
+    def next_after(self, day: date) -> Optional[date]:
+        """
+        The first occurrence after ``day``, an occurrence of the rule.
+
+        Returns:
+            The date, or None once the rule has ended (UNTIL).
+        """
+        if self.freq == "DAILY":
+            following = day + timedelta(days=self.interval)
+        elif self.freq == "WEEKLY":
+            week_start = day - timedelta(days=day.weekday())
+            later = [weekday for weekday in self.by_day if weekday > day.weekday()]
+            following = (
+                week_start + timedelta(days=later[0]) if later
+                else week_start + timedelta(weeks=self.interval, days=self.by_day[0])
+            )
+        else:
+            later = [d for d in _clamped(day.year, day.month, self.by_month_day) if d > day.day]
+            if later:
+                following = day.replace(day=later[0])
+            else:
+                months = day.year * 12 + day.month - 1 + self.interval
+                year, month = divmod(months, 12)
+                following = date(year, month + 1, _clamped(year, month + 1, self.by_month_day)[0])
+        if self.until is not None and following > self.until:
+            return None
+        return following
+
+    def __str__(self) -> str:
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.by_day:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.by_day))
+        if self.by_month_day:
+            parts.append("BYMONTHDAY=" + ",".join(str(day) for day in self.by_month_day))
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until:%Y%m%d}")
+        return ";".join(parts)
+
+
+def _clamped(year: int, month: int, days: Tuple[int, ...]) -> List[int]:
+    last = calendar.monthrange(year, month)[1]
+    return sorted({min(day, last) for day in days})
+
+
+def next_occurrence(head: Task, not_before: date) -> Optional[Task]:
+    """
+    Build (without saving) the occurrence following the latest one of a series.
+
+    Occurrences that would fall before ``not_before`` are skipped: a chore
+    missed for a week comes back once, not seven times.
+
+    Args:
+        head: The series' latest occurrence.
+        not_before: Earliest deadline the new occurrence may have (usually today).
+
+    Returns:
+        The unsaved Task, or None if the series does not repeat anymore.
+    """
+    if not head.recurrence or head.deadline is None:
+        return None
+    rule = RecurrenceRule.parse(head.recurrence, head.deadline)
+    deadline = rule.next_after(head.deadline)
+    while deadline is not None and deadline < not_before:
+        deadline = rule.next_after(deadline)
+    if deadline is None:
+        return None
+    return Task(
+        title=head.title,
+        description=head.description,
+        deadline=deadline,
+        project_id=head.project_id,
+        recurrence=head.recurrence,
+        series_id=head.series_id
+    )
+
+
+def continue_series(task_repo, task: Task, today: Optional[date] = None) -> Optional[Task]:
+    """
+    Create the next occurrence of a series whose latest occurrence was just completed.
+
+    Occurrences are materialized one at a time: only the completion of the
+    series' latest occurrence creates a new one, so completing an older
+    occurrence (or completing one twice) adds nothing. The new occurrence
+    is not checked against MAX_NUMBER_OF_TASK: it takes the place of the
+    completed one, which no longer counts toward the limit.
+
+    Args:
+        task_repo: TaskRepository of the session the completion happened in.
+        task: The task that was marked done.
+        today: Current day (defaults to date.today()).
+
+    Returns:
+        The created occurrence, or None.
+    """
+    if task.status != "done" or not task.series_id:
+        return None
+    head = task_repo.get_series_head(task.series_id, task.project_id)
+    if head is None or head.id != task.id:
+        return None
+    occurrence = next_occurrence(head, today or date.today())
+    if occurrence is None:
+        return None
+    record_change(task_repo.db_session, "task.created", occurrence)
+    return task_repo.create_task(occurrence)
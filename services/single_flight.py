@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from events.broker import ChangeEvent, event_broker
+
+SINGLE_FLIGHT_CACHE_MS = float(os.getenv("SINGLE_FLIGHT_CACHE_MS", 0))
+SINGLE_FLIGHT_CACHE_SIZE = int(os.getenv("SINGLE_FLIGHT_CACHE_SIZE", 1000))
+
+
+@dataclass
+class SingleFlightStats:
+    """
+    Counters of a SingleFlight group.
+
+    Attributes:
+        executions: Calls that actually ran the underlying function.
+        coalesced: Calls that waited for an identical in-flight call.
+        cache_hits: Calls served from the micro-cache.
+    """
+    executions: int = 0
+    coalesced: int = 0
+    cache_hits: int = 0
+
+
+@dataclass
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into a single execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait and share its result (or exception). With a positive
+    ``cache_ttl`` the result is also reused for that many seconds. ``forget``
+    drops a key: callers arriving afterwards start a new call instead of
+    joining one that started before, and that call does not populate the
+    cache, so a committed write is never hidden by a stale read.
+    """
+
+    def __init__(self, cache_ttl: float = 0.0, cache_size: int = 1000) -> None:
+        """
+        Args:
+            cache_ttl: Seconds a result stays reusable after the call (0 disables).
+            cache_size: Maximum number of cached keys.
+        """
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.stats = SingleFlightStats()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._cache: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._generations: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Return ``fn()``, sharing the execution with concurrent callers of ``key``.
+
+        Args:
+            key: Identifies identical calls.
+            fn: The function to run.
+
+        Returns:
+            The (possibly shared) result of ``fn``.
+        """
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[1] > time.monotonic():
+                self.stats.cache_hits += 1
+                return cached[0]
+
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                generation = self._generations.get(key, 0)
+                self.stats.executions += 1
+            else:
+                self.stats.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                if call.error is None and self.cache_ttl > 0 and self._generations.get(key, 0) == generation:
+                    self._cache[key] = (call.result, time.monotonic() + self.cache_ttl)
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            call.done.set()
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Drop the cached result of ``key``, detach in-flight calls (later
+        callers start a new one) and keep them from caching.
+
+        A tuple key also covers the keys it is a prefix of, e.g.
+        ``("tasks", project_id)`` covers ``("tasks", project_id, fields)``.
+        """
+        with self._lock:
+            keys = {key} | {k for k in (*self._cache, *self._calls) if _extends(k, key)}
+            for k in keys:
+                self._cache.pop(k, None)
+                self._calls.pop(k, None)
+                self._generations[k] = self._generations.get(k, 0) + 1
+
+
+def _extends(key: Hashable, prefix: Hashable) -> bool:
+    return isinstance(key, tuple) and isinstance(prefix, tuple) and key[:len(prefix)] == prefix
+
+
+task_list_flight: SingleFlight = SingleFlight(SINGLE_FLIGHT_CACHE_MS / 1000, SINGLE_FLIGHT_CACHE_SIZE)
+"""
+Coalesces identical project task list reads, keyed by ("tasks", project_id, fields).
+"""
+
+project_list_flight: SingleFlight = SingleFlight(SINGLE_FLIGHT_CACHE_MS / 1000, SINGLE_FLIGHT_CACHE_SIZE)
+"""
+Coalesces identical project list reads, keyed by ("projects", fields).
+"""
+
+
+def _invalidate(event: ChangeEvent) -> None:
+    task_list_flight.forget(("tasks", event.project_id))
+    if event.type.startswith("project."):
+        project_list_flight.forget(("projects",))
+
+
+event_broker.add_listener(_invalidate)
@@ -1,12 +1,69 @@
 import os
-from typing import Optional, List
+import uuid
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Optional, List, Sequence, Tuple, TypeVar, Union
 
 from repositories.task_repository import TaskRepository
 from repositories.project_repository import ProjectRepository
-from exceptions.service_exceptions import TaskLimitReachedError
-from models.task import Task
+from exceptions.service_exceptions import (
+    TaskLimitReachedError,
+    ArchivedTaskNotFoundError,
+    VersionConflictError,
+    BatchTooLargeError,
+    InvalidTaskMoveError
+)
+from services.recurrence import RecurrenceRule, continue_series, next_occurrence
+from exceptions.repository_exceptions import StaleVersionError
+from models.task import Task, ArchivedTask
+from db.positions import key_between, sequential_keys
+from db.replicas import use_primary
+from events.changes import record_change, snapshot
+from services.overdue_engine import overdue_engine
+from services.single_flight import task_list_flight
+
+if TYPE_CHECKING:
+    # services.job_service imports this module
+    from services.job_service import JobService
 
 MAX_NUMBER_OF_TASK = int(os.getenv("MAX_NUMBER_OF_TASK", 10))
+TASK_ARCHIVE_RETENTION_DAYS = int(os.getenv("TASK_ARCHIVE_RETENTION_DAYS", 30))
+TASK_ARCHIVE_BATCH_SIZE = int(os.getenv("TASK_ARCHIVE_BATCH_SIZE", 500))
+MAX_TASK_IDS_PER_REQUEST = int(os.getenv("MAX_TASK_IDS_PER_REQUEST", 100))
+POSITION_REBALANCE_LENGTH = int(os.getenv("POSITION_REBALANCE_LENGTH", 16))
+
+_MAX_POSITION_LENGTH: int = Task.__table__.c.position.type.length
+
+T = TypeVar("T")
+
+
+def _normalize_recurrence(recurrence: str, deadline: date) -> str:
+    """
+    Validate a recurrence rule and return its canonical RRULE form.
+
+    Raises:
+        InvalidRecurrenceError: If the rule cannot be parsed.
+    """
+    return str(RecurrenceRule.parse(recurrence, deadline))
+
+
+def _is_overdue(task: Task) -> bool:
+    """
+    Whether an open task's deadline is already behind us.
+
+    Such tasks are closed when they are written rather than left to the
+    overdue engine, which only wakes up at deadline boundaries and does not
+    hear about deadlines set in other processes.
+    """
+    return task.deadline is not None and task.deadline < date.today() and task.status != "done"
+
+
+def _parse_deadline(deadline: Union[str, date, None]) -> Optional[date]:
+    """
+    Convert a YYYY-MM-DD string to a date (dates and None pass through).
+    """
+    if isinstance(deadline, str):
+        return date.fromisoformat(deadline)
+    return deadline
 
 
 class TaskService:
@@ -14,16 +71,24 @@ class TaskService:
     Service layer for handling task-related business logic.
     """
 
-    def __init__(self, task_repo: TaskRepository, project_repo: ProjectRepository) -> None:
+    def __init__(
+        self,
+        task_repo: TaskRepository,
+        project_repo: ProjectRepository,
+        job_service: Optional["JobService"] = None
+    ) -> None:
         """
         Initialize TaskService.
 
         Args:
             task_repo: Repository for task database operations.
             project_repo: Repository for project-related queries.
+            job_service: Queues background maintenance (optional; without
+                it, position keys are only shortened when a move needs it).
         """
         self.task_repo = task_repo
         self.project_repo = project_repo
+        self.job_service = job_service
 
     # -----------------------------
     # CREATE
@@ -33,22 +98,30 @@ class TaskService:
         project_id: str,
         title: str,
         description: Optional[str] = None,
-        deadline: Optional[str] = None
+        deadline: Optional[str] = None,
+        recurrence: Optional[str] = None
     ) -> Task:
         """
         Create a new task inside a project.
 
+        A recurring task is the first occurrence of a series; later
+        occurrences are created one at a time, when the latest one is
+        completed or a list asks for a window that reaches the next one.
+        A task whose deadline has already passed is created done.
+
         Args:
             project_id: The ID of the project the task belongs to.
             title: Task title.
             description: Task description (optional).
-            deadline: Task deadline (optional).
+            deadline: Task deadline (optional; today for a recurring task).
+            recurrence: Repeat rule, e.g. ``weekly`` or ``FREQ=WEEKLY;BYDAY=MO,TH`` (optional).
 
         Returns:
             The created Task instance.
 
         Raises:
             TaskLimitReachedError: If project has reached its maximum task capacity.
+            InvalidRecurrenceError: If the recurrence rule cannot be parsed.
         """
         project = self.project_repo.get_project_by_id(project_id)
 
@@ -61,10 +134,21 @@ class TaskService:
         task = Task(
             title=title,
             description=description,
-            deadline=deadline,
+            deadline=_parse_deadline(deadline),
             project_id=project_id
         )
-        return self.task_repo.create_task(task)
+        if recurrence:
+            task.deadline = task.deadline or date.today()
+            task.recurrence = _normalize_recurrence(recurrence, task.deadline)
+            task.id = str(uuid.uuid4())[:6]
+            task.series_id = task.id
+        if _is_overdue(task):
+            task.status = "done"
+        record_change(self.task_repo.db_session, "task.created", task)
+        task = self.task_repo.create_task(task)
+        overdue_engine.notify_deadline(task.deadline)
+        self._continue_series(task)
+        return task
 
     # -----------------------------
     # READ
@@ -81,17 +165,126 @@ class TaskService:
         """
         return self.task_repo.get_task_by_id(task_id)
 
-    def list_tasks(self, project_id: str) -> List[Task]:
+    def get_tasks(self, task_ids: List[str]) -> Tuple[List[Task], List[str]]:
+        """
+        Retrieve many tasks by ID with a single query.
+
+        Args:
+            task_ids: Task IDs, in the order the caller wants them back
+                (duplicates are returned once).
+
+        Returns:
+            The tasks found, in request order, and the IDs that were not found.
+
+        Raises:
+            BatchTooLargeError: If more than MAX_TASK_IDS_PER_REQUEST distinct IDs are requested.
+        """
+        unique_ids = list(dict.fromkeys(task_ids))
+        if len(unique_ids) > MAX_TASK_IDS_PER_REQUEST:
+            raise BatchTooLargeError(
+                f"Cannot fetch more than {MAX_TASK_IDS_PER_REQUEST} tasks in one request."
+            )
+        found = {task.id: task for task in self.task_repo.get_tasks_by_ids(unique_ids)}
+        return (
+            [found[task_id] for task_id in unique_ids if task_id in found],
+            [task_id for task_id in unique_ids if task_id not in found]
+        )
+
+    def list_tasks(
+        self,
+        project_id: str,
+        include_archived: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Union[Task, ArchivedTask]]:
         """
         List all tasks belonging to a project.
 
         Args:
             project_id: The project ID.
+            include_archived: Also return tasks moved to the archive.
+            fields: Only load these attributes (all if None); reading
+                another one afterwards costs a query per task.
 
         Returns:
-            A list of Task objects.
+            A list of Task objects (followed by ArchivedTask objects if requested).
         """
-        return self.task_repo.get_tasks_by_project_id(project_id)
+        tasks: List[Union[Task, ArchivedTask]] = list(self.task_repo.get_tasks_by_project_id(project_id, fields))
+        if include_archived:
+            tasks.extend(self.task_repo.get_archived_tasks_by_project_id(project_id, fields))
+        return tasks
+
+    def list_tasks_shared(
+        self,
+        project_id: str,
+        render: Callable[[List[Task]], T],
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> T:
+        """
+        List and render a project's tasks, sharing the work with concurrent callers.
+
+        Concurrent calls for the same project and fields run one query and
+        one ``render`` call, and all receive the rendered result.
+
+        Args:
+            project_id: The project ID.
+            render: Turns the tasks into the shared result (e.g. a JSON body).
+            fields: Only load these attributes (all if None).
+
+        Returns:
+            The rendered task list.
+        """
+        return task_list_flight.do(
+            ("tasks", project_id, fields),
+            lambda: render(self.list_tasks(project_id, fields=fields))
+        )
+
+    def materialize_occurrences(self, project_id: str, until: date) -> List[Task]:
+        """
+        Create the occurrences of a project's recurring tasks due on or before ``until``.
+
+        Lets a list covering a window (e.g. the coming week) show every
+        occurrence in it. Occurrences before today are skipped, and creation
+        stops when the project reaches MAX_NUMBER_OF_TASK.
+
+        Args:
+            project_id: The project ID.
+            until: Last day of the window.
+
+        Returns:
+            The created occurrences.
+        """
+        capacity = MAX_NUMBER_OF_TASK - self.task_repo.count_tasks_for_project(project_id)
+        created: List[Task] = []
+        for head in self.task_repo.list_series_heads(project_id):
+            while capacity > 0:
+                occurrence = next_occurrence(head, date.today())
+                if occurrence is None or occurrence.deadline > until:
+                    break
+                record_change(self.task_repo.db_session, "task.created", occurrence)
+                head = self.task_repo.create_task(occurrence)
+                overdue_engine.notify_deadline(head.deadline)
+                created.append(head)
+                capacity -= 1
+        return created
+
+    def count_tasks(self, project_id: str, completed_occurrences: bool = False) -> int:
+        """
+        Return the number of (non-archived) tasks of a project, leaving out
+        completed occurrences of recurring tasks unless asked to.
+        """
+        return self.task_repo.count_tasks_for_project(project_id, completed_occurrences)
+
+    def ensure_capacity(self, project_id: str, additional: int) -> None:
+        """
+        Check that ``additional`` tasks fit into a project.
+
+        Raises:
+            TaskLimitReachedError: If they would exceed its maximum task capacity.
+        """
+        if self.count_tasks(project_id) + additional > MAX_NUMBER_OF_TASK:
+            raise TaskLimitReachedError(
+                f"Cannot create more than {MAX_NUMBER_OF_TASK} tasks in this project."
+            )
 
     # -----------------------------
     # UPDATE
@@ -102,22 +295,36 @@ class TaskService:
         title: Optional[str] = None,
         description: Optional[str] = None,
         status: Optional[str] = None,
-        deadline: Optional[str] = None
+        deadline: Optional[str] = None,
+        expected_version: Optional[int] = None,
+        recurrence: Optional[str] = None
     ) -> Task:
         """
         Update task fields.
 
+        Completing the latest occurrence of a recurring task creates the next
+        one. A task left with a past deadline is closed.
+
         Args:
             task_id: Task ID.
             title: New title (optional).
             description: New description (optional).
             status: New task status (optional).
             deadline: New deadline (optional).
+            expected_version: Version the client last saw (optional; any version if None).
+            recurrence: New repeat rule (optional; an empty string stops the series).
 
         Returns:
             Updated Task instance.
+
+        Raises:
+            VersionConflictError: If the task is not at ``expected_version``
+                or is changed concurrently.
+            InvalidRecurrenceError: If the recurrence rule cannot be parsed.
         """
         task = self.task_repo.get_task_by_id(task_id)
+        if expected_version is not None and task.version != expected_version:
+            raise VersionConflictError(f"Task '{task_id}' is at version {task.version}, not {expected_version}.")
 
         if title is not None:
             task.title = title
@@ -129,29 +336,231 @@ class TaskService:
             task.status = status
 
         if deadline is not None:
-            task.deadline = deadline
-
-        return self.task_repo.update_task(task)
-
-    def update_status(self, task_id: str, new_status: str) -> Task:
+            task.deadline = _parse_deadline(deadline)
+
+        if recurrence == "":
+            task.recurrence = None
+        elif recurrence is not None:
+            task.deadline = task.deadline or date.today()
+            task.recurrence = _normalize_recurrence(recurrence, task.deadline)
+            task.series_id = task.series_id or task.id
+
+        closed = _is_overdue(task)
+        if closed:
+            task.status = "done"
+
+        record_change(self.task_repo.db_session, "task.updated", task)
+        try:
+            task = self.task_repo.update_task(task)
+        except StaleVersionError as e:
+            raise VersionConflictError(str(e)) from e
+        if deadline is not None or recurrence:
+            overdue_engine.notify_deadline(task.deadline)
+        if status is not None or closed:
+            self._continue_series(task)
+        return task
+
+    def update_status(self, task_id: str, new_status: str, expected_version: Optional[int] = None) -> Task:
         """
         Update the status of a task.
 
+        Completing the latest occurrence of a recurring task creates the next
+        one. A task whose deadline has passed stays done.
+
         Args:
             task_id: The ID of the task.
             new_status: The new status to set.
+            expected_version: Version the client last saw (optional; any version if None).
 
         Returns:
             The updated Task instance.
 
         Raises:
             Exception: If the task does not exist.
+            VersionConflictError: If the task is not at ``expected_version``
+                or is changed concurrently.
+        """
+        task = self.task_repo.get_task_by_id(task_id)
+        if not task:
+            raise Exception(f"Task with ID '{task_id}' not found.")
+        if expected_version is not None and task.version != expected_version:
+            raise VersionConflictError(f"Task '{task_id}' is at version {task.version}, not {expected_version}.")
+
+        if task.deadline is not None and task.deadline < date.today():
+            new_status = "done"  # an overdue task cannot be reopened
+
+        record_change(self.task_repo.db_session, "task.status_changed", task)
+        try:
+            task = self.task_repo.update_task_status(task, new_status)
+        except StaleVersionError as e:
+            raise VersionConflictError(str(e)) from e
+        self._continue_series(task)
+        return task
+
+    def _continue_series(self, task: Task) -> None:
+        occurrence = continue_series(self.task_repo, task)
+        if occurrence is not None:
+            overdue_engine.notify_deadline(occurrence.deadline)
+
+    # -----------------------------
+    # ORDER
+    # -----------------------------
+    def move_task(self, task_id: str, after_id: Optional[str], expected_version: Optional[int] = None) -> Task:
+        """
+        Place a task right after another task of its project.
+
+        Only the moved task is written: it gets a key between its new
+        neighbours' keys (see db.positions). When the key is longer than
+        POSITION_REBALANCE_LENGTH, a background job shortens the keys of
+        the project.
+
+        Args:
+            task_id: The ID of the task to move.
+            after_id: The task to place it after (None: first in the project).
+            expected_version: Version the client last saw (optional; any version if None).
+
+        Returns:
+            The moved Task instance.
+
+        Raises:
+            Exception: If the task does not exist.
+            InvalidTaskMoveError: If ``after_id`` is not another task of the same project.
+            VersionConflictError: If the task is not at ``expected_version``
+                or is changed concurrently.
         """
         task = self.task_repo.get_task_by_id(task_id)
         if not task:
             raise Exception(f"Task with ID '{task_id}' not found.")
+        if expected_version is not None and task.version != expected_version:
+            raise VersionConflictError(f"Task '{task_id}' is at version {task.version}, not {expected_version}.")
+
+        lower, upper = self._move_bounds(task, after_id)
+        try:
+            position = key_between(lower, upper)
+        except ValueError:
+            position = None
+        if position is None or len(position) > _MAX_POSITION_LENGTH:
+            # Neighbours share a key (concurrent appends), or the gap between
+            # them is used up before the rebalancing job ran: renumber now
+            self.rebalance_positions(task.project_id)
+            lower, upper = self._move_bounds(task, after_id)
+            position = key_between(lower, upper)
+        if (lower is None or lower < task.position) and (upper is None or task.position < upper):
+            return task
+
+        record_change(self.task_repo.db_session, "task.moved", task)
+        try:
+            task = self.task_repo.update_task_position(task, position)
+        except StaleVersionError as e:
+            raise VersionConflictError(str(e)) from e
+        if len(position) > POSITION_REBALANCE_LENGTH and self.job_service is not None:
+            self.job_service.enqueue_once("tasks.rebalance", {"project_id": task.project_id})
+        return task
+
+    def _move_bounds(self, task: Task, after_id: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        if after_id is None:
+            return None, self.task_repo.get_next_position(task.project_id, None, exclude_ids=[task.id])
+        after = self.task_repo.get_task_by_id(after_id)
+        if after is None or after.project_id != task.project_id or after.id == task.id:
+            raise InvalidTaskMoveError(f"Task '{after_id}' is not another task of project '{task.project_id}'.")
+        return after.position, self.task_repo.get_next_position(task.project_id, after.position, [task.id, after.id])
+
+    def rebalance_positions(self, project_id: str) -> int:
+        """
+        Give a project's tasks the shortest keys, keeping their order.
+
+        Repeated moves into the same gap make keys grow; this rewrites them
+        in one transaction. Every task's version is bumped, so a move
+        computed from the old keys gets a conflict.
+
+        Args:
+            project_id: The project ID.
+
+        Returns:
+            The number of tasks whose key changed.
+
+        Raises:
+            VersionConflictError: If a task is moved while the keys are rewritten.
+        """
+        with use_primary(self.task_repo.db_session):
+            tasks = self.task_repo.get_tasks_by_project_id(project_id, fields=("position", "version"))
+        keys = sequential_keys(len(tasks))
+        changed = sum(1 for task, key in zip(tasks, keys) if task.position != key)
+        if changed:
+            try:
+                self.task_repo.set_positions(tasks, keys)
+            except StaleVersionError as e:
+                raise VersionConflictError(str(e)) from e
+        return changed
+
+    # -----------------------------
+    # ARCHIVE
+    # -----------------------------
+    def archive_completed(
+        self,
+        retention_days: int = TASK_ARCHIVE_RETENTION_DAYS,
+        batch_size: int = TASK_ARCHIVE_BATCH_SIZE
+    ) -> int:
+        """
+        Move done tasks completed more than ``retention_days`` ago to the archive.
+
+        Tasks are moved in batches of ``batch_size``, one short transaction
+        per batch, so the hot table is never locked for long.
+
+        Args:
+            retention_days: Days a done task stays in the hot table.
+            batch_size: Tasks moved per transaction.
+
+        Returns:
+            The number of tasks archived.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        archived = 0
+        while True:
+            tasks = self.task_repo.list_archivable(cutoff, batch_size)
+            if not tasks:
+                break
+            for task in tasks:
+                record_change(self.task_repo.db_session, "task.archived", task)
+            self.task_repo.archive_tasks(tasks)
+            archived += len(tasks)
+            if len(tasks) < batch_size:
+                break
+        return archived
+
+    def restore_task(self, task_id: str) -> Task:
+        """
+        Move an archived task back to the project's task list.
+
+        Args:
+            task_id: The ID of the archived task.
+
+        Returns:
+            The restored Task instance.
+
+        Raises:
+            ArchivedTaskNotFoundError: If the task is not in the archive.
+            TaskLimitReachedError: If the project has reached its maximum task capacity.
+        """
+        archived = self.task_repo.get_archived_task_by_id(task_id)
+        if archived is None:
+            raise ArchivedTaskNotFoundError(f"Archived task with ID '{task_id}' not found.")
+
+        if self.task_repo.count_tasks_for_project(archived.project_id) >= MAX_NUMBER_OF_TASK:
+            raise TaskLimitReachedError(
+                f"Cannot create more than {MAX_NUMBER_OF_TASK} tasks in this project."
+            )
+
+        data = snapshot(archived)
+        data.pop("archived_at")
+        task = Task(**data)
+        if _is_overdue(task):
+            task.status = "done"
+        # Restart the retention period so the next archival run keeps the task
+        task.completed_at = datetime.utcnow() if task.status == "done" else None
 
-        return self.task_repo.update_task_status(task, new_status)
+        record_change(self.task_repo.db_session, "task.restored", task)
+        return self.task_repo.restore_archived_task(archived, task)
 
     # -----------------------------
     # DELETE
@@ -164,4 +573,5 @@ class TaskService:
             task_id: The ID of the task to delete.
         """
         task = self.task_repo.get_task_by_id(task_id)
+        record_change(self.task_repo.db_session, "task.deleted", task)
         self.task_repo.delete_task(task)
@@ -0,0 +1,54 @@
+from typing import List, Optional
+
+from models.outbox import WebhookSubscription
+from repositories.outbox_repository import OutboxRepository
+from exceptions.service_exceptions import WebhookNotFoundError
+from db.session import SessionLocal
+
+
+class WebhookService:
+    """
+    Service layer for managing webhook subscriptions.
+    Uses OutboxRepository for all database operations.
+    """
+
+    def __init__(self, db_session=None):
+        # Use provided session or create a new one
+        self.db_session = db_session or SessionLocal()
+        self.outbox_repo = OutboxRepository(self.db_session)
+
+    def create_subscription(
+        self,
+        url: str,
+        project_id: Optional[str] = None,
+        event_types: Optional[List[str]] = None,
+        secret: Optional[str] = None,
+    ) -> WebhookSubscription:
+        """
+        Register a webhook receiving events committed from now on.
+        """
+        subscription = WebhookSubscription(
+            url=url,
+            project_id=project_id,
+            event_types=",".join(event_types) if event_types else None,
+            secret=secret,
+        )
+        return self.outbox_repo.create_subscription(subscription)
+
+    def list_subscriptions(self) -> List[WebhookSubscription]:
+        """
+        Return all webhook subscriptions.
+        """
+        return self.outbox_repo.list_subscriptions()
+
+    def delete_subscription(self, subscription_id: str) -> None:
+        """
+        Delete a webhook subscription by ID.
+
+        Raises:
+            WebhookNotFoundError: if the subscription does not exist.
+        """
+        subscription = self.outbox_repo.get_subscription_by_id(subscription_id)
+        if not subscription:
+            raise WebhookNotFoundError(f"Webhook with ID '{subscription_id}' not found.")
+        self.outbox_repo.delete_subscription(subscription)